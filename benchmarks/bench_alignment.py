@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Check align_sentences_to_words on synthetic transcripts.
+
+Builds a word stream with timestamps (one word every 0.5 s) and sentences made
+of the same words, then checks that every sentence maps to its own time range:
+- when the sentences match the words exactly;
+- with a long gap on the words side (a hallucinated line the text lacks);
+- with a long gap on the text side (text the words lack, e.g. an OpenAI transcript
+  aligned against Whisper words);
+- with small proofreading edits (accents, punctuation, a changed word).
+Also times the alignment at two sizes, with gaps every few sentences, to check
+that it stays linear. Exits with status 1 if a check fails.
+
+Usage: python benchmarks/bench_alignment.py [--sentences 2000] [--seed 0]
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import transcribe_audio
+
+VOCABULARY = ("hola bienvenida radio historia ciudad mercado familia trabajo escuela amigo "
+              "música playa montaña comida tienda calle noche mañana tarde semana").split()
+WORD_SECONDS = 0.5
+# Characters of extra material in a gap (longer than ALIGNMENT_RESYNC_WINDOW)
+GAP_WORDS = 20
+# Allowed slack (seconds) between a sentence's span and its true time range
+TOLERANCE = 0.01
+# A 4x larger input may take at most this many times longer
+MAX_SCALING = 8
+
+def make_sentences(count, rng):
+    return [[rng.choice(VOCABULARY) for _ in range(rng.randint(4, 10))] for _ in range(count)]
+
+def timed_words(sentences, extra_after=()):
+    """
+    Word stream for the sentences, with GAP_WORDS extra words after each
+    sentence index in extra_after.
+    Returns tuple: (words_with_timestamps, true (start, end) per sentence)
+    """
+    words = []
+    truth = []
+    for index, sentence in enumerate(sentences):
+        start = len(words) * WORD_SECONDS
+        words.extend(sentence)
+        truth.append((start, len(words) * WORD_SECONDS))
+        if index in extra_after:
+            words.extend(f"zumbido{n}" for n in range(GAP_WORDS))
+    return [(word, i * WORD_SECONDS, (i + 1) * WORD_SECONDS) for i, word in enumerate(words)], truth
+
+def sentence_texts(sentences, extra_in=()):
+    texts = []
+    for index, sentence in enumerate(sentences):
+        text = ' '.join(sentence).capitalize() + '.'
+        if index in extra_in:
+            text += ' ' + ' '.join(f"aplausos{n}" for n in range(GAP_WORDS)) + '.'
+        texts.append(text)
+    return texts
+
+def check(name, spans, truth, failures):
+    wrong = [index for index, (span, expected) in enumerate(zip(spans, truth))
+             if span is None or abs(span[0] - expected[0]) > TOLERANCE or abs(span[1] - expected[1]) > TOLERANCE]
+    print(f"{name:>24}: {len(truth) - len(wrong)}/{len(truth)} sentence(s) aligned")
+    if wrong:
+        index = wrong[0]
+        failures.append(f"{name}: sentence {index} mapped to {spans[index]}, expected {truth[index]}")
+
+def run(args):
+    rng = random.Random(args.seed)
+    failures = []
+    sentences = make_sentences(50, rng)
+
+    words, truth = timed_words(sentences)
+    spans, _ = transcribe_audio.align_sentences_to_words(sentence_texts(sentences), words)
+    check("exact", spans, truth, failures)
+
+    words, truth = timed_words(sentences, extra_after={0, 20})
+    spans, _ = transcribe_audio.align_sentences_to_words(sentence_texts(sentences), words)
+    check("gap in words", spans, truth, failures)
+
+    words, truth = timed_words(sentences)
+    texts = sentence_texts(sentences, extra_in={0, 20})
+    spans, mismatches = transcribe_audio.align_sentences_to_words(texts, words)
+    check("gap in text", spans, truth, failures)
+    if [index for index, _ in mismatches] != [0, 20]:
+        failures.append(f"gap in text: unmatched characters reported for sentences {mismatches}")
+
+    words, truth = timed_words(sentences)
+    texts = [text.replace('musica', 'música').replace('.', '!').replace('tienda', 'tiendas')
+             for text in sentence_texts(sentences)]
+    spans, _ = transcribe_audio.align_sentences_to_words(texts, words)
+    check("proofreading edits", spans, truth, failures)
+
+    timings = []
+    for count in (args.sentences, 4 * args.sentences):
+        sentences = make_sentences(count, rng)
+        gaps = set(range(0, count, 7))
+        words, _ = timed_words(sentences, extra_after=gaps)
+        texts = sentence_texts(sentences, extra_in={index + 3 for index in gaps})
+        start = time.perf_counter()
+        transcribe_audio.align_sentences_to_words(texts, words)
+        timings.append(time.perf_counter() - start)
+        print(f"{count:>17} sentences: {timings[-1] * 1000:.0f} ms ({len(words)} words, gaps on both sides)")
+    if timings[1] > MAX_SCALING * timings[0]:
+        failures.append(f"alignment is not linear: 4x input took {timings[1] / timings[0]:.1f}x longer")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ Alignment checks passed")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check sentence-to-word alignment on synthetic transcripts")
+    parser.add_argument("--sentences", type=int, default=2000, help="Sentences in the smaller timing run")
+    parser.add_argument("--seed", type=int, default=0)
+    run(parser.parse_args())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark the episode segmentation engines on synthetic long transcripts.
+
+Builds Duolingo-radio-like transcripts (narrator line, intro, dialogue, closing)
+of 1, 5 and 10 hours, plus a sparse variant where only every third episode
+keeps its boundary patterns so the duration-based splitting has to do the work,
+and times each segmentation engine (heuristic and dp) on them.
+
+Usage: python benchmarks/bench_episode_splitter.py [--hours 1 5 10] [--seed 0]
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transcribe_audio import SEGMENTERS
+
+CHARS_PER_SECOND = 14
+EPISODE_SECONDS = 165
+NAMES = ['María', 'Carlos', 'Ana', 'Mateo', 'Laura', 'Felipe', 'Sofía', 'Juan']
+
+def synthetic_transcript(hours, seed=0, pattern_every=1):
+    """
+    Generate a synthetic transcript of roughly the given length in hours.
+    Only every pattern_every-th episode has narrator, intro and closing lines.
+    Returns (text, audio_duration)
+    """
+    rng = random.Random(seed)
+    target_chars = int(hours * 3600 * CHARS_PER_SECOND)
+    episode_chars = EPISODE_SECONDS * CHARS_PER_SECOND
+    parts = []
+    length = 0
+    episode = 0
+    while length < target_chars:
+        host, guest = rng.sample(NAMES, 2)
+        episode_parts = []
+        with_patterns = episode % pattern_every == 0
+        if with_patterns:
+            episode_parts.append(f"Section {episode % 9 + 1} Unit {episode % 5 + 1} Radio {episode % 7 + 1}. "
+                                 f"Hola, te doy la bienvenida a Duolingo Radio.")
+        episode_parts.append(f"Soy {host} y hoy {guest} nos cuenta una historia.")
+        episode_length = sum(len(part) + 1 for part in episode_parts)
+        # Vary episode length around the target so some need merging or splitting
+        episode_target = int(episode_chars * rng.uniform(0.5, 2.2))
+        while episode_length < episode_target:
+            sentence = rng.choice([
+                f"{guest}, ¿por qué te gusta la playa?",
+                "Me gusta mucho porque el agua es muy bonita y tranquila en el verano.",
+                f"{host}, gracias por la pregunta.",
+                "Mi familia y yo vamos todos los años a la costa para descansar.",
+            ])
+            episode_parts.append(sentence)
+            episode_length += len(sentence) + 1
+        if with_patterns:
+            episode_parts.append("Gracias por escuchar este episodio de hoy. Hasta pronto.")
+        parts.extend(episode_parts)
+        length += episode_length
+        episode += 1
+    text = ' '.join(parts)
+    return text, len(text) / CHARS_PER_SECOND
+
+def run(hours_list, seed):
+    print(f"{'hours':>6} {'variant':>9} {'segmenter':>10} {'chars':>10} {'episodes':>9} {'seconds':>9}")
+    for hours in hours_list:
+        for variant, pattern_every in (('dense', 1), ('sparse', 3)):
+            text, duration = synthetic_transcript(hours, seed, pattern_every)
+            for name, segmenter in sorted(SEGMENTERS.items()):
+                start = time.perf_counter()
+                episodes = segmenter(text, audio_duration=duration)
+                elapsed = time.perf_counter() - start
+                print(f"{hours:>6} {variant:>9} {name:>10} {len(text):>10} {len(episodes):>9} {elapsed:>9.3f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the episode splitter on synthetic transcripts")
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.hours, args.seed)
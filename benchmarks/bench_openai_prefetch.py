@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent OpenAI uploads against a local fake endpoint.
+
+Starts a small OpenAI-compatible transcription server on localhost that adds
+a fixed latency per request, rate-limits (HTTP 429) a share of the requests and
+can reject the diarization model, then compares one-at-a-time uploads
+(perform_speaker_diarization_openai per file) with prefetch_openai_diarization.
+Each run uses a fresh temporary cache directory. Needs the openai package;
+no API key or network access is used.
+
+Usage: python benchmarks/bench_openai_prefetch.py [--files 8] [--latency 0.5]
+           [--concurrency 4] [--rate-limit 0.3] [--no-diarize-model]
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import transcribe_audio
+
+DIARIZE_MODEL = "gpt-4o-transcribe-diarize"
+
+class FakeTranscriptionServer:
+    """
+    Fake /v1/audio/transcriptions endpoint with configurable latency,
+    rate limiting and model availability. Counts requests per outcome.
+    """
+
+    def __init__(self, latency, rate_limit, diarize_available, seed=0):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.diarize_available = diarize_available
+        self.random = random.Random(seed)
+        self.counts = {}
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                match = re.search(rb'name="model"\r\n\r\n([^\r]*)\r\n', body)
+                model = match.group(1).decode() if match else ''
+                status, payload = server.respond(model)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                if status == 429:
+                    self.send_header('Retry-After', '0')
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def count(self, key):
+        with self.lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def respond(self, model):
+        time.sleep(self.latency)
+        with self.lock:
+            limited = self.random.random() < self.rate_limit
+        if limited:
+            self.count('429')
+            return 429, {'error': {'message': 'Rate limit reached', 'type': 'rate_limit_error'}}
+        if model == DIARIZE_MODEL and not self.diarize_available:
+            self.count(f'{model} rejected')
+            return 400, {'error': {'message': f'The model {model} does not exist', 'type': 'invalid_request_error'}}
+        self.count(f'{model} ok')
+        segments = [
+            {'start': 0.0, 'end': 2.5, 'speaker': 'A', 'text': 'Hola, te doy la bienvenida.'},
+            {'start': 2.5, 'end': 5.0, 'speaker': 'B', 'text': 'Soy María.'},
+        ]
+        return 200, {'text': ' '.join(segment['text'] for segment in segments), 'language': 'es',
+                     'duration': 5.0, 'segments': segments}
+
+    def close(self):
+        self.httpd.shutdown()
+
+def make_audio_files(directory, count):
+    """
+    Write count small files with distinct content (the fake server ignores the audio).
+    """
+    files = []
+    for index in range(count):
+        path = Path(directory) / f"episode_{index:03d}.m4a"
+        path.write_bytes(bytes(random.Random(index).getrandbits(8) for _ in range(64 * 1024)))
+        files.append(path)
+    return files
+
+def run(args):
+    if not transcribe_audio.OPENAI_API_AVAILABLE:
+        print("❌ The openai package is not installed")
+        sys.exit(1)
+    transcribe_audio.OPENAI_BACKOFF_SECONDS = 0.05
+
+    with tempfile.TemporaryDirectory() as audio_dir:
+        audio_files = make_audio_files(audio_dir, args.files)
+        for label in ("sequential", "prefetch"):
+            server = FakeTranscriptionServer(args.latency, args.rate_limit, not args.no_diarize_model)
+            with tempfile.TemporaryDirectory() as cache_dir:
+                transcribe_audio.CACHE_DIR = Path(cache_dir)
+                transcribe_audio._AUDIO_HASHES.clear()
+                start = time.perf_counter()
+                if label == "sequential":
+                    ok = 0
+                    for audio_file in audio_files:
+                        text, _ = transcribe_audio.perform_speaker_diarization_openai(
+                            audio_file, "fake-key", server.base_url
+                        )
+                        ok += bool(text)
+                else:
+                    models = transcribe_audio.prefetch_openai_diarization(
+                        audio_files, "fake-key", server.base_url, concurrency=args.concurrency
+                    )
+                    ok = sum(1 for model in models.values() if model)
+                elapsed = time.perf_counter() - start
+            server.close()
+            print(f"{label:>10}: {ok}/{len(audio_files)} file(s) in {elapsed:.2f}s, requests: {server.counts}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark concurrent OpenAI uploads against a fake endpoint")
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per fake request")
+    parser.add_argument("--concurrency", type=int, default=transcribe_audio.OPENAI_CONCURRENCY)
+    parser.add_argument("--rate-limit", type=float, default=0.3, help="Share of requests answered with 429")
+    parser.add_argument("--no-diarize-model", action="store_true",
+                        help=f"Reject {DIARIZE_MODEL} so every file falls back to whisper-1")
+    run(parser.parse_args())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Check the startup budget of transcribe_audio.py.
+
+Times, in fresh interpreters, (1) importing the module and (2) a full no-op run:
+a copy of the script in a temporary directory whose Duolinguo/radios folder only
+holds files that already have transcripts. Also reports which heavy
+dependencies (whisper, torch, language_tool_python, pyannote, openai) were
+imported. Exits with status 1 if the median no-op run exceeds the budget or a
+heavy dependency was imported.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--files 20] [--budget 1.0]
+"""
+
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from statistics import median
+
+SCRIPT = Path(__file__).resolve().parent.parent / "transcribe_audio.py"
+HEAVY_MODULES = ["whisper", "torch", "language_tool_python", "pyannote", "openai"]
+
+IMPORT_PROBE = (
+    "import sys, json; sys.path.insert(0, {directory!r}); import transcribe_audio; "
+    "print(json.dumps([name for name in {modules!r} if name in sys.modules]))"
+)
+
+def make_transcribed_tree(directory, count):
+    """
+    Copy the script into directory and add count audio files that all have transcripts.
+    Returns the path of the copied script.
+    """
+    script = Path(directory) / SCRIPT.name
+    shutil.copy(SCRIPT, script)
+    radios_dir = Path(directory) / "Duolinguo" / "radios"
+    transcript_dir = radios_dir / "transcript"
+    transcript_dir.mkdir(parents=True)
+    for index in range(count):
+        (radios_dir / f"episode_{index:03d}.m4a").write_bytes(b"")
+        (transcript_dir / f"episode_{index:03d}_transcript.txt").write_text("[Narrator]: Done.\n", encoding="utf-8")
+    return script
+
+def timed_run(cmd):
+    """
+    Run a command in a fresh interpreter.
+    Returns tuple: (seconds, stdout)
+    """
+    start = time.perf_counter()
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    return time.perf_counter() - start, result.stdout
+
+def run(args):
+    with tempfile.TemporaryDirectory() as directory:
+        script = make_transcribed_tree(directory, args.files)
+        probe = IMPORT_PROBE.format(directory=directory, modules=HEAVY_MODULES)
+
+        import_times = []
+        no_op_times = []
+        imported = []
+        for _ in range(args.runs):
+            seconds, output = timed_run([sys.executable, "-c", probe])
+            import_times.append(seconds)
+            imported = output.strip().splitlines()[-1]
+            seconds, _ = timed_run([sys.executable, str(script)])
+            no_op_times.append(seconds)
+
+    no_op = median(no_op_times)
+    print(f"import transcribe_audio: {median(import_times):.3f}s median over {args.runs} run(s)")
+    print(f"no-op run ({args.files} transcribed file(s)): {no_op:.3f}s median (budget {args.budget:.2f}s)")
+    print(f"heavy modules imported: {imported}")
+    if no_op > args.budget or imported != "[]":
+        print("❌ Startup budget exceeded")
+        sys.exit(1)
+    print("✅ Within budget")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the startup time budget of transcribe_audio.py")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--files", type=int, default=20, help="Already-transcribed audio files in the no-op run")
+    parser.add_argument("--budget", type=float, default=1.0, help="Budget in seconds for the median no-op run")
+    run(parser.parse_args())
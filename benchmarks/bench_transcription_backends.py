@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Compare transcription backends on a fixed sample set.
+
+For every backend configuration (backend:model_size:compute_type) each audio
+file in the sample directory is decoded once and transcribed in Spanish, and
+the real-time factor (transcription time / audio duration, lower is faster)
+is reported. Where a reference transcript <stem>.txt sits next to an audio
+file, the word error rate against it is reported too (words are compared in
+lowercase, without punctuation).
+
+Usage: python benchmarks/bench_transcription_backends.py SAMPLES_DIR
+           [--configs whisper:base:float32 whisper:base:int8 faster-whisper:base:int8]
+"""
+
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import transcribe_audio
+
+AUDIO_SUFFIXES = {'.m4a', '.mp3', '.wav', '.flac', '.ogg'}
+WORD_RE = re.compile(r'\w+')
+
+def words(text):
+    return WORD_RE.findall(text.lower())
+
+def edit_distance(reference, hypothesis):
+    """
+    Word-level Levenshtein distance (substitutions, insertions and deletions).
+    """
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1]
+
+def load_samples(samples_dir):
+    """
+    Decode every audio file in samples_dir.
+    Returns list of (name, audio, reference_words or None)
+    """
+    samples = []
+    for path in sorted(Path(samples_dir).iterdir()):
+        if path.suffix.lower() not in AUDIO_SUFFIXES:
+            continue
+        audio = transcribe_audio.decode_audio(path)
+        if audio is None:
+            continue
+        reference_path = path.with_suffix('.txt')
+        reference = words(reference_path.read_text(encoding='utf-8')) if reference_path.exists() else None
+        samples.append((path.name, audio, reference))
+    return samples
+
+def run(args):
+    samples = load_samples(args.samples_dir)
+    if not samples:
+        print(f"❌ No audio files found in {args.samples_dir}")
+        sys.exit(1)
+    audio_seconds = sum(transcribe_audio.audio_duration_from_buffer(audio) for _, audio, _ in samples)
+    print(f"🎯 {len(samples)} sample(s), {audio_seconds / 60:.1f} min of audio\n")
+    print(f"{'configuration':>32} {'load s':>8} {'RTF':>7} {'WER':>7}")
+    for config in args.configs:
+        backend, model_size, compute_type = (config.split(':') + [None, None])[:3]
+        start = time.perf_counter()
+        try:
+            model = transcribe_audio.load_transcription_backend(
+                backend, model_size or transcribe_audio.WHISPER_MODEL_NAME, compute_type
+            )
+        except Exception as e:
+            print(f"{config:>32} ⚠️  could not load: {str(e)}")
+            continue
+        load_seconds = time.perf_counter() - start
+
+        transcribe_seconds = 0.0
+        errors = 0
+        reference_words = 0
+        for _, audio, reference in samples:
+            start = time.perf_counter()
+            result = model.transcribe(audio, language="es", word_timestamps=True)
+            transcribe_seconds += time.perf_counter() - start
+            if reference is not None:
+                errors += edit_distance(reference, words(result["text"]))
+                reference_words += len(reference)
+        wer = f"{errors / reference_words:.1%}" if reference_words else "n/a"
+        label = f"{model.name}:{model.model_size}:{model.compute_type}"
+        print(f"{label:>32} {load_seconds:>8.1f} {transcribe_seconds / audio_seconds:>7.3f} {wer:>7}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare real-time factor and word error rate of transcription backends")
+    parser.add_argument("samples_dir", help="Directory of audio files, each optionally with a <stem>.txt reference")
+    parser.add_argument("--configs", nargs="+",
+                        default=["whisper:base:float32", "whisper:base:int8", "faster-whisper:base:int8"],
+                        help="backend:model_size:compute_type configurations to compare")
+    run(parser.parse_args())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Check the --vad speech detector on synthetic recordings.
+
+Builds speech-like signals (noise shaped by a syllable-rate envelope, with
+phrase-to-phrase level changes) and runs detect_speech_regions on:
+- continuous speech without real pauses, with and without a music bed, where
+  nearly all of the audio must be kept;
+- speech blocks separated by silent pauses, where every speech block must be
+  kept and most of the silence skipped.
+Reports the kept and skipped audio per case and exits with status 1 if a check fails.
+
+Usage: python benchmarks/bench_vad.py [--seconds 120] [--seed 0]
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import transcribe_audio
+
+SAMPLE_RATE = transcribe_audio.SAMPLE_RATE
+# Continuous speech must keep at least this share of the audio
+MIN_CONTINUOUS_KEPT = 0.95
+# Paused speech must skip at least this share of its silence
+MIN_SILENCE_SKIPPED = 0.5
+
+def level(db):
+    return 10 ** (db / 20)
+
+def speech(seconds, rng, level_db=-20, max_gap=0.08):
+    """
+    Speech-like signal: phrases of 1.5-4 s at varying levels, separated by gaps
+    of at most max_gap seconds, over a -70 dBFS noise floor.
+    """
+    n = int(seconds * SAMPLE_RATE)
+    samples = rng.normal(0, level(-70), n).astype(np.float32)
+    position = 0
+    while position < n:
+        length = min(int(rng.uniform(1.5, 4) * SAMPLE_RATE), n - position)
+        t = np.arange(length) / SAMPLE_RATE
+        envelope = 0.05 + np.abs(np.sin(np.pi * t * rng.uniform(3, 5))) ** 1.5
+        samples[position:position + length] += level(level_db + rng.uniform(-12, 6)) * envelope * rng.normal(0, 1, length)
+        position += length + int(rng.uniform(0, max_gap) * SAMPLE_RATE)
+    return samples
+
+def steady_speech(seconds, rng, level_db=-20):
+    """
+    Speech at an almost constant level (narrow energy distribution).
+    """
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (level(level_db) * (0.5 + 0.5 * np.abs(np.sin(np.pi * t * 4))) * rng.normal(0, 1, len(t))).astype(np.float32)
+
+def music_bed(seconds, level_db=-30):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    chord = sum(np.sin(2 * np.pi * frequency * t) for frequency in (220, 277, 330, 440))
+    return (level(level_db) * chord / 2).astype(np.float32)
+
+def paused_speech(seconds, rng):
+    """
+    Speech blocks of 5-12 s separated by 2-5 s silent pauses.
+    Returns tuple: (samples, list of (start_sample, end_sample) speech blocks)
+    """
+    parts = []
+    blocks = []
+    position = 0
+    while position < seconds * SAMPLE_RATE:
+        block = speech(rng.uniform(5, 12), rng)
+        blocks.append((position, position + len(block)))
+        pause = rng.normal(0, level(-65), int(rng.uniform(2, 5) * SAMPLE_RATE)).astype(np.float32)
+        parts.extend([block, pause])
+        position += len(block) + len(pause)
+    return np.concatenate(parts), blocks
+
+def kept_samples(regions):
+    return sum(end - start for start, end in regions)
+
+def covered(regions, start, end):
+    return any(region_start <= start and end <= region_end for region_start, region_end in regions)
+
+def run(args):
+    rng = np.random.default_rng(args.seed)
+    failures = []
+    print(f"{'case':>28} {'audio s':>8} {'kept s':>8} {'skipped':>8}")
+
+    continuous = {
+        "continuous speech": speech(args.seconds, rng),
+        "continuous speech + music": speech(args.seconds, rng) + music_bed(args.seconds),
+        "steady speech": steady_speech(args.seconds, rng),
+        "steady speech + music": steady_speech(args.seconds, rng) + music_bed(args.seconds),
+    }
+    for name, audio in continuous.items():
+        kept = kept_samples(transcribe_audio.detect_speech_regions(audio))
+        print(f"{name:>28} {len(audio) / SAMPLE_RATE:>8.1f} {kept / SAMPLE_RATE:>8.1f} {1 - kept / len(audio):>8.0%}")
+        if kept < MIN_CONTINUOUS_KEPT * len(audio):
+            failures.append(f"{name}: kept only {kept / len(audio):.0%} of the audio")
+
+    audio, blocks = paused_speech(args.seconds, rng)
+    regions = transcribe_audio.detect_speech_regions(audio)
+    kept = kept_samples(regions)
+    silence = len(audio) - kept_samples(blocks)
+    print(f"{'paused speech':>28} {len(audio) / SAMPLE_RATE:>8.1f} {kept / SAMPLE_RATE:>8.1f} {1 - kept / len(audio):>8.0%}")
+    missed = [block for block in blocks if not covered(regions, *block)]
+    if missed:
+        failures.append(f"paused speech: {len(missed)} of {len(blocks)} speech block(s) not fully kept")
+    if len(audio) - kept < MIN_SILENCE_SKIPPED * silence:
+        failures.append(f"paused speech: skipped only {(len(audio) - kept) / silence:.0%} of the silence")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ Speech detection checks passed")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the energy-based speech detector on synthetic audio")
+    parser.add_argument("--seconds", type=float, default=120, help="Length of each synthetic recording")
+    parser.add_argument("--seed", type=int, default=0)
+    run(parser.parse_args())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark int8 dynamic quantization of the openai-whisper model on CPU.
+
+Each configuration runs in a fresh interpreter (so peak memory is measured per
+model) with a temporary cache directory:
+- fp32: whisper.load_model
+- int8 (cold): load_quantized_whisper quantizing and caching the model
+- int8 (cached): load_quantized_whisper reading the cached quantized model
+and reports load time, serialized weight size, peak RSS, the encoder time on
+one 30 s window and, with an audio file, the time to transcribe its first
+--seconds seconds (plus how many words differ from the fp32 transcript).
+
+Usage: python benchmarks/bench_whisper_quantization.py [AUDIO_FILE] [--model-size base]
+           [--seconds 60] [--runs 3]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import difflib
+import argparse
+import resource
+import tempfile
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import transcribe_audio
+
+def measure(config, model_size, audio_file, seconds, runs):
+    """
+    Load one model configuration and time it (runs in the child interpreter).
+    Returns dict of measurements.
+    """
+    torch = transcribe_audio.import_torch()
+    whisper = transcribe_audio.import_whisper()
+    start = time.perf_counter()
+    if config == "fp32":
+        model = whisper.load_model(model_size, device="cpu")
+    else:
+        model = transcribe_audio.load_quantized_whisper(model_size)
+    load_seconds = time.perf_counter() - start
+
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+
+    if audio_file:
+        audio = transcribe_audio.decode_audio(audio_file)[:int(seconds * transcribe_audio.SAMPLE_RATE)]
+    else:
+        audio = torch.zeros(30 * transcribe_audio.SAMPLE_RATE).numpy()
+    mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), model.dims.n_mels).unsqueeze(0)
+    with torch.no_grad():
+        model.embed_audio(mel)  # warm-up
+        start = time.perf_counter()
+        for _ in range(runs):
+            model.embed_audio(mel)
+    encoder_ms = (time.perf_counter() - start) / runs * 1000
+
+    transcribe_seconds = None
+    text = None
+    if audio_file:
+        start = time.perf_counter()
+        text = model.transcribe(audio, language="es", fp16=False, condition_on_previous_text=False)["text"]
+        transcribe_seconds = time.perf_counter() - start
+
+    return {
+        'load_seconds': load_seconds,
+        'weights_mb': buffer.getbuffer().nbytes / 2**20,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'encoder_ms': encoder_ms,
+        'transcribe_seconds': transcribe_seconds,
+        'text': text,
+    }
+
+def run_child(config, args, cache_dir):
+    cmd = [sys.executable, __file__, "--child", config, "--model-size", args.model_size,
+           "--seconds", str(args.seconds), "--runs", str(args.runs)]
+    if args.audio_file:
+        cmd.insert(2, str(args.audio_file))
+    env = dict(os.environ, SPANISH_HELPER_CACHE_DIR=cache_dir)
+    output = subprocess.run(cmd, capture_output=True, text=True, check=True, env=env).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def word_difference(reference, hypothesis):
+    reference, hypothesis = reference.lower().split(), hypothesis.lower().split()
+    matcher = difflib.SequenceMatcher(a=reference, b=hypothesis, autojunk=False)
+    matched = sum(block.size for block in matcher.get_matching_blocks())
+    return 1 - matched / max(1, len(reference))
+
+def run(args):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        results = {}
+        for label, config in (("fp32", "fp32"), ("int8 (cold)", "int8"), ("int8 (cached)", "int8")):
+            results[label] = run_child(config, args, cache_dir)
+
+    fp32 = results["fp32"]
+    print(f"Whisper '{args.model_size}' on CPU ({os.cpu_count()} cores)\n")
+    print(f"{'model':>14} {'load s':>7} {'weights MB':>11} {'peak RSS MB':>12} {'encoder ms':>11} "
+          f"{'transcribe s':>13} {'words differ':>13}")
+    for label, result in results.items():
+        transcribe = f"{result['transcribe_seconds']:.2f}" if result['transcribe_seconds'] is not None else "n/a"
+        differ = f"{word_difference(fp32['text'], result['text']):.1%}" if result['text'] is not None else "n/a"
+        print(f"{label:>14} {result['load_seconds']:>7.2f} {result['weights_mb']:>11.1f} "
+              f"{result['peak_rss_mb']:>12.0f} {result['encoder_ms']:>11.0f} {transcribe:>13} {differ:>13}")
+
+    int8 = results["int8 (cached)"]
+    print(f"\nint8 vs fp32: encoder {fp32['encoder_ms'] / int8['encoder_ms']:.2f}x faster, "
+          f"weights {1 - int8['weights_mb'] / fp32['weights_mb']:.0%} smaller, "
+          f"peak RSS {1 - int8['peak_rss_mb'] / fp32['peak_rss_mb']:.0%} lower")
+    if fp32['transcribe_seconds'] and int8['transcribe_seconds']:
+        print(f"transcription {fp32['transcribe_seconds'] / int8['transcribe_seconds']:.2f}x faster")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark int8 dynamic quantization of the Whisper model")
+    parser.add_argument("audio_file", nargs="?", help="Audio file to transcribe (encoder timing only without it)")
+    parser.add_argument("--model-size", default=transcribe_audio.WHISPER_MODEL_NAME)
+    parser.add_argument("--seconds", type=float, default=60, help="Seconds of the audio file to transcribe")
+    parser.add_argument("--runs", type=int, default=3, help="Encoder forward passes to average")
+    parser.add_argument("--child", choices=["fp32", "int8"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(measure(args.child, args.model_size, args.audio_file, args.seconds, args.runs)))
+    else:
+        run(args)
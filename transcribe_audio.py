@@ -5,73 +5,1235 @@ Uses OpenAI Whisper for high-quality Spanish transcription.
 Includes grammar correction and story splitting.
 """
 
+import io
 import os
 import sys
 import re
+import wave
+import json
+import queue
+import bisect
+import random
+import asyncio
+import time
+import hashlib
+import inspect
+import importlib.util
+import unicodedata
+import argparse
+import tempfile
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-# Force CPU mode to avoid CUDA compatibility issues
-# This must be set before importing torch/whisper
-os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
-
-import whisper
-import language_tool_python
+import numpy as np
 import subprocess
 
+# Heavy dependencies (whisper/torch, LanguageTool, pyannote, openai) are imported
+# on first use, so runs that find every transcript already written start instantly
+
+def module_available(name):
+    """
+    Check whether an optional dependency is installed, without importing it.
+    """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+def force_cpu_mode():
+    """
+    Force CPU mode to avoid CUDA compatibility issues.
+    Only effective before torch is first imported (by whisper, pyannote or directly).
+    """
+    if 'torch' not in sys.modules:
+        os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
+
+def import_whisper():
+    """
+    Import whisper (and torch) on first use, in CPU mode.
+    Returns the whisper module.
+    """
+    force_cpu_mode()
+    import whisper
+    return whisper
+
+def import_torch():
+    """
+    Import torch on first use, in CPU mode.
+    Returns the torch module.
+    """
+    force_cpu_mode()
+    import torch
+    return torch
+
 # Audio-based speaker diarization (optional)
-try:
-    from pyannote.audio import Pipeline
-    from pyannote.core import Segment
-    DIARIZATION_AVAILABLE = True
-except ImportError:
-    DIARIZATION_AVAILABLE = False
+DIARIZATION_AVAILABLE = module_available("pyannote.audio")
 
 # OpenAI API for speaker diarization (optional)
-try:
-    from openai import OpenAI
-    OPENAI_API_AVAILABLE = True
-except ImportError:
-    OPENAI_API_AVAILABLE = False
+OPENAI_API_AVAILABLE = module_available("openai")
+
+# Whisper model used for local transcription
+WHISPER_MODEL_NAME = "base"
+
+# pyannote model used for audio-based speaker diarization
+DIARIZATION_MODEL_NAME = "pyannote/speaker-diarization-3.1"
+
+# On-disk cache for API responses (override with SPANISH_HELPER_CACHE_DIR)
+CACHE_DIR = Path(os.environ.get("SPANISH_HELPER_CACHE_DIR", Path(__file__).parent / ".cache"))
+
+# Language used by the grammar checker
+GRAMMAR_LANGUAGE = 'es-ES'
+# Proofreading: characters of uncached sentences sent per LanguageTool request,
+# and how many corrected sentences are kept in memory
+PROOFREAD_BATCH_CHARS = 4000
+PROOFREAD_LRU_SIZE = 4096
+
+# Sentence-to-word alignment: characters that must match to move the pointer
+# after a mismatch (or to resume where it is), and how far ahead (in
+# characters) the word stream is searched before the anchor is looked up
+# anywhere ahead
+ALIGNMENT_ANCHOR_LENGTH = 12
+ALIGNMENT_MIN_ANCHOR_LENGTH = 4
+ALIGNMENT_RESYNC_WINDOW = 64
+
+# Decoded audio format shared by Whisper, the narrator clipper and diarization
+SAMPLE_RATE = 16000
+# Silence (in seconds) inserted between clips in the batched English narrator pass
+NARRATOR_CLIP_GAP = 1.0
+# Narrator slot at the start of each episode (seconds) checked by language-ID mode
+NARRATOR_WINDOW_SECONDS = 8
+# Minimum Whisper English probability for a segment to count as English narrator
+ENGLISH_PROBABILITY_THRESHOLD = 0.5
+# Characters around a narrator segment's timeline position searched for its text
+NARRATOR_SEARCH_CHARS = 400
+# Decoded audio longer than this (in seconds) is spilled to a memory-mapped .npy file
+AUDIO_SPILL_SECONDS = 30 * 60
+# OpenAI transcription models in order of preference, with their request options
+OPENAI_TRANSCRIPTION_MODELS = [
+    # Provides both transcription and speaker diarization
+    ("gpt-4o-transcribe-diarize", {"response_format": "json", "chunking_strategy": "auto"}),
+    ("whisper-1", {"response_format": "verbose_json", "timestamp_granularities": ["segment", "word"]}),
+]
+# Batch OpenAI prefetch: concurrent uploads, and retries with exponential
+# backoff (base delay in seconds) on rate limits and transient server errors
+OPENAI_CONCURRENCY = 4
+OPENAI_MAX_RETRIES = 5
+OPENAI_BACKOFF_SECONDS = 1.0
+# Chunked OpenAI uploads (--openai-chunk-seconds): overlap added on each side
+# of a chunk, how far from the nominal cut a silence is searched for, and
+# how many chunks are uploaded at once
+OPENAI_CHUNK_OVERLAP_SECONDS = 15
+OPENAI_CHUNK_SEARCH_SECONDS = 30
+OPENAI_CHUNK_CONCURRENCY = 8
+# Largest file the OpenAI transcription API accepts (bounds the chunk length)
+OPENAI_UPLOAD_LIMIT_BYTES = 25_000_000
+# --pipeline: transcribed files allowed to wait for post-processing (each holds its audio buffer)
+PIPELINE_QUEUE_SIZE = 1
+# Energy-based voice activity detection (--vad): frame length, how far above
+# the noise floor (a low percentile of the frame energies) a frame must be to
+# count as speech, the level that always counts as silence, and the shortest
+# speech run kept / pause removed, plus the padding kept around speech
+VAD_FRAME_SECONDS = 0.03
+VAD_THRESHOLD_DB = 12
+VAD_NOISE_PERCENTILE = 10
+VAD_SILENCE_DB = -50
+# Sanity guards: the threshold never rises above the loud frames (this
+# percentile) minus VAD_SPEECH_RANGE_DB, so recordings without real pauses
+# (whose noise floor is speech) are kept; and if less than VAD_MIN_SPEECH_SHARE
+# of a file is still found to be speech, the whole file is used instead
+VAD_SPEECH_PERCENTILE = 90
+VAD_SPEECH_RANGE_DB = 15
+VAD_MIN_SPEECH_SHARE = 0.2
+VAD_MIN_SPEECH_SECONDS = 0.25
+VAD_MIN_SILENCE_SECONDS = 1.0
+VAD_PADDING_SECONDS = 0.2
+# Streaming mode (--stream): Whisper window length, overlap between windows
+# (words are stitched at its midpoint), and how long the unfinished episode
+# may grow before it is cut at a sentence end anyway
+STREAM_WINDOW_SECONDS = 300
+STREAM_OVERLAP_SECONDS = 30
+STREAM_MAX_PENDING_SECONDS = 840
+
+# Speaking rate assumed when a transcript's audio duration is unknown
+# (roughly 2000 characters per 2.75-minute episode)
+FALLBACK_CHARS_PER_SECOND = 2000 / 165
+
+# Dynamic-programming episode segmenter (--segmenter dp): episode length limits
+# and target (seconds), how far an episode may miss the target before costing
+# one point, and the score of each kind of boundary evidence
+DP_TARGET_EPISODE_SECONDS = 165
+DP_MIN_EPISODE_SECONDS = 60
+DP_MAX_EPISODE_SECONDS = 420
+DP_DURATION_TOLERANCE = 45
+DP_BOUNDARY_SCORES = {'narrator': 4.0, 'closing': 2.5, 'intro': 2.5}
+DP_SPEAKER_CHANGE_SCORE = 1.5
+# Boundary events closer than this (in characters) count as one boundary
+DP_EVENT_CLUSTER_CHARS = 200
+# Fallback boundaries at plain whitespace, used only when no sentence end fits
+DP_FALLBACK_SCORE = -0.5
+
+# Pattern registry: every heuristic pattern family is compiled once at import
+# and combined into a single alternation, so each family scans a text in one pass.
+
+def _compile_family(patterns, flags=re.IGNORECASE):
+    """
+    Combine a family of regex strings into one compiled alternation.
+    """
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), flags)
+
+# English narrator announcing a new episode ("Section X Unit Y Radio Z"),
+# including Spanish transcriptions of it (e.g. "Sección" instead of "Section")
+EPISODE_NARRATOR_PATTERNS = [
+    # English patterns
+    r'(?:Section|section|SECTION)\s+\d+[^.]*\.',
+    r'(?:Section|section|SECTION)\s+\d+\s+(?:Unit|unit|UNIT)\s+\d+[^.]*\.',
+    r'(?:Section|section|SECTION)\s+\d+\s+(?:Unit|unit|UNIT)\s+\d+\s+(?:Radio|radio|RADIO)\s+\d+[^.]*\.',
+    r'(?:Section|section|SECTION)\s+\d+\s+(?:Radio|radio|RADIO)\s+\d+[^.]*\.',
+    r'\d+\s*(?:st|nd|rd|th)\s+(?:radio|section|unit|part)[^.]*\.',
+    # Spanish transcription of English (common when Whisper transcribes English in Spanish mode)
+    r'(?:Sección|sección|SECCIÓN)\s+\d+[^.]*\.',
+    r'(?:Sección|sección|SECCIÓN)\s+\d+\s+(?:Unió|unió|UNIÓ|Unidad|unidad|UNIDAD)\s+\d+[^.]*\.',
+    r'(?:Sección|sección|SECCIÓN)\s+\d+\s+(?:Unió|unió|UNIÓ|Unidad|unidad|UNIDAD)\s+\d+\s+(?:Radio|radio|RADIO)\s+\d+[^.]*\.',
+    r'(?:Sección|sección|SECCIÓN)\s+\d+\s+(?:Radio|radio|RADIO)\s+\d+[^.]*\.',
+]
+
+# Episode closings (mark the end of an episode)
+EPISODE_CLOSING_PATTERNS = [
+    r'Gracias por escuchar[^.]*\.\s*Hasta (?:pronto|la próxima)\.',
+    r'Gracias por acompañarme[^.]*\.\s*Hasta (?:pronto|la próxima)\.',
+    r'Y así termina[^.]*\.\s*Recuerda[^.]*\.\s*Hasta pronto\.',
+    r'¡Ah! Gracias por escuchar[^.]*\.\s*Nos vemos pronto\.',
+]
+
+# Episode introductions (a new episode starts)
+EPISODE_INTRO_PATTERNS = [
+    r'Hola, te doy la bienvenida a',
+    r'¡Pu-pu-pu! Hola, te doy la bienvenida a',
+    r'Te doy la bienvenida a',
+    r'¿Te doy la bienvenida a',
+    r'Hola, les doy la bienvenida a',
+    r'Hola, esto es',
+    r'¡Hola! Esto es',
+]
+
+# English narrator phrases inside a transcript
+ENGLISH_NARRATOR_PATTERNS = [
+    r'(?:Section|section|SECTION)\s+\d+',
+    r'(?:Unit|unit|UNIT)\s+\d+',
+    r'(?:Radio|radio|RADIO)\s+\d+',
+    r'\d+\s*(?:st|nd|rd|th)\s+(?:radio|section|unit|part)',
+]
+
+# Name introductions and forms of address, each capturing the name in group 1.
+# Kept as separate scanners because their matches may overlap.
+SPEAKER_NAME_PATTERNS = [
+    r'(?:Soy|soy)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',  # "Soy María" or "Soy María José"
+    r'(?:Me llamo|me llamo)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',  # "Me llamo Carlos"
+    r'(?:Mi nombre es|mi nombre es)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',  # "Mi nombre es Ana"
+    r'(?:Hola|hola),?\s+([A-Z][a-z]+)',  # "Hola, Juan" (when addressing someone)
+    r'(?:Hola|hola)\s+([A-Z][a-z]+)',  # "Hola Juan"
+    r'([A-Z][a-z]+),?\s+(?:gracias|Gracias)',  # "María, gracias"
+    r'([A-Z][a-z]+),?\s+(?:cuéntanos|cuéntame)',  # "María, cuéntanos"
+]
+
+# Capitalized words that the name patterns pick up but are not names
+SPEAKER_NAME_STOPWORDS = frozenset([
+    'Hola', 'Gracias', 'Bienvenida', 'Bienvenido', 'Soy', 'Llamo', 'Nombre',
+    'Pero', 'Por', 'Los', 'Las', 'Nos', 'Todo', 'Tal', 'Eso', 'Cada',
+    'Muy', 'Ahora', 'Antes', 'Hasta', 'Voy', 'Hace', 'Siempre', 'Entonces',
+    'Algunos', 'Bueno', 'Ideas', 'Recuerda', 'Pintar', 'Visite', 'Alegre',
+    'Carros', 'Colombia',
+])
+
+# Words that suggest a sentence is English narrator
+ENGLISH_INDICATOR_WORDS = frozenset([
+    'section', 'unit', 'radio', 'part', 'number', 'segment',
+    'first', 'second', 'third', 'fourth', 'fifth', 'sixth', 'seventh', 'eighth',
+])
+
+# Self-introduction prefix ("Soy", "Me llamo", "Mi nombre es")
+SELF_INTRO_PREFIX = r'(?:Soy|soy|Me llamo|me llamo|Mi nombre es|mi nombre es)\s+'
+
+EPISODE_NARRATOR_RE = _compile_family(EPISODE_NARRATOR_PATTERNS)
+EPISODE_CLOSING_RE = _compile_family(EPISODE_CLOSING_PATTERNS)
+EPISODE_INTRO_RE = _compile_family(EPISODE_INTRO_PATTERNS)
+CONTENT_INTRO_RE = _compile_family(EPISODE_INTRO_PATTERNS + [r'Soy \w+ y (?:hoy|si)'])
+NEXT_EPISODE_GREETING_RE = re.compile(r'Hola.*bienvenida|Te doy.*bienvenida|Soy \w+ y', re.IGNORECASE)
+ENGLISH_NARRATOR_RE = _compile_family(ENGLISH_NARRATOR_PATTERNS)
+ENGLISH_HINT_RE = re.compile(r'\b(?:section|radio|part|story|number|segment)\s*\d+', re.IGNORECASE)
+NUMBER_HINT_RE = re.compile(r'(?:^|\n\n)\s*(\d+)\s*(?:\.|:|\n)')
+SECTION_MARKER_RE = re.compile(r'(?:Section|Unit|Radio)\s+\d+', re.IGNORECASE)
+SECTION_SENTENCE_RE = re.compile(r'((?:Section|Unit|Radio)\s+\d+[^.]*\.)', re.IGNORECASE)
+SPEAKER_NAME_RES = [re.compile(pattern) for pattern in SPEAKER_NAME_PATTERNS]
+CAPITALIZED_WORD_RE = re.compile(r'\b([A-Z][a-z]{2,})\b')
+WORD_REVIEW_RE = re.compile(r'Pero primero.*palabras|estas son algunas palabras', re.IGNORECASE)
+CLOSING_PHRASE_RE = re.compile(r'Gracias por escuchar|Gracias por acompañarme|Y así termina|Hasta pronto|Hasta la próxima', re.IGNORECASE)
+SELF_INTRO_NAME_RE = re.compile(SELF_INTRO_PREFIX + r'(\w+)\b', re.IGNORECASE)
+ADDRESSED_NAME_RE = re.compile(r'(\w+),?\s+(?:cuéntanos|cuéntame|gracias|por qué|porque)', re.IGNORECASE)
+SENTENCE_SPLIT_RE = re.compile(r'[.!?]+\s+')
+WORD_RE = re.compile(r'\b\w+\b')
+BREAK_RE = re.compile(r'\s{2,}|\n')
+NONSPACE_RE = re.compile(r'\S')
+SPACE_RE = re.compile(r'\s+')
+NONSPACE_RUN_RE = re.compile(r'\S+')
+
+# Event kinds produced by scan_episode_events
+EVENT_NARRATOR = 'narrator'
+EVENT_CLOSING = 'closing'
+EVENT_INTRO = 'intro'
+
+def scan_episode_events(text):
+    """
+    Scan a transcript once per pattern family (narrator, closing, intro).
+    Returns list of tuples sorted by position: (start, end, kind)
+    """
+    events = []
+    for kind, scanner in ((EVENT_NARRATOR, EPISODE_NARRATOR_RE),
+                          (EVENT_CLOSING, EPISODE_CLOSING_RE),
+                          (EVENT_INTRO, EPISODE_INTRO_RE)):
+        for match in scanner.finditer(text):
+            events.append((match.start(), match.end(), kind))
+    events.sort()
+    return events
+
+class BoundaryIndex:
+    """
+    Sorted index of episode boundary events over a full transcript.
+    Built from a single scan_episode_events pass; answers "events of a kind
+    inside [start, end)" with bisect instead of re-running the patterns over
+    text slices.
+    """
+
+    def __init__(self, text):
+        self.events = scan_episode_events(text)
+        self.spans = {EVENT_NARRATOR: [], EVENT_CLOSING: [], EVENT_INTRO: []}
+        for start, end, kind in self.events:
+            self.spans[kind].append((start, end))
+        self.starts = {kind: [start for start, _ in spans] for kind, spans in self.spans.items()}
+
+    def between(self, kind, start, end):
+        """
+        Yield (start, end) of events of a kind lying entirely within [start, end),
+        in position order.
+        """
+        spans = self.spans[kind]
+        index = bisect.bisect_left(self.starts[kind], start)
+        while index < len(spans) and spans[index][0] < end:
+            if spans[index][1] <= end:
+                yield spans[index]
+            index += 1
+
+    def first(self, kind, start, end):
+        """
+        Returns the first (start, end) event of a kind within [start, end), or None.
+        """
+        return next(self.between(kind, start, end), None)
+
+def compile_speaker_patterns(speaker_names):
+    """
+    Compile the per-name patterns used by identify_speakers once per call,
+    with all names combined into one alternation (group 1 is the name).
+    Returns dict of compiled patterns: 'self_intro', 'questioned'.
+    """
+    names = '|'.join(re.escape(name) for name in speaker_names)
+    return {
+        # "Soy María" - the named person is speaking
+        'self_intro': re.compile(SELF_INTRO_PREFIX + rf'({names})\b', re.IGNORECASE),
+        # "Mateo, ¿por qué...?" - the named person is being asked, not speaking
+        'questioned': re.compile(rf'(?:^|\s)({names}),?\s*[¿?]|(?:^|\s)({names}),?\s+por qué', re.IGNORECASE),
+    }
+
+def first_matching_name(pattern, sentence, speaker_names):
+    """
+    Find which speaker names a compiled name pattern matches in a sentence.
+    Returns the first matching name in speaker_names order, or None.
+    """
+    found = set()
+    for match in pattern.finditer(sentence):
+        name = next(group for group in match.groups() if group)
+        found.add(name.lower())
+    for name in speaker_names:
+        if name.lower() in found:
+            return name
+    return None
+
+def decode_audio(audio_path, spill_seconds=AUDIO_SPILL_SECONDS):
+    """
+    Decode an audio file once into a mono 16 kHz float32 buffer.
+    Runs a single ffmpeg process; every later stage (Whisper, narrator clips,
+    duration, diarization) reads from the returned buffer.
+    Long files are spilled to a memory-mapped .npy file in the temp directory
+    instead of being held in RAM (release with release_audio()).
+    Returns numpy array (or np.memmap), or None if decoding fails.
+    """
+    cmd = ['ffmpeg', '-nostdin', '-threads', '0', '-i', str(audio_path),
+           '-f', 's16le', '-ac', '1', '-acodec', 'pcm_s16le', '-ar', str(SAMPLE_RATE), '-']
+    spill_bytes = int(spill_seconds * SAMPLE_RATE) * 2
+    chunks = []
+    total_bytes = 0
+    raw_file = None
+    try:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        # Keep short files in memory; stream the PCM of long files to disk
+        for chunk in iter(lambda: process.stdout.read(1 << 20), b''):
+            total_bytes += len(chunk)
+            if raw_file is None and total_bytes > spill_bytes:
+                raw_file = tempfile.TemporaryFile()
+                for buffered in chunks:
+                    raw_file.write(buffered)
+                chunks = []
+            if raw_file is not None:
+                raw_file.write(chunk)
+            else:
+                chunks.append(chunk)
+        if process.wait() != 0 or total_bytes < 2:
+            print(f"   ⚠️  Warning: Could not decode audio: {audio_path}")
+            return None
+        
+        n_samples = total_bytes // 2
+        if raw_file is None:
+            pcm = np.frombuffer(b''.join(chunks)[:n_samples * 2], dtype=np.int16)
+            return pcm.astype(np.float32) / 32768.0
+        
+        # Convert the spilled PCM into a float32 .npy memmap block by block
+        fd, npy_path = tempfile.mkstemp(prefix='spanish_helper_', suffix='.npy')
+        os.close(fd)
+        audio = np.lib.format.open_memmap(npy_path, mode='w+', dtype=np.float32, shape=(n_samples,))
+        raw_file.seek(0)
+        block_samples = SAMPLE_RATE * 60
+        offset = 0
+        while offset < n_samples:
+            block = np.frombuffer(raw_file.read(block_samples * 2), dtype=np.int16)[:n_samples - offset]
+            audio[offset:offset + len(block)] = block.astype(np.float32) / 32768.0
+            offset += len(block)
+        audio.flush()
+        return audio
+    except (subprocess.SubprocessError, OSError) as e:
+        print(f"   ⚠️  Warning: Could not decode audio: {str(e)}")
+        return None
+    finally:
+        if raw_file is not None:
+            raw_file.close()
+
+def stream_audio_windows(audio_path, window_seconds=STREAM_WINDOW_SECONDS, overlap_seconds=STREAM_OVERLAP_SECONDS):
+    """
+    Decode an audio file incrementally into overlapping windows of mono 16 kHz
+    float32 samples, reading ffmpeg's output as it is produced, so at most one
+    window is held in memory whatever the length of the file.
+    Yields tuples: (start_time, samples, is_last)
+    """
+    cmd = ['ffmpeg', '-nostdin', '-threads', '0', '-i', str(audio_path),
+           '-f', 's16le', '-ac', '1', '-acodec', 'pcm_s16le', '-ar', str(SAMPLE_RATE), '-']
+    window = int(window_seconds * SAMPLE_RATE)
+    step = max(1, window - int(overlap_seconds * SAMPLE_RATE))
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        samples = np.zeros(0, dtype=np.float32)
+        leftover = b''
+        start = 0
+        eof = False
+        while True:
+            # Read one sample past the window to know whether another window follows
+            while not eof and len(samples) <= window:
+                chunk = process.stdout.read(1 << 20)
+                if not chunk:
+                    eof = True
+                    break
+                chunk = leftover + chunk
+                usable = len(chunk) - len(chunk) % 2
+                leftover = chunk[usable:]
+                pcm = np.frombuffer(chunk[:usable], dtype=np.int16).astype(np.float32) / 32768.0
+                samples = np.concatenate([samples, pcm])
+            if eof and len(samples) <= window:
+                if len(samples):
+                    yield start / SAMPLE_RATE, samples, True
+                elif start == 0:
+                    print(f"   ⚠️  Warning: Could not decode audio: {audio_path}")
+                return
+            yield start / SAMPLE_RATE, samples[:window], False
+            samples = samples[step:]
+            start += step
+    finally:
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+def release_audio(audio):
+    """
+    Release a decoded audio buffer, removing its .npy spill file if it has one.
+    """
+    if isinstance(audio, np.memmap) and audio.filename:
+        spill_path = audio.filename
+        try:
+            os.unlink(spill_path)
+        except OSError:
+            pass
+
+def frame_energies_db(audio, frame):
+    """
+    Mean energy (dBFS) of consecutive frames of `frame` samples, computed block
+    by block so a memory-mapped buffer is never loaded at once.
+    Returns float32 array with one value per whole frame.
+    """
+    n_frames = len(audio) // frame
+    energies = np.empty(n_frames, dtype=np.float32)
+    block_frames = 2000
+    for first in range(0, n_frames, block_frames):
+        count = min(block_frames, n_frames - first)
+        block = np.asarray(audio[first * frame:(first + count) * frame], dtype=np.float32)
+        energies[first:first + count] = 10 * np.log10(np.square(block.reshape(count, frame)).mean(axis=1) + 1e-10)
+    return energies
+
+def detect_speech_regions(audio):
+    """
+    Energy-based voice activity detection: frames louder than the noise floor by
+    VAD_THRESHOLD_DB (but at most VAD_SPEECH_RANGE_DB below the loud frames) are
+    speech; pauses shorter than VAD_MIN_SILENCE_SECONDS are bridged, runs shorter
+    than VAD_MIN_SPEECH_SECONDS dropped, and each region is padded by VAD_PADDING_SECONDS.
+    Returns list of (start_sample, end_sample) regions in time order.
+    """
+    frame = int(VAD_FRAME_SECONDS * SAMPLE_RATE)
+    energies = frame_energies_db(audio, frame)
+    if not len(energies):
+        return []
+    noise_floor, loud = np.percentile(energies, [VAD_NOISE_PERCENTILE, VAD_SPEECH_PERCENTILE])
+    threshold = max(min(noise_floor + VAD_THRESHOLD_DB, loud - VAD_SPEECH_RANGE_DB), VAD_SILENCE_DB)
+    voiced = np.concatenate([[False], energies > threshold, [False]])
+    edges = np.flatnonzero(np.diff(voiced.astype(np.int8)))
+    
+    regions = []
+    for start_frame, end_frame in zip(edges[::2], edges[1::2]):
+        start, end = start_frame * frame, end_frame * frame
+        if regions and start - regions[-1][1] < VAD_MIN_SILENCE_SECONDS * SAMPLE_RATE:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+    
+    padding = int(VAD_PADDING_SECONDS * SAMPLE_RATE)
+    padded = []
+    for start, end in regions:
+        if end - start < VAD_MIN_SPEECH_SECONDS * SAMPLE_RATE:
+            continue
+        start, end = max(0, start - padding), min(len(audio), end + padding)
+        if padded and start <= padded[-1][1]:
+            padded[-1] = (padded[-1][0], end)
+        else:
+            padded.append((start, end))
+    return padded
+
+class SpeechTimeline:
+    """
+    Speech regions of an audio buffer (see detect_speech_regions) and the map
+    between the original timeline and the compacted speech-only audio, in which
+    the regions are concatenated in order.
+    """
+    
+    # VAD settings, part of the cache key of every stage run on compacted audio
+    params = {
+        'frame': VAD_FRAME_SECONDS, 'threshold_db': VAD_THRESHOLD_DB, 'noise_percentile': VAD_NOISE_PERCENTILE,
+        'silence_db': VAD_SILENCE_DB, 'speech_percentile': VAD_SPEECH_PERCENTILE,
+        'speech_range_db': VAD_SPEECH_RANGE_DB, 'min_speech': VAD_MIN_SPEECH_SECONDS,
+        'min_silence': VAD_MIN_SILENCE_SECONDS, 'padding': VAD_PADDING_SECONDS,
+    }
+    
+    def __init__(self, regions, total_samples):
+        self.regions = list(regions)
+        self.total_samples = total_samples
+        self.compact_starts = []
+        position = 0
+        for start, end in self.regions:
+            self.compact_starts.append(position)
+            position += end - start
+        self.speech_samples = position
+    
+    @classmethod
+    def detect(cls, audio):
+        return cls(detect_speech_regions(audio), len(audio))
+    
+    @property
+    def plausible(self):
+        """
+        Whether enough of the audio was found to be speech to trust the regions
+        (see VAD_MIN_SPEECH_SHARE).
+        """
+        return self.speech_samples >= VAD_MIN_SPEECH_SHARE * self.total_samples
+    
+    def to_original(self, time, is_end=False):
+        """
+        Map a time (seconds) in the compacted audio to the original timeline.
+        An end time on a region boundary maps to the end of the earlier region.
+        """
+        sample = time * SAMPLE_RATE
+        if is_end:
+            i = bisect.bisect_left(self.compact_starts, sample) - 1
+        else:
+            i = bisect.bisect_right(self.compact_starts, sample) - 1
+        i = min(max(i, 0), len(self.regions) - 1)
+        start, end = self.regions[i]
+        return float(min(start + sample - self.compact_starts[i], end) / SAMPLE_RATE)
+    
+    def compact(self, audio):
+        """
+        Concatenate the speech regions of audio, spilled to a .npy memmap (as in
+        decode_audio) when longer than AUDIO_SPILL_SECONDS; release with release_audio().
+        Returns float32 array.
+        """
+        if self.speech_samples > AUDIO_SPILL_SECONDS * SAMPLE_RATE:
+            fd, npy_path = tempfile.mkstemp(prefix='spanish_helper_', suffix='.npy')
+            os.close(fd)
+            speech = np.lib.format.open_memmap(npy_path, mode='w+', dtype=np.float32, shape=(self.speech_samples,))
+        else:
+            speech = np.empty(self.speech_samples, dtype=np.float32)
+        for (start, end), position in zip(self.regions, self.compact_starts):
+            speech[position:position + end - start] = audio[start:end]
+        return speech
+    
+    def remap_result(self, result):
+        """
+        Map the segment and word timestamps of a Whisper result on compacted
+        audio back to the original timeline.
+        Returns a new result dict.
+        """
+        segments = []
+        for segment in result.get("segments", []):
+            segment = dict(segment,
+                           start=self.to_original(segment["start"]),
+                           end=self.to_original(segment["end"], is_end=True))
+            if "words" in segment:
+                segment["words"] = [
+                    dict(word, start=self.to_original(word["start"]), end=self.to_original(word["end"], is_end=True))
+                    for word in segment["words"]
+                ]
+            segments.append(segment)
+        return dict(result, segments=segments)
+    
+    def report(self):
+        total = self.total_samples / SAMPLE_RATE
+        speech = self.speech_samples / SAMPLE_RATE
+        skipped = 1 - speech / total if total else 0.0
+        print(f"   🔇 VAD: {speech / 60:.1f} of {total / 60:.1f} min is speech "
+              f"({len(self.regions)} region(s), {skipped:.0%} skipped)")
+
+def detect_speech(audio):
+    """
+    Run voice activity detection on a decoded buffer and report the result.
+    Returns SpeechTimeline, or None if implausibly little speech was found
+    (less than VAD_MIN_SPEECH_SHARE; the whole audio is used then).
+    """
+    speech = SpeechTimeline.detect(audio)
+    speech.report()
+    if not speech.plausible:
+        print(f"   ⚠️  VAD kept less than {VAD_MIN_SPEECH_SHARE:.0%} of the audio, using the whole audio")
+        return None
+    return speech
+
+# Audio content hashes, keyed by (path, size, mtime)
+_AUDIO_HASHES = {}
+
+def compute_audio_hash(audio_path):
+    """
+    Compute the SHA-256 of the audio file content (used as a cache key).
+    Memoized per path, size and modification time.
+    """
+    stat = os.stat(audio_path)
+    memo_key = (str(audio_path), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _AUDIO_HASHES:
+        digest = hashlib.sha256()
+        with open(audio_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        _AUDIO_HASHES[memo_key] = digest.hexdigest()
+    return _AUDIO_HASHES[memo_key]
+
+def load_cached_json(namespace, key):
+    """
+    Load a cached JSON entry from CACHE_DIR/namespace/key.json.
+    Returns the decoded data, or None if missing or unreadable.
+    """
+    cache_path = CACHE_DIR / namespace / f"{key}.json"
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_cached_json(namespace, key, data):
+    """
+    Save a JSON entry to CACHE_DIR/namespace/key.json.
+    Writes to a temporary file first so a crash never leaves a partial entry.
+    """
+    cache_path = CACHE_DIR / namespace / f"{key}.json"
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            # NumPy scalars/arrays (e.g. in Whisper results) are stored as plain values
+            json.dump(data, f, ensure_ascii=False,
+                      default=lambda o: o.tolist() if hasattr(o, 'tolist') else str(o))
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"   ⚠️  Warning: Could not write cache entry {namespace}/{key}: {str(e)}")
+
+def text_hash(text):
+    """
+    SHA-256 of a text (used to key cached stages on their input text).
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def stage_cache_key(audio_hash, stage, params):
+    """
+    Build a content-addressed cache key from the audio content hash,
+    the stage name and the stage parameters.
+    """
+    payload = json.dumps({'audio': audio_hash, 'stage': stage, 'params': params},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def load_stage_cache(audio_hash, stage, params):
+    """
+    Load a cached intermediate pipeline result (Whisper output, proofread text,
+    diarization segments, episode splits).
+    Returns the cached data, or None on a cache miss.
+    """
+    return load_cached_json(f"stages/{stage}", stage_cache_key(audio_hash, stage, params))
+
+def save_stage_cache(audio_hash, stage, params, data):
+    """
+    Save an intermediate pipeline result to the stage cache.
+    """
+    save_cached_json(f"stages/{stage}", stage_cache_key(audio_hash, stage, params), data)
+
+def quantize_whisper(model):
+    """
+    Apply torch dynamic int8 quantization to the linear layers of an
+    openai-whisper model, in place.
+    Returns the quantized model.
+    """
+    torch = import_torch()
+    # Whisper's Linear subclass only changes forward() (it casts the weights to the
+    # input dtype); quantize_dynamic converts exact nn.Linear modules only
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear):
+            module.__class__ = torch.nn.Linear
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+def load_quantized_whisper(model_size=WHISPER_MODEL_NAME):
+    """
+    Load an openai-whisper model with torch dynamic int8 quantization of its linear
+    layers (attention projections and MLPs; convolutions and embeddings stay fp32).
+    The quantized weights (state_dict and model dimensions, no pickled code) are
+    saved under CACHE_DIR/models, keyed by the whisper and torch versions; later
+    loads rebuild the quantized model from them with torch.load(weights_only=True),
+    skipping the fp32 checkpoint.
+    Returns the quantized model.
+    """
+    torch = import_torch()
+    whisper = import_whisper()
+    cache_path = CACHE_DIR / "models" / f"whisper-{model_size}-int8-weights-{whisper.__version__}-torch{torch.__version__}.pt"
+    if cache_path.exists():
+        try:
+            checkpoint = torch.load(cache_path, weights_only=True)
+            model = whisper.model.Whisper(whisper.model.ModelDimensions(**checkpoint["dims"]))
+            # Word timestamps use the alignment heads load_model would have set
+            if model_size in whisper._ALIGNMENT_HEADS:
+                model.set_alignment_heads(whisper._ALIGNMENT_HEADS[model_size])
+            model = quantize_whisper(model)
+            model.load_state_dict(checkpoint["state_dict"])
+            print("   ♻️  Using cached int8 Whisper model")
+            return model
+        except Exception as e:
+            print(f"   ⚠️  Warning: Could not load cached int8 model: {str(e)}")
+    
+    model = quantize_whisper(whisper.load_model(model_size, device="cpu"))
+    
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        torch.save({'dims': vars(model.dims), 'state_dict': model.state_dict()}, temp_path)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"   ⚠️  Warning: Could not cache int8 model: {str(e)}")
+    return model
+
+class WhisperBackend:
+    """
+    openai-whisper transcription engine (PyTorch on CPU: fp32, or int8 dynamic
+    quantization of the linear layers with compute type "int8").
+    Every engine exposes transcribe(audio, **options), returning an openai-whisper
+    style result dict, and detect_languages(clips), returning one
+    {language: probability} dict per 16 kHz clip.
+    """
+    
+    name = "whisper"
+    COMPUTE_TYPES = ("float32", "int8")
+    
+    def __init__(self, model_size=WHISPER_MODEL_NAME, compute_type="float32", cpu_threads=0):
+        if compute_type not in self.COMPUTE_TYPES:
+            raise ValueError(f"{self.name} backend does not support compute type {compute_type!r} "
+                             f"(use one of: {', '.join(self.COMPUTE_TYPES)})")
+        self.model_size = model_size
+        self.compute_type = compute_type
+        if cpu_threads:
+            import_torch().set_num_threads(cpu_threads)
+        if compute_type == "int8":
+            self.model = load_quantized_whisper(model_size)
+        else:
+            self.model = import_whisper().load_model(model_size)
+    
+    @property
+    def cache_name(self):
+        # fp32 keeps the plain model size, so caches written before backends existed stay valid
+        if self.compute_type == "float32":
+            return self.model_size
+        return f"{self.model_size}:{self.compute_type}"
+    
+    def transcribe(self, audio, **options):
+        return self.model.transcribe(audio, **options)
+    
+    def detect_languages(self, clips):
+        whisper = import_whisper()
+        torch = import_torch()
+        mels = [whisper.log_mel_spectrogram(whisper.pad_or_trim(clip), self.model.dims.n_mels) for clip in clips]
+        _, probs = self.model.detect_language(torch.stack(mels).to(self.model.device))
+        return probs
+
+class FasterWhisperBackend:
+    """
+    faster-whisper transcription engine (CTranslate2), e.g. with int8 weights on CPU.
+    Results are converted to the openai-whisper layout (text, segments, words).
+    """
+    
+    name = "faster-whisper"
+    COMPUTE_TYPES = ("int8", "int8_float32", "int16", "float32")
+    
+    def __init__(self, model_size=WHISPER_MODEL_NAME, compute_type="int8", cpu_threads=0):
+        if compute_type not in self.COMPUTE_TYPES:
+            raise ValueError(f"{self.name} backend does not support compute type {compute_type!r} on CPU "
+                             f"(use one of: {', '.join(self.COMPUTE_TYPES)})")
+        if not module_available("faster_whisper"):
+            raise ImportError("faster-whisper is not installed (pip install faster-whisper)")
+        from faster_whisper import WhisperModel
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.model = WhisperModel(model_size, device="cpu", compute_type=compute_type, cpu_threads=cpu_threads)
+    
+    @property
+    def cache_name(self):
+        return f"{self.name}:{self.model_size}:{self.compute_type}"
+    
+    def transcribe(self, audio, **options):
+        segments, info = self.model.transcribe(audio, **options)
+        result_segments = []
+        for index, segment in enumerate(segments):
+            result_segments.append({
+                'id': index,
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text,
+                'words': [
+                    {'word': word.word, 'start': word.start, 'end': word.end, 'probability': word.probability}
+                    for word in segment.words or []
+                ],
+            })
+        return {
+            'text': ''.join(segment['text'] for segment in result_segments),
+            'segments': result_segments,
+            'language': info.language,
+        }
+    
+    def detect_languages(self, clips):
+        probs = []
+        for clip in clips:
+            # Language detection runs inside transcribe(); the returned segments are
+            # decoded lazily, so leaving them unread skips the decoding
+            _, info = self.model.transcribe(clip, beam_size=1)
+            probs.append(dict(info.all_language_probs or [(info.language, info.language_probability)]))
+        return probs
+
+# Transcription engines selectable with --backend, with their default compute type
+TRANSCRIPTION_BACKENDS = {
+    "whisper": WhisperBackend,
+    "faster-whisper": FasterWhisperBackend,
+}
+DEFAULT_COMPUTE_TYPES = {
+    "whisper": "float32",
+    "faster-whisper": "int8",
+}
+
+def load_transcription_backend(backend="whisper", model_size=WHISPER_MODEL_NAME, compute_type=None, cpu_threads=0):
+    """
+    Load a transcription engine (see TRANSCRIPTION_BACKENDS) with the given model
+    size and compute type (the engine's default if None); cpu_threads caps the
+    engine's intra-op threads (0 keeps its default).
+    Returns the backend; raises if it cannot be loaded.
+    """
+    return TRANSCRIPTION_BACKENDS[backend](model_size, compute_type or DEFAULT_COMPUTE_TYPES[backend], cpu_threads)
+
+def transcribe_with_cache(model, audio, audio_hash, model_name=WHISPER_MODEL_NAME, speech=None, **options):
+    """
+    Run model.transcribe on the decoded audio, reusing a cached result for the
+    same audio content, model and transcription options.
+    With speech (a SpeechTimeline), only the speech regions are transcribed and
+    the timestamps are mapped back to the original timeline.
+    Returns the Whisper result dict.
+    """
+    params = {'model': model_name, **options}
+    if speech is not None:
+        params['vad'] = speech.params
+    cached = load_stage_cache(audio_hash, "whisper", params)
+    if cached is not None:
+        print("   ♻️  Using cached Whisper result")
+        return cached
+    
+    if speech is None:
+        result = model.transcribe(audio, **options)
+    else:
+        speech_audio = speech.compact(audio)
+        try:
+            result = speech.remap_result(model.transcribe(speech_audio, **options))
+        finally:
+            release_audio(speech_audio)
+    save_stage_cache(audio_hash, "whisper", params, result)
+    return result
+
+def audio_duration_from_buffer(audio):
+    """
+    Get audio duration in seconds from a decoded 16 kHz buffer.
+    """
+    return len(audio) / SAMPLE_RATE
+
+# LanguageTool edits per normalized sentence (LRU, backed by the disk cache)
+_PROOFREAD_SENTENCES = OrderedDict()
+
+def split_sentences(text):
+    """
+    Split text into sentences, keeping the whitespace that follows each one,
+    so ''.join(sentence + separator) rebuilds the text exactly.
+    Returns list of tuples: (sentence, separator)
+    """
+    pieces = []
+    start = 0
+    for match in SENTENCE_SPLIT_RE.finditer(text):
+        separator_start = match.start() + len(match.group().rstrip())
+        pieces.append((text[start:separator_start], text[separator_start:match.end()]))
+        start = match.end()
+    if start < len(text):
+        stripped = text[start:].rstrip()
+        pieces.append((stripped, text[start + len(stripped):]))
+    return pieces
+
+def correction_edits(matches, start, end):
+    """
+    Collect the first suggested replacement of each LanguageTool match that lies
+    within [start, end) (overlapping matches are skipped).
+    Returns list of [edit_start, edit_end, replacement] with offsets relative to start.
+    """
+    edits = []
+    cursor = start
+    for match in matches:
+        if not match.replacements:
+            continue
+        # Handle both old (errorLength) and new (error_length) attribute names
+        error_length = getattr(match, 'error_length', getattr(match, 'errorLength', 0))
+        match_start = match.offset
+        match_end = match.offset + error_length
+        if match_start < cursor or match_end > end:
+            continue
+        edits.append([match_start - start, match_end - start, match.replacements[0]])
+        cursor = match_end
+    return edits
+
+def apply_edits(text, edits, positions=None):
+    """
+    Apply sorted, non-overlapping edits to text in a single join pass.
+    positions, if given, maps each edit offset to an offset in text.
+    Returns the edited text.
+    """
+    pieces = []
+    cursor = 0
+    for edit_start, edit_end, replacement in edits:
+        if positions is not None:
+            edit_start, edit_end = positions[edit_start], positions[edit_end]
+        pieces.append(text[cursor:edit_start])
+        pieces.append(replacement)
+        cursor = edit_end
+    pieces.append(text[cursor:])
+    return ''.join(pieces)
+
+def apply_corrections(text, matches, start=0, end=None):
+    """
+    Apply the first suggested replacement of each LanguageTool match that lies
+    within text[start:end] (overlapping matches are skipped).
+    Returns the corrected text[start:end].
+    """
+    if end is None:
+        end = len(text)
+    return apply_edits(text[start:end], correction_edits(matches, start, end))
+
+def normalized_positions(sentence):
+    """
+    Map offsets in the whitespace-normalized sentence (' '.join(sentence.split()))
+    back to the sentence: a joining space maps to the whole whitespace run it
+    stands for, so edits land on the original text with its spacing kept.
+    Returns list of original offsets, one per normalized offset (inclusive of the end).
+    """
+    positions = []
+    for match in NONSPACE_RUN_RE.finditer(sentence):
+        # Each word's end offset doubles as the offset of the space joining it to the next
+        positions.extend(range(match.start(), match.end() + 1))
+    return positions
+
+def _proofread_cache_key(sentence):
+    return text_hash(GRAMMAR_LANGUAGE + '\n' + sentence)
+
+def get_cached_correction(sentence):
+    """
+    Look up the edits for a normalized sentence: memory first, then disk.
+    Returns list of [start, end, replacement] (empty if nothing changes),
+    or None if the sentence has not been checked yet.
+    """
+    if sentence in _PROOFREAD_SENTENCES:
+        _PROOFREAD_SENTENCES.move_to_end(sentence)
+        return _PROOFREAD_SENTENCES[sentence]
+    edits = load_cached_json("proofread_edits", _proofread_cache_key(sentence))
+    if edits is not None:
+        remember_correction(sentence, edits, persist=False)
+    return edits
+
+def remember_correction(sentence, edits, persist=True):
+    """
+    Store the edits for a normalized sentence in memory (and on disk).
+    """
+    _PROOFREAD_SENTENCES[sentence] = edits
+    _PROOFREAD_SENTENCES.move_to_end(sentence)
+    while len(_PROOFREAD_SENTENCES) > PROOFREAD_LRU_SIZE:
+        _PROOFREAD_SENTENCES.popitem(last=False)
+    if persist:
+        save_cached_json("proofread_edits", _proofread_cache_key(sentence), edits)
+
+def check_sentence_batch(tool, sentences):
+    """
+    Check a batch of sentences with one LanguageTool request.
+    Sentences are joined with blank lines and each match is applied to the
+    sentence it falls in; matches spanning two sentences are dropped so every
+    correction depends on its own sentence only (and can be cached per sentence).
+    Returns list of edit lists, one per sentence (see correction_edits).
+    """
+    batch_text = '\n\n'.join(sentences)
+    matches = sorted(tool.check(batch_text), key=lambda match: match.offset)
+    edits = []
+    offset = 0
+    for sentence in sentences:
+        edits.append(correction_edits(matches, offset, offset + len(sentence)))
+        offset += len(sentence) + 2
+    return edits
+
+class GrammarToolPool:
+    """
+    Pool of LanguageTool instances, each running its own local server process.
+    check() sends one request to whichever server is idle, so the pool can be
+    used wherever a single LanguageTool is expected; submit() runs a function
+    on the pool's threads (one per server) for concurrent checking.
+    """
+    
+    def __init__(self, tools):
+        self.tools = list(tools)
+        self._idle = queue.Queue()
+        for tool in self.tools:
+            self._idle.put(tool)
+        self._executor = ThreadPoolExecutor(max_workers=len(self.tools), thread_name_prefix="languagetool")
+    
+    def __len__(self):
+        return len(self.tools)
+    
+    def check(self, text):
+        tool = self._idle.get()
+        try:
+            return tool.check(text)
+        finally:
+            self._idle.put(tool)
+    
+    def submit(self, fn, *args):
+        return self._executor.submit(fn, *args)
+    
+    def close(self):
+        self._executor.shutdown(wait=True)
+        for tool in self.tools:
+            tool.close()
+
+class LazyGrammarTool:
+    """
+    Grammar checker that is loaded (see load_grammar_tool) only when a sentence
+    actually has to be checked, so runs where every file is skipped or every
+    sentence is cached never start LanguageTool. It is loaded at most once, also
+    when several threads need it at the same time.
+    """
+    
+    def __init__(self, servers=1, remote_url=None):
+        self.servers = servers
+        self.remote_url = remote_url
+        self._tool = None
+        self._loaded = False
+        self._lock = threading.Lock()
+    
+    def get(self):
+        """
+        Load the grammar checker on first use.
+        Returns the tool, or None if it could not be loaded.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._tool = load_grammar_tool(self.servers, self.remote_url)
+                self._loaded = True
+            return self._tool
+    
+    def check(self, text):
+        tool = self.get()
+        return tool.check(text) if tool is not None else []
+    
+    def close(self):
+        with self._lock:
+            if self._tool is not None:
+                self._tool.close()
+                self._tool = None
+
+def _timed_batch_check(tool, batch):
+    start = time.perf_counter()
+    edits = check_sentence_batch(tool, batch)
+    return edits, time.perf_counter() - start
+
+def check_batches(tool, batches):
+    """
+    Check sentence batches with LanguageTool: concurrently across the servers
+    of a GrammarToolPool, serially with a single tool.
+    Returns list of tuples in batch order: (edits_per_sentence, latency_seconds, error)
+    where error is the exception raised for that batch (or None).
+    """
+    outcomes = []
+    if isinstance(tool, GrammarToolPool) and len(tool) > 1 and len(batches) > 1:
+        futures = [tool.submit(_timed_batch_check, tool, batch) for batch in batches]
+        for future in futures:
+            try:
+                outcomes.append(future.result() + (None,))
+            except Exception as e:
+                outcomes.append((None, None, e))
+        return outcomes
+    for batch in batches:
+        try:
+            outcomes.append(_timed_batch_check(tool, batch) + (None,))
+        except Exception as e:
+            outcomes.append((None, None, e))
+    return outcomes
 
 def proofread_spanish(text, tool):
     """
     Proofread Spanish text using LanguageTool.
+    The text is checked sentence by sentence: corrections are cached per normalized
+    sentence (in memory and on disk) and applied to the original sentences, so
+    spacing and line breaks are kept, repeated intros and closings are checked
+    once, and only uncached sentences are sent to LanguageTool, in batches
+    (checked concurrently when tool is a GrammarToolPool). A LazyGrammarTool is
+    only loaded if some sentence is not cached.
     """
     if tool is None:
         return text
     
-    try:
-        matches = tool.check(text)
-        corrected_text = text
-        
-        # Apply corrections in reverse order to maintain correct positions
-        for match in reversed(matches):
-            if match.replacements:
-                start = match.offset
-                # Handle both old (errorLength) and new (error_length) attribute names
-                error_length = getattr(match, 'error_length', getattr(match, 'errorLength', 0))
-                end = match.offset + error_length
-                corrected_text = corrected_text[:start] + match.replacements[0] + corrected_text[end:]
-        
-        return corrected_text
-    except Exception as e:
-        print(f"   ⚠️  Warning: Grammar check failed: {str(e)}")
-        return text
+    # 'method' keeps results rebuilt from whitespace-normalized sentences out of the cache
+    params = {'text': text_hash(text), 'language': GRAMMAR_LANGUAGE, 'method': 'sentence-edits'}
+    cached = load_stage_cache(None, "proofread", params)
+    if cached is not None:
+        return cached
+    
+    pieces = split_sentences(text)
+    normalized = [' '.join(sentence.split()) for sentence, _ in pieces]
+    corrections = {}
+    pending = []
+    # Hits are counted per unique sentence looked up, not per repetition
+    hits = 0
+    for sentence in normalized:
+        if not sentence or sentence in corrections:
+            continue
+        edits = get_cached_correction(sentence)
+        if edits is None:
+            corrections[sentence] = None
+            pending.append(sentence)
+        else:
+            corrections[sentence] = edits
+            hits += 1
+    
+    failed = False
+    if pending and isinstance(tool, LazyGrammarTool):
+        tool = tool.get()
+        if tool is None:
+            # Keep the cached corrections and leave the other sentences as they are
+            failed = True
+            pending = []
+    
+    # Check the uncached sentences in batches of about PROOFREAD_BATCH_CHARS
+    batches = []
+    batch_chars = 0
+    for sentence in pending:
+        if batches and batch_chars + len(sentence) <= PROOFREAD_BATCH_CHARS:
+            batches[-1].append(sentence)
+            batch_chars += len(sentence) + 2
+        else:
+            batches.append([sentence])
+            batch_chars = len(sentence) + 2
+    latencies = []
+    for batch, (edits_batch, latency, error) in zip(batches, check_batches(tool, batches)):
+        if error is not None:
+            print(f"   ⚠️  Warning: Grammar check failed: {str(error)}")
+            failed = True
+            continue
+        latencies.append(latency)
+        for sentence, edits in zip(batch, edits_batch):
+            corrections[sentence] = edits
+            remember_correction(sentence, edits)
+    
+    unique = len(corrections)
+    if unique:
+        print(f"   📝 Proofread {sum(1 for sentence in normalized if sentence)} sentence(s), {unique} unique: {hits} cached "
+              f"({hits / unique:.0%} hit rate), {len(pending)} checked in {len(batches)} batch(es)")
+    if latencies:
+        print(f"      LanguageTool latency: {sum(latencies) / len(latencies) * 1000:.0f} ms/batch "
+              f"(max {max(latencies) * 1000:.0f} ms)")
+    
+    # Rebuild the text in one pass, applying each sentence's edits to the original
+    # sentence; unchanged and unchecked sentences stay exactly as they were
+    corrected_pieces = []
+    for (original, separator), sentence in zip(pieces, normalized):
+        edits = corrections.get(sentence)
+        if edits is not None:
+            original = apply_edits(original, edits, normalized_positions(original))
+        corrected_pieces.append(original + separator)
+    corrected_text = ''.join(corrected_pieces)
+    if not failed:
+        save_stage_cache(None, "proofread", params, corrected_text)
+    return corrected_text
 
-def transcribe_english_narrator(audio_path, model, start_time=0, duration=10):
+def transcribe_english_narrator(audio_path, model, start_time=0, duration=10, audio=None, model_name=WHISPER_MODEL_NAME):
     """
     Transcribe the beginning of audio in English to capture narrator's section/unit/radio numbers.
+    If the decoded audio buffer is provided, the clip is sliced from it instead of running ffmpeg
+    (and the result is kept in the stage cache).
     Returns English transcript of the narrator portion.
     """
     try:
-        # Use ffmpeg to extract the first few seconds
-        import tempfile
+        if audio is not None:
+            return transcribe_english_narrators(
+                audio_path, model, [start_time], duration=duration, audio=audio, model_name=model_name
+            )[0]
+        
+        # Use ffmpeg to extract the clip
         with tempfile.NamedTemporaryFile(suffix='.m4a', delete=False) as temp_file:
             temp_path = temp_file.name
         
-        # Extract first N seconds using ffmpeg
+        # Seek to the clip start and extract N seconds using ffmpeg
         subprocess.run(
-            ['ffmpeg', '-i', str(audio_path), '-t', str(duration), 
+            ['ffmpeg', '-ss', str(start_time), '-i', str(audio_path), '-t', str(duration), 
              '-acodec', 'copy', '-y', temp_path],
             capture_output=True,
             timeout=30
@@ -89,24 +1251,271 @@ def transcribe_english_narrator(audio_path, model, start_time=0, duration=10):
         print(f"   ⚠️  Warning: Could not transcribe English narrator: {str(e)}")
         return None
 
+def extract_narrator_clips(audio_path, start_times, duration=8, audio=None):
+    """
+    Extract narrator clips of `duration` seconds starting at each offset in start_times.
+    Slices the decoded audio buffer when provided; otherwise the file is decoded
+    once and every clip is sliced from that single decode.
+    Returns list of float32 arrays, one per start time.
+    """
+    owns_audio = audio is None
+    if owns_audio:
+        audio = decode_audio(audio_path)
+        if audio is None:
+            return []
+    try:
+        clips = []
+        for start_time in start_times:
+            start_sample = max(0, int(start_time * SAMPLE_RATE))
+            end_sample = int((start_time + duration) * SAMPLE_RATE)
+            clips.append(np.array(audio[start_sample:end_sample], dtype=np.float32))
+        return clips
+    finally:
+        if owns_audio:
+            release_audio(audio)
+
+def transcribe_english_narrators(audio_path, model, start_times, duration=8, audio=None, model_name=WHISPER_MODEL_NAME):
+    """
+    Transcribe the English narrator at several offsets (one per episode) in a single
+    batched Whisper pass.
+    The clips are concatenated with short silences and transcribed once in English;
+    recognised words are mapped back to their clip by timestamp.
+    Results are kept in the stage cache per clip.
+    Returns list of English texts (None where nothing was recognised), one per start time.
+    """
+    narrator_texts = [None] * len(start_times)
+    if not start_times:
+        return narrator_texts
+    
+    try:
+        audio_hash = compute_audio_hash(audio_path)
+        pending = []
+        for idx, start_time in enumerate(start_times):
+            params = {'model': model_name, 'start': round(start_time, 2), 'duration': duration}
+            cached = load_stage_cache(audio_hash, "narrator", params)
+            if cached is not None:
+                narrator_texts[idx] = cached or None
+            else:
+                pending.append((idx, params))
+        if not pending:
+            return narrator_texts
+        
+        clips = extract_narrator_clips(
+            audio_path, [start_times[idx] for idx, _ in pending], duration=duration, audio=audio
+        )
+        if len(clips) != len(pending):
+            return narrator_texts
+        
+        for (idx, params), english_text in zip(pending, transcribe_english_clips(model, clips)):
+            save_stage_cache(audio_hash, "narrator", params, english_text)
+            narrator_texts[idx] = english_text or None
+    except Exception as e:
+        print(f"   ⚠️  Warning: Could not transcribe English narrators: {str(e)}")
+    
+    return narrator_texts
+
+def transcribe_english_clips(model, clips):
+    """
+    Transcribe several short audio clips in English with one Whisper call.
+    The clips are concatenated with short silences and transcribed once;
+    recognised words are mapped back to their clip by timestamp.
+    Returns list of English texts (empty string where nothing was recognised).
+    """
+    if not clips:
+        return []
+    
+    # Lay out all clips on one timeline, separated by silence
+    gap = np.zeros(int(NARRATOR_CLIP_GAP * SAMPLE_RATE), dtype=np.float32)
+    pieces = []
+    clip_offsets = []
+    position = 0
+    for clip in clips:
+        clip_offsets.append(position / SAMPLE_RATE)
+        pieces.extend([clip, gap])
+        position += len(clip) + len(gap)
+    batch_audio = np.concatenate(pieces)
+    
+    result = model.transcribe(
+        batch_audio, language="en", word_timestamps=True, condition_on_previous_text=False
+    )
+    
+    # Assign each word to the clip containing its midpoint
+    clip_words = [[] for _ in clips]
+    for segment in result.get("segments", []):
+        for word_info in segment.get("words", []):
+            mid_time = (word_info.get("start", 0) + word_info.get("end", 0)) / 2
+            clip_idx = max(0, bisect.bisect_right(clip_offsets, mid_time) - 1)
+            clip_words[clip_idx].append(word_info.get("word", ""))
+    
+    return [''.join(words).strip() for words in clip_words]
+
+def detect_english_segments(model, audio, whisper_result, start_times, window=NARRATOR_WINDOW_SECONDS):
+    """
+    Run Whisper language detection on the main-pass segments that start within
+    `window` seconds of each start time (the narrator slot of each episode).
+    All candidate windows are scored in batched detect_language calls.
+    Returns sorted list of segment indices detected as English.
+    """
+    segments = whisper_result.get("segments", [])
+    segment_starts = [segment["start"] for segment in segments]
+    candidates = set()
+    for start_time in start_times:
+        lo = bisect.bisect_left(segment_starts, start_time - 1.0)
+        hi = bisect.bisect_right(segment_starts, start_time + window)
+        candidates.update(range(lo, hi))
+    candidates = sorted(candidates)
+    
+    english_indices = []
+    batch_size = 16
+    for batch_start in range(0, len(candidates), batch_size):
+        batch = candidates[batch_start:batch_start + batch_size]
+        clips = [
+            np.array(audio[int(segments[idx]["start"] * SAMPLE_RATE):int(segments[idx]["end"] * SAMPLE_RATE)],
+                     dtype=np.float32)
+            for idx in batch
+        ]
+        for idx, language_probs in zip(batch, model.detect_languages(clips)):
+            if language_probs.get("en", 0) >= ENGLISH_PROBABILITY_THRESHOLD:
+                english_indices.append(idx)
+    
+    return english_indices
+
+def detect_episode_narrators_langid(audio_path, model, audio, whisper_result, start_times, model_name=WHISPER_MODEL_NAME, speech=None):
+    """
+    Find the English narrator of each episode with Whisper language ID on the
+    main-pass segments, instead of transcribing the start of every episode in English.
+    Only segments detected as English are re-decoded in English (in one batch).
+    Returns list of tuples, one per start time: (english_text, narrator_segments)
+    where narrator_segments are the main-pass [start, end, text] of those English
+    segments (so they can be removed from the Spanish transcript).
+    The cache key covers the main-pass segments and the VAD settings (speech,
+    a SpeechTimeline) they were transcribed with.
+    """
+    narrators = [(None, []) for _ in start_times]
+    if not start_times or not whisper_result:
+        return narrators
+    
+    audio_hash = compute_audio_hash(audio_path)
+    params = {
+        'model': model_name,
+        'starts': [round(start_time, 2) for start_time in start_times],
+        'window': NARRATOR_WINDOW_SECONDS,
+        'segments': text_hash(json.dumps([[segment["start"], segment["end"], segment["text"]]
+                                          for segment in whisper_result.get("segments", [])])),
+        'vad': speech.params if speech is not None else None,
+        'format': 'segments',
+    }
+    cached = load_stage_cache(audio_hash, "narrator_langid", params)
+    if cached is not None:
+        return [(english_text, narrator_segments) for english_text, narrator_segments in cached]
+    
+    try:
+        segments = whisper_result["segments"]
+        english_indices = detect_english_segments(model, audio, whisper_result, start_times)
+        clips = [
+            np.array(audio[int(segments[idx]["start"] * SAMPLE_RATE):int(segments[idx]["end"] * SAMPLE_RATE)],
+                     dtype=np.float32)
+            for idx in english_indices
+        ]
+        english_texts = transcribe_english_clips(model, clips)
+        
+        # Attach each English segment to the episode whose narrator slot contains it
+        episode_english = [[] for _ in start_times]
+        episode_segments = [[] for _ in start_times]
+        for idx, english_text in zip(english_indices, english_texts):
+            segment = segments[idx]
+            for episode_idx, start_time in enumerate(start_times):
+                if start_time - 1.0 <= segment["start"] <= start_time + NARRATOR_WINDOW_SECONDS:
+                    if english_text:
+                        episode_english[episode_idx].append(english_text)
+                    episode_segments[episode_idx].append([segment["start"], segment["end"], segment["text"].strip()])
+                    break
+        
+        narrators = [
+            (' '.join(english_parts) or None, narrator_segments)
+            for english_parts, narrator_segments in zip(episode_english, episode_segments)
+        ]
+        save_stage_cache(audio_hash, "narrator_langid", params, narrators)
+    except Exception as e:
+        print(f"   ⚠️  Warning: Language-ID narrator detection failed: {str(e)}")
+    
+    return narrators
+
+def normalized_char_positions(text, start=0, end=None):
+    """
+    Normalize text[start:end] like normalize_for_alignment, keeping track of
+    where each normalized character came from.
+    Returns tuple: (normalized_text, list of positions in text, one per character)
+    """
+    chars = []
+    positions = []
+    for position in range(start, len(text) if end is None else end):
+        for ch in unicodedata.normalize('NFKD', text[position].lower()):
+            if ch.isalnum():
+                chars.append(ch)
+                positions.append(position)
+    return ''.join(chars), positions
+
+def remove_narrator_segments(episode, narrator_segments, timeline=None, episode_start=-1):
+    """
+    Remove the Spanish-mode text of English narrator segments from an episode.
+    Each segment is placed in the episode through the timeline (episode_start is
+    where the episode starts in the timeline's transcript), then its text is
+    matched there ignoring case, accents, punctuation and spacing, so proofreading
+    or an OpenAI transcript do not stop the cut. Without a text match, the words
+    spoken between the segment's start and end times are cut.
+    Returns the episode text without the narrator segments.
+    """
+    cuts = []
+    for segment_start, segment_end, segment_text in narrator_segments:
+        target = normalize_for_alignment(segment_text)
+        if not target:
+            continue
+        if timeline is not None and episode_start >= 0:
+            cut_start = min(max(timeline.position_at(segment_start) - episode_start, 0), len(episode))
+            cut_end = min(max(timeline.position_at(segment_end) - episode_start, cut_start), len(episode))
+        else:
+            cut_start = cut_end = None
+        
+        search_start = max(0, cut_start - NARRATOR_SEARCH_CHARS) if cut_start is not None else 0
+        search_end = min(len(episode), (cut_end or 0) + NARRATOR_SEARCH_CHARS)
+        chars, positions = normalized_char_positions(episode, search_start, search_end)
+        found = chars.find(target)
+        if found >= 0:
+            cut_start = positions[found]
+            cut_end = positions[found + len(target) - 1] + 1
+            # Take the punctuation that closes the segment along with it
+            while cut_end < len(episode) and not episode[cut_end].isspace() and not episode[cut_end].isalnum():
+                cut_end += 1
+        elif cut_start is None or cut_end <= cut_start:
+            continue
+        else:
+            # Cut whole words only
+            while cut_start > 0 and not episode[cut_start - 1].isspace():
+                cut_start -= 1
+            while cut_end < len(episode) and not episode[cut_end].isspace():
+                cut_end += 1
+        cuts.append((cut_start, cut_end))
+    
+    if not cuts:
+        return episode
+    pieces = []
+    cursor = 0
+    for cut_start, cut_end in sorted(cuts):
+        if cut_start >= cursor:
+            pieces.append(episode[cursor:cut_start])
+        cursor = max(cursor, cut_end)
+    pieces.append(episode[cursor:])
+    # Drop the whitespace left where a cut joins the rest of the text
+    return ''.join(piece if i == 0 else piece.lstrip() for i, piece in enumerate(pieces)).strip()
+
 def detect_english_narrator_in_text(text):
     """
     Detect English narrator text in transcript (already transcribed, possibly in Spanish).
     Returns tuple: (english_narrator_text, spanish_text_without_narrator)
     """
-    # Common English patterns that indicate narrator
-    english_patterns = [
-        r'(?:Section|section|SECTION)\s+\d+',
-        r'(?:Unit|unit|UNIT)\s+\d+',
-        r'(?:Radio|radio|RADIO)\s+\d+',
-        r'(?:Section|section|SECTION)\s+\d+\s+(?:Unit|unit|UNIT)\s+\d+',
-        r'(?:Section|section|SECTION)\s+\d+\s+(?:Unit|unit|UNIT)\s+\d+\s+(?:Radio|radio|RADIO)\s+\d+',
-        r'(?:Section|section|SECTION)\s+\d+\s+(?:Radio|radio|RADIO)\s+\d+',
-        r'\d+\s*(?:st|nd|rd|th)\s+(?:radio|section|unit|part)',
-    ]
-    
     # Split into sentences
-    sentences = re.split(r'[.!?]+\s+', text)
+    sentences = SENTENCE_SPLIT_RE.split(text)
     english_sentences = []
     spanish_sentences = []
     found_english = False
@@ -119,20 +1528,16 @@ def detect_english_narrator_in_text(text):
         # Check if sentence contains English narrator patterns
         is_english_narrator = False
         
-        # Check for English patterns
-        for pattern in english_patterns:
-            if re.search(pattern, sentence, re.IGNORECASE):
-                is_english_narrator = True
-                found_english = True
-                break
+        # Check for English patterns (single combined scanner)
+        if ENGLISH_NARRATOR_RE.search(sentence):
+            is_english_narrator = True
+            found_english = True
         
         # Additional check: if sentence is mostly English indicator words
         if not is_english_narrator:
-            english_words = ['section', 'unit', 'radio', 'part', 'number', 'segment', 
-                           'first', 'second', 'third', 'fourth', 'fifth', 'sixth', 'seventh', 'eighth']
-            words = re.findall(r'\b\w+\b', sentence.lower())
+            words = WORD_RE.findall(sentence.lower())
             if words:
-                english_word_count = sum(1 for w in words if w in english_words)
+                english_word_count = sum(1 for w in words if w in ENGLISH_INDICATOR_WORDS)
                 # If more than 30% are English indicator words, likely English narrator
                 if english_word_count / len(words) > 0.3:
                     is_english_narrator = True
@@ -168,24 +1573,13 @@ def detect_english_hints(text):
     """
     hints = []
     
-    # Patterns for English hints: section, radio, part, number, etc.
-    patterns = [
-        r'\b(section|Section|SECTION)\s*(\d+)',
-        r'\b(radio|Radio|RADIO)\s*(\d+)',
-        r'\b(part|Part|PART)\s*(\d+)',
-        r'\b(story|Story|STORY)\s*(\d+)',
-        r'\b(number|Number|NUMBER)\s*(\d+)',
-        r'\b(segment|Segment|SEGMENT)\s*(\d+)',
-    ]
-    
-    for pattern in patterns:
-        for match in re.finditer(pattern, text, re.IGNORECASE):
-            hints.append((match.start(), match.group(0)))
+    # English hints: section, radio, part, number, etc. (single combined scanner)
+    for match in ENGLISH_HINT_RE.finditer(text):
+        hints.append((match.start(), match.group(0)))
     
     # Also look for standalone numbers that might be section markers
     # (numbers at the start of lines or after clear breaks)
-    number_pattern = r'(?:^|\n\n)\s*(\d+)\s*(?:\.|:|\n)'
-    for match in re.finditer(number_pattern, text):
+    for match in NUMBER_HINT_RE.finditer(text):
         hints.append((match.start(), match.group(1)))
     
     return sorted(hints, key=lambda x: x[0])
@@ -240,142 +1634,144 @@ def get_audio_duration(audio_path):
         pass
     return None
 
-def split_by_episode_patterns(text, audio_path=None, speaker_segments=None, audio_duration=None):
+def find_sentence_start(text, pos, lookback=200, nearest=False):
+    """
+    Find where a sentence before pos starts: just after a sentence end in the
+    lookback window before pos, skipping whitespace. By default the first
+    sentence end in the window is used (what the heuristic splitter has always
+    done); nearest=True uses the one closest to pos.
+    Returns pos itself if there is no sentence end in the window.
+    """
+    sentence_start = pos
+    window = range(max(0, pos - lookback), pos)
+    # Look for sentence boundary before this position
+    for i in (reversed(window) if nearest else window):
+        if text[i] in '.!?':
+            sentence_start = i + 1
+            # Skip whitespace
+            while sentence_start < pos and text[sentence_start].isspace():
+                sentence_start += 1
+            break
+    return sentence_start
+
+def find_forced_split(text, start, end, min_required, timeline):
+    """
+    Find a split position near the middle (in time) of text[start:end] when no
+    episode pattern is available: the next sentence boundary near the midpoint,
+    else a whitespace break, else the position itself.
+    Both parts must be at least min_required seconds long (timed with timeline).
+    Returns the split position, or None.
+    """
+    def fits(pos):
+        return (timeline.duration(start, pos) >= min_required and
+                timeline.duration(pos, end) >= min_required)
+    
+    mid_point = timeline.position_at((timeline.time_at(start) + timeline.time_at(end)) / 2)
+    # Only force split if both parts are reasonable
+    if not fits(mid_point):
+        return None
+    
+    # Look for period, exclamation, or question mark near midpoint
+    for offset in range(-300, 301, 50):  # Check in 50-char increments
+        check_pos = mid_point + offset
+        if not (start < check_pos < end and fits(check_pos)):
+            continue
+        window_start = max(check_pos - 150, start)
+        window_end = min(check_pos + 400, end)
+        # Find next sentence boundary after this position
+        boundary_match = SENTENCE_SPLIT_RE.search(text, window_start, window_end)
+        if boundary_match:
+            candidate = boundary_match.end()
+        else:
+            # Find any whitespace boundary, or use the position itself (last resort)
+            whitespace_match = BREAK_RE.search(text, window_start, window_end)
+            candidate = whitespace_match.end() if whitespace_match else check_pos
+        if start < candidate < end and fits(candidate):
+            return candidate
+    return None
+
+def split_by_episode_patterns(text, audio_path=None, speaker_segments=None, audio_duration=None, timeline=None):
     """
     Split transcript into episodes based on multiple heuristics:
     1. Pattern-based: Fixed patterns in Duolinguo radio episodes (intros/closings)
     2. Duration-based: Each episode is roughly 2.5-3 minutes (150-180 seconds)
     3. Speaker-based: Adjacent episodes have different speaker sets
     
+    Durations are measured in seconds through a TextTimeline. With Whisper word
+    timestamps every candidate boundary has its real time; without them the
+    time is interpolated evenly over the audio duration.
+    
     Args:
         text: Full transcript text
         audio_path: Path to audio file (for duration calculation)
         speaker_segments: List of (start_time, end_time, speaker_id, text) tuples from audio diarization
         audio_duration: Audio duration in seconds (if known)
+        timeline: TextTimeline mapping text positions to audio time (if known)
     
     Returns:
         List of episode texts
     """
     episodes = []
     
-    # Get audio duration if not provided
-    if audio_duration is None and audio_path and audio_path.exists():
-        audio_duration = get_audio_duration(audio_path)
-    
     # Calculate expected episode duration (2.5-3 minutes = 150-180 seconds)
     MIN_EPISODE_DURATION = 120  # 2 minutes - minimum expected (merge if shorter)
     TARGET_EPISODE_DURATION = 165  # ~2.75 minutes - target
     MAX_EPISODE_DURATION = 210  # 3.5 minutes - maximum acceptable before splitting
     SPLIT_EPISODE_DURATION = 240  # 4 minutes - definitely split if longer
     
-    # If we have audio duration, calculate text-to-time ratio
-    # Estimate: average speaking rate ~150 words per minute, ~10 chars per word = ~1500 chars/min
-    chars_per_second = None
-    if audio_duration and len(text) > 0:
-        chars_per_second = len(text) / audio_duration
-        # Estimate duration for each character position
-        estimated_chars_per_episode = int(TARGET_EPISODE_DURATION * chars_per_second)
-        min_chars_per_episode = int(MIN_EPISODE_DURATION * chars_per_second)
-        max_chars_per_episode = int(MAX_EPISODE_DURATION * chars_per_second)
-        split_chars_per_episode = int(SPLIT_EPISODE_DURATION * chars_per_second)
-    else:
-        # Fallback: use rough estimates based on typical transcript length
-        estimated_chars_per_episode = 2000  # Rough estimate for 2.5-3 min episode
-        min_chars_per_episode = 1500
-        max_chars_per_episode = 3000
-        split_chars_per_episode = 3500
-        chars_per_second = None  # Not available for time-based calculations
+    if timeline is None:
+        timeline = default_timeline(text, audio_path, audio_duration)
+    duration = timeline.duration
     
     # Step 1: Find initial split points using patterns
     split_points = [0]  # Start with beginning
     
+    # Scan the transcript once for all narrator, closing and intro matches;
+    # every later pass queries this index instead of re-running the patterns
+    boundaries = BoundaryIndex(text)
+    content_end = len(text.rstrip())
+    
+    def is_far_from_splits(position, min_gap):
+        # split_points is kept sorted, so only the neighbours can be within min_gap
+        index = bisect.bisect_left(split_points, position)
+        if index < len(split_points) and split_points[index] - position < min_gap:
+            return False
+        if index > 0 and position - split_points[index - 1] < min_gap:
+            return False
+        return True
+    
     # PRIORITY 1: English narrator patterns (strong signal - always indicates new episode)
     # English narrator typically says "Section X Unit Y Radio Z" or similar
     # These patterns work even if English was transcribed in Spanish (e.g., "Sección" instead of "Section")
-    english_narrator_patterns = [
-        # English patterns
-        r'(?:Section|section|SECTION)\s+\d+[^.]*\.',
-        r'(?:Section|section|SECTION)\s+\d+\s+(?:Unit|unit|UNIT)\s+\d+[^.]*\.',
-        r'(?:Section|section|SECTION)\s+\d+\s+(?:Unit|unit|UNIT)\s+\d+\s+(?:Radio|radio|RADIO)\s+\d+[^.]*\.',
-        r'(?:Section|section|SECTION)\s+\d+\s+(?:Radio|radio|RADIO)\s+\d+[^.]*\.',
-        r'\d+\s*(?:st|nd|rd|th)\s+(?:radio|section|unit|part)[^.]*\.',
-        # Spanish transcription of English (common when Whisper transcribes English in Spanish mode)
-        r'(?:Sección|sección|SECCIÓN)\s+\d+[^.]*\.',
-        r'(?:Sección|sección|SECCIÓN)\s+\d+\s+(?:Unió|unió|UNIÓ|Unidad|unidad|UNIDAD)\s+\d+[^.]*\.',
-        r'(?:Sección|sección|SECCIÓN)\s+\d+\s+(?:Unió|unió|UNIÓ|Unidad|unidad|UNIDAD)\s+\d+\s+(?:Radio|radio|RADIO)\s+\d+[^.]*\.',
-        r'(?:Sección|sección|SECCIÓN)\s+\d+\s+(?:Radio|radio|RADIO)\s+\d+[^.]*\.',
-    ]
-    
-    for pattern in english_narrator_patterns:
-        for match in re.finditer(pattern, text, re.IGNORECASE):
-            pos = match.start()
-            # English narrator is a strong signal - always add as split point (except at position 0)
-            # Look backwards to find the actual start of the English narrator sentence
-            # English narrator usually appears at the start of a sentence
-            sentence_start = pos
-            # Look for sentence boundary before this position
-            for i in range(max(0, pos - 200), pos):
-                if text[i] in '.!?':
-                    sentence_start = i + 1
-                    # Skip whitespace
-                    while sentence_start < pos and text[sentence_start].isspace():
-                        sentence_start += 1
-                    break
-            
-            if sentence_start > 0:
-                is_new_split = True
-                for existing_split in split_points:
-                    if abs(sentence_start - existing_split) < 50:  # Allow closer splits for English narrator
-                        is_new_split = False
-                        break
-                if is_new_split:
-                    split_points.append(sentence_start)
-    
-    # Pattern for episode closing (marks end of episode)
-    closing_patterns = [
-        r'Gracias por escuchar[^.]*\.\s*Hasta (pronto|la próxima)\.',
-        r'Gracias por acompañarme[^.]*\.\s*Hasta (pronto|la próxima)\.',
-        r'Y así termina[^.]*\.\s*Recuerda[^.]*\.\s*Hasta pronto\.',
-        r'¡Ah! Gracias por escuchar[^.]*\.\s*Nos vemos pronto\.',
-    ]
-    
-    for pattern in closing_patterns:
-        for match in re.finditer(pattern, text, re.IGNORECASE):
-            end_pos = match.end()
-            next_text = text[end_pos:end_pos+200]
-            if re.search(r'Hola.*bienvenida|Te doy.*bienvenida|Soy \w+ y', next_text, re.IGNORECASE):
-                split_points.append(end_pos)
-            elif len(text[end_pos:].strip()) > 100:
-                split_points.append(end_pos)
-    
-    # Pattern for episode introductions (new episode starts)
-    intro_patterns = [
-        r'Hola, te doy la bienvenida a',
-        r'¡Pu-pu-pu! Hola, te doy la bienvenida a',
-        r'Te doy la bienvenida a',
-        r'¿Te doy la bienvenida a',
-        r'Hola, les doy la bienvenida a',
-        r'Hola, esto es',
-        r'¡Hola! Esto es',
-    ]
-    
-    for pattern in intro_patterns:
-        for match in re.finditer(pattern, text, re.IGNORECASE):
-            pos = match.start()
-            if pos > 50:
-                is_new_split = True
-                for existing_split in split_points:
-                    if abs(pos - existing_split) < 100:
-                        is_new_split = False
-                        break
-                if is_new_split:
-                    split_points.append(pos)
+    for pos, _ in boundaries.spans[EVENT_NARRATOR]:
+        # English narrator is a strong signal - always add as split point (except at position 0)
+        # Look backwards to find the actual start of the English narrator sentence
+        # English narrator usually appears at the start of a sentence
+        sentence_start = find_sentence_start(text, pos)
+        
+        # Allow closer splits for English narrator
+        if sentence_start > 0 and is_far_from_splits(sentence_start, 50):
+            bisect.insort(split_points, sentence_start)
+    
+    # Episode closings (mark end of episode)
+    for _, end_pos in boundaries.spans[EVENT_CLOSING]:
+        next_content = NONSPACE_RE.search(text, end_pos)
+        if NEXT_EPISODE_GREETING_RE.search(text, end_pos, end_pos + 200):
+            bisect.insort(split_points, end_pos)
+        elif next_content and content_end - next_content.start() > 100:
+            bisect.insort(split_points, end_pos)
+    
+    # Episode introductions (new episode starts)
+    for pos, _ in boundaries.spans[EVENT_INTRO]:
+        if pos > 50 and is_far_from_splits(pos, 100):
+            bisect.insort(split_points, pos)
     
     # Remove duplicates and sort
     split_points = sorted(set(split_points))
     
     # Step 2: Extract speakers for each potential episode segment
     # Use speaker segments if available to identify speaker changes
+    speaker_index = SpeakerIndex(speaker_segments) if speaker_segments else None
     episode_speaker_sets = []
     for i in range(len(split_points)):
         start = split_points[i]
@@ -387,18 +1783,11 @@ def split_by_episode_patterns(text, audio_path=None, speaker_segments=None, audi
         episode_speaker_sets.append(episode_speakers)
         
         # If we have audio-based speaker segments, use them too
-        if speaker_segments:
-            # Estimate time range for this text segment
-            if chars_per_second:
-                start_time = start / chars_per_second
-                end_time = end / chars_per_second
-                # Find speakers in this time range
-                segment_speakers = set()
-                for seg_start, seg_end, speaker_id, seg_text in speaker_segments:
-                    if speaker_id and (start_time <= (seg_start + seg_end) / 2 <= end_time):
-                        segment_speakers.add(speaker_id)
-                if segment_speakers:
-                    episode_speakers.update(segment_speakers)
+        if speaker_index:
+            # Find speakers in this segment's time range
+            segment_speakers = speaker_index.speakers_between(timeline.time_at(start), timeline.time_at(end))
+            if segment_speakers:
+                episode_speakers.update(segment_speakers)
     
     # Step 3: Refine splits based on duration and speaker changes
     # First pass: merge too-short segments
@@ -410,18 +1799,17 @@ def split_by_episode_patterns(text, audio_path=None, speaker_segments=None, audi
         current_start = split_points[i]
         current_end = split_points[i + 1] if i + 1 < len(split_points) else len(text)
         
-        # Calculate length of segment from previous split to current
-        segment_length = current_start - prev_start
+        # Calculate duration of segment from previous split to current
+        segment_duration = duration(prev_start, current_start)
         
         # If segment is too short, check if we should merge with next
-        if segment_length < min_chars_per_episode:
+        if segment_duration < MIN_EPISODE_DURATION:
             # Check next segment
             if i + 1 < len(split_points):
                 next_start = split_points[i + 1]
-                next_segment_length = next_start - current_start
-                # Calculate combined length of current segment + next segment only
+                # Calculate combined duration of current segment + next segment only
                 # (not including the segment after next)
-                combined_length = next_start - prev_start
+                combined_duration = duration(prev_start, next_start)
                 
                 # Get speakers for both segments
                 current_seg = text[prev_start:current_start]
@@ -432,7 +1820,7 @@ def split_by_episode_patterns(text, audio_path=None, speaker_segments=None, audi
                 
                 # Merge if: (1) speakers overlap (same episode split incorrectly), 
                 # or (2) combined length is still reasonable
-                if speakers_overlap or combined_length < max_chars_per_episode:
+                if speakers_overlap or combined_duration < MAX_EPISODE_DURATION:
                     # Skip current split, merge segments
                     i += 1
                     continue
@@ -449,15 +1837,18 @@ def split_by_episode_patterns(text, audio_path=None, speaker_segments=None, audi
         current_start = refined_splits[i]
         current_end = refined_splits[i + 1] if i + 1 < len(refined_splits) else len(text)
         
-        segment_length = current_end - prev_start
+        prev_time = timeline.time_at(prev_start)
+        end_time = timeline.time_at(current_end)
+        segment_duration = end_time - prev_time
+        # Earliest and latest positions that leave a minimum-length episode on each side
+        earliest_split = timeline.position_at(prev_time + MIN_EPISODE_DURATION)
+        latest_split = timeline.position_at(end_time - MIN_EPISODE_DURATION)
         
         # If segment is too long, try to find a good split point
         # Use split_threshold for definitely splitting (4 minutes)
-        if segment_length > max_chars_per_episode:
-            segment_text = text[prev_start:current_end]
-            
+        if segment_duration > MAX_EPISODE_DURATION:
             # Determine how many splits we need (for very long episodes, split multiple times)
-            num_splits_needed = max(1, int(segment_length / max_chars_per_episode))
+            num_splits_needed = max(1, int(segment_duration / MAX_EPISODE_DURATION))
             
             # For very long episodes, be more aggressive in finding split points
             best_split = None
@@ -465,270 +1856,196 @@ def split_by_episode_patterns(text, audio_path=None, speaker_segments=None, audi
             
             # Determine search window based on segment length
             # For very long episodes (>4 min), search a wider area
-            if segment_length > split_chars_per_episode:
+            if segment_duration > SPLIT_EPISODE_DURATION:
                 # Very long episode - search broader area, focus on closing+intro patterns
-                search_start = prev_start + min_chars_per_episode
-                search_end = current_end - min_chars_per_episode
                 
                 # Priority 1: Look for closing pattern followed by intro pattern (clear episode boundary)
                 # This is the strongest indicator of two episodes mixed together
-                for closing_pattern in closing_patterns:
-                    for closing_match in re.finditer(closing_pattern, segment_text, re.IGNORECASE):
-                        closing_end = prev_start + closing_match.end()
+                for _, closing_end in boundaries.between(EVENT_CLOSING, prev_start, current_end):
+                    
+                    # Look for intro pattern within 500 chars after closing (new episode starts)
+                    intro_match = boundaries.first(EVENT_INTRO, closing_end, min(closing_end + 500, current_end))
+                    if intro_match:
+                        candidate = intro_match[0]
+                        before_text = text[prev_start:candidate]
+                        after_text = text[candidate:current_end]
                         
-                        # Look for intro pattern within 500 chars after closing (new episode starts)
-                        next_text = text[closing_end:min(closing_end + 500, current_end)]
-                        for intro_pattern in intro_patterns:
-                            intro_match = re.search(intro_pattern, next_text, re.IGNORECASE)
-                            if intro_match:
-                                candidate = closing_end + intro_match.start()
-                                before_text = text[prev_start:candidate]
-                                after_text = text[candidate:current_end]
-                                
-                                before_speakers = set(extract_speaker_names(before_text))
-                                after_speakers = set(extract_speaker_names(after_text))
-                                speaker_diff = len(before_speakers & after_speakers) == 0
-                                
-                                before_len = len(before_text)
-                                after_len = len(after_text)
-                                len_ok = (min_chars_per_episode <= before_len <= max_chars_per_episode * 1.5 and
-                                         min_chars_per_episode <= after_len <= max_chars_per_episode * 1.5)
-                                
-                                # Very high score for closing+intro pattern (strongest indicator)
-                                score = (5 if True else 0) + (2 if speaker_diff else 0) + (2 if len_ok else 0)
-                                if score > best_score:
-                                    best_score = score
-                                    best_split = candidate
-                                    break
-                            if best_split:
-                                break
-                        if best_split:
+                        before_speakers = set(extract_speaker_names(before_text))
+                        after_speakers = set(extract_speaker_names(after_text))
+                        speaker_diff = len(before_speakers & after_speakers) == 0
+                        
+                        before_duration = duration(prev_start, candidate)
+                        after_duration = duration(candidate, current_end)
+                        len_ok = (MIN_EPISODE_DURATION <= before_duration <= MAX_EPISODE_DURATION * 1.5 and
+                                 MIN_EPISODE_DURATION <= after_duration <= MAX_EPISODE_DURATION * 1.5)
+                        
+                        # Very high score for closing+intro pattern (strongest indicator)
+                        score = 5 + (2 if speaker_diff else 0) + (2 if len_ok else 0)
+                        if score > best_score:
+                            best_score = score
+                            best_split = candidate
                             break
-                    if best_split:
-                        break
                 
                 # Priority 2: If no closing+intro found, look for intro patterns at target intervals
                 if not best_split:
                     for split_idx in range(1, num_splits_needed + 1):
-                        ideal_split_pos = prev_start + int(split_idx * estimated_chars_per_episode)
-                        if ideal_split_pos >= current_end - min_chars_per_episode:
+                        ideal_split_time = prev_time + split_idx * TARGET_EPISODE_DURATION
+                        if ideal_split_time >= end_time - MIN_EPISODE_DURATION:
                             break
+                        ideal_split_pos = timeline.position_at(ideal_split_time)
                         
                         # Search around ideal position
-                        search_start_local = max(prev_start + min_chars_per_episode, ideal_split_pos - 800)
-                        search_end_local = min(current_end - min_chars_per_episode, ideal_split_pos + 800)
+                        search_start_local = max(earliest_split, ideal_split_pos - 800)
+                        search_end_local = min(latest_split, ideal_split_pos + 800)
                         
                         # Check intro patterns first (higher priority)
-                        for pattern in intro_patterns:
-                            for match in re.finditer(pattern, text[search_start_local:search_end_local], re.IGNORECASE):
-                                candidate = search_start_local + match.start()
-                                before_text = text[prev_start:candidate]
-                                after_text = text[candidate:current_end]
-                                
-                                before_speakers = set(extract_speaker_names(before_text))
-                                after_speakers = set(extract_speaker_names(after_text))
-                                speaker_diff = len(before_speakers & after_speakers) == 0
-                                
-                                before_len = len(before_text)
-                                after_len = len(after_text)
-                                len_ok = (min_chars_per_episode <= before_len <= max_chars_per_episode * 1.4 and
-                                         min_chars_per_episode <= after_len <= max_chars_per_episode * 1.4)
-                                
-                                # Bonus for being close to ideal position
-                                pos_bonus = 1 if abs(candidate - ideal_split_pos) < 400 else 0
-                                score = (3 if speaker_diff else 0) + (2 if len_ok else 0) + pos_bonus
-                                if score > best_score:
-                                    best_score = score
-                                    best_split = candidate
-                                    break
-                            if best_split:
+                        for candidate, _ in boundaries.between(EVENT_INTRO, search_start_local, max(search_start_local, search_end_local)):
+                            before_text = text[prev_start:candidate]
+                            after_text = text[candidate:current_end]
+                            
+                            before_speakers = set(extract_speaker_names(before_text))
+                            after_speakers = set(extract_speaker_names(after_text))
+                            speaker_diff = len(before_speakers & after_speakers) == 0
+                            
+                            before_duration = duration(prev_start, candidate)
+                            after_duration = duration(candidate, current_end)
+                            len_ok = (MIN_EPISODE_DURATION <= before_duration <= MAX_EPISODE_DURATION * 1.4 and
+                                     MIN_EPISODE_DURATION <= after_duration <= MAX_EPISODE_DURATION * 1.4)
+                            
+                            # Bonus for being close to ideal position
+                            pos_bonus = 1 if abs(candidate - ideal_split_pos) < 400 else 0
+                            score = (3 if speaker_diff else 0) + (2 if len_ok else 0) + pos_bonus
+                            if score > best_score:
+                                best_score = score
+                                best_split = candidate
                                 break
                         if best_split:
                             break
                 
                 # Priority 3: Look for closing patterns followed by substantial new content
                 if not best_split:
-                    for pattern in closing_patterns:
-                        for match in re.finditer(pattern, segment_text, re.IGNORECASE):
-                            candidate = prev_start + match.end()
-                            # Check if there's substantial new content after closing
-                            after_text = text[candidate:current_end]
-                            if len(after_text.strip()) > min_chars_per_episode * 0.8:  # At least 80% of min length
-                                before_text = text[prev_start:candidate]
-                                before_len = len(before_text)
-                                after_len = len(after_text)
-                                
-                                # Check if lengths are reasonable
-                                if (min_chars_per_episode <= before_len <= max_chars_per_episode * 1.5 and
-                                    min_chars_per_episode <= after_len <= max_chars_per_episode * 1.5):
-                                    before_speakers = set(extract_speaker_names(before_text))
-                                    after_speakers = set(extract_speaker_names(after_text))
-                                    speaker_diff = len(before_speakers & after_speakers) == 0
-                                    
-                                    len_ok_local = (min_chars_per_episode <= before_len <= max_chars_per_episode * 1.5 and
-                                                   min_chars_per_episode <= after_len <= max_chars_per_episode * 1.5)
-                                    score = (4 if True else 0) + (2 if speaker_diff else 0) + (1 if len_ok_local else 0)
-                                    if score > best_score:
-                                        best_score = score
-                                        best_split = candidate
-            else:
-                # Moderately long episode - look around midpoint
-                mid_point = prev_start + segment_length // 2
-                search_start = max(prev_start + min_chars_per_episode, mid_point - 1000)
-                search_end = min(current_end - min_chars_per_episode, mid_point + 1000)
-                
-                # Priority 1: Closing + intro pattern
-                for closing_pattern in closing_patterns:
-                    for closing_match in re.finditer(closing_pattern, text[search_start:search_end], re.IGNORECASE):
-                        closing_end = search_start + closing_match.end()
-                        next_text = text[closing_end:min(closing_end + 500, search_end)]
-                        for intro_pattern in intro_patterns:
-                            intro_match = re.search(intro_pattern, next_text, re.IGNORECASE)
-                            if intro_match:
-                                candidate = closing_end + intro_match.start()
-                                before_text = text[prev_start:candidate]
-                                after_text = text[candidate:current_end]
-                                
+                    for _, candidate in boundaries.between(EVENT_CLOSING, prev_start, current_end):
+                        # Check if there's substantial new content after closing
+                        after_text = text[candidate:current_end]
+                        if duration(candidate, current_end) > MIN_EPISODE_DURATION * 0.8:  # At least 80% of min length
+                            before_text = text[prev_start:candidate]
+                            before_duration = duration(prev_start, candidate)
+                            after_duration = duration(candidate, current_end)
+                            
+                            # Check if lengths are reasonable
+                            if (MIN_EPISODE_DURATION <= before_duration <= MAX_EPISODE_DURATION * 1.5 and
+                                MIN_EPISODE_DURATION <= after_duration <= MAX_EPISODE_DURATION * 1.5):
                                 before_speakers = set(extract_speaker_names(before_text))
                                 after_speakers = set(extract_speaker_names(after_text))
                                 speaker_diff = len(before_speakers & after_speakers) == 0
                                 
-                                before_len = len(before_text)
-                                after_len = len(after_text)
-                                len_ok = (min_chars_per_episode <= before_len <= max_chars_per_episode * 1.3 and
-                                         min_chars_per_episode <= after_len <= max_chars_per_episode * 1.3)
-                                
-                                score = (5 if True else 0) + (2 if speaker_diff else 0) + (2 if len_ok else 0)
+                                score = 4 + (2 if speaker_diff else 0) + 1
                                 if score > best_score:
                                     best_score = score
                                     best_split = candidate
-                                    break
-                            if best_split:
-                                break
-                        if best_split:
+            else:
+                # Moderately long episode - look around midpoint
+                mid_point = timeline.position_at(prev_time + segment_duration / 2)
+                search_start = max(earliest_split, mid_point - 1000)
+                search_end = max(search_start, min(latest_split, mid_point + 1000))
+                
+                # Priority 1: Closing + intro pattern
+                for _, closing_end in boundaries.between(EVENT_CLOSING, search_start, search_end):
+                    intro_match = boundaries.first(EVENT_INTRO, closing_end, max(closing_end, min(closing_end + 500, search_end)))
+                    if intro_match:
+                        candidate = intro_match[0]
+                        before_text = text[prev_start:candidate]
+                        after_text = text[candidate:current_end]
+                        
+                        before_speakers = set(extract_speaker_names(before_text))
+                        after_speakers = set(extract_speaker_names(after_text))
+                        speaker_diff = len(before_speakers & after_speakers) == 0
+                        
+                        before_duration = duration(prev_start, candidate)
+                        after_duration = duration(candidate, current_end)
+                        len_ok = (MIN_EPISODE_DURATION <= before_duration <= MAX_EPISODE_DURATION * 1.3 and
+                                 MIN_EPISODE_DURATION <= after_duration <= MAX_EPISODE_DURATION * 1.3)
+                        
+                        score = 5 + (2 if speaker_diff else 0) + (2 if len_ok else 0)
+                        if score > best_score:
+                            best_score = score
+                            best_split = candidate
                             break
-                    if best_split:
-                        break
                 
                 # Priority 2: Intro patterns
                 if not best_split:
-                    for pattern in intro_patterns:
-                        for match in re.finditer(pattern, text[search_start:search_end], re.IGNORECASE):
-                            candidate = search_start + match.start()
-                            before_text = text[prev_start:candidate]
-                            after_text = text[candidate:current_end]
-                            
-                            before_speakers = set(extract_speaker_names(before_text))
-                            after_speakers = set(extract_speaker_names(after_text))
-                            speaker_diff = len(before_speakers & after_speakers) == 0
-                            
-                            before_len = len(before_text)
-                            after_len = len(after_text)
-                            len_ok = (min_chars_per_episode <= before_len <= max_chars_per_episode * 1.2 and
-                                     min_chars_per_episode <= after_len <= max_chars_per_episode * 1.2)
-                            
-                            score = (3 if speaker_diff else 0) + (1 if len_ok else 0)
-                            if score > best_score:
-                                best_score = score
-                                best_split = candidate
+                    for candidate, _ in boundaries.between(EVENT_INTRO, search_start, search_end):
+                        before_text = text[prev_start:candidate]
+                        after_text = text[candidate:current_end]
+                        
+                        before_speakers = set(extract_speaker_names(before_text))
+                        after_speakers = set(extract_speaker_names(after_text))
+                        speaker_diff = len(before_speakers & after_speakers) == 0
+                        
+                        before_duration = duration(prev_start, candidate)
+                        after_duration = duration(candidate, current_end)
+                        len_ok = (MIN_EPISODE_DURATION <= before_duration <= MAX_EPISODE_DURATION * 1.2 and
+                                 MIN_EPISODE_DURATION <= after_duration <= MAX_EPISODE_DURATION * 1.2)
+                        
+                        score = (3 if speaker_diff else 0) + (1 if len_ok else 0)
+                        if score > best_score:
+                            best_score = score
+                            best_split = candidate
                 
                 # Priority 3: Closing patterns
                 if not best_split:
-                    for pattern in closing_patterns:
-                        for match in re.finditer(pattern, text[search_start:search_end], re.IGNORECASE):
-                            candidate = search_start + match.end()
-                            before_text = text[prev_start:candidate]
-                            after_text = text[candidate:current_end]
-                            
-                            before_speakers = set(extract_speaker_names(before_text))
-                            after_speakers = set(extract_speaker_names(after_text))
-                            speaker_diff = len(before_speakers & after_speakers) == 0
-                            
-                            before_len = len(before_text)
-                            after_len = len(after_text)
-                            len_ok = (min_chars_per_episode <= before_len <= max_chars_per_episode * 1.2 and
-                                     min_chars_per_episode <= after_len <= max_chars_per_episode * 1.2)
-                            
-                            score = (2 if speaker_diff else 0) + (1 if len_ok else 0)
-                            if score > best_score:
-                                best_score = score
-                                best_split = candidate
+                    for _, candidate in boundaries.between(EVENT_CLOSING, search_start, search_end):
+                        before_text = text[prev_start:candidate]
+                        after_text = text[candidate:current_end]
+                        
+                        before_speakers = set(extract_speaker_names(before_text))
+                        after_speakers = set(extract_speaker_names(after_text))
+                        speaker_diff = len(before_speakers & after_speakers) == 0
+                        
+                        before_duration = duration(prev_start, candidate)
+                        after_duration = duration(candidate, current_end)
+                        len_ok = (MIN_EPISODE_DURATION <= before_duration <= MAX_EPISODE_DURATION * 1.2 and
+                                 MIN_EPISODE_DURATION <= after_duration <= MAX_EPISODE_DURATION * 1.2)
+                        
+                        score = (2 if speaker_diff else 0) + (1 if len_ok else 0)
+                        if score > best_score:
+                            best_score = score
+                            best_split = candidate
             
             # For very long episodes (>5 minutes), if no pattern found, force split at midpoint
-            # Lower threshold: if episode is >5 minutes (split_chars_per_episode * 1.25) and no pattern found
-            if not best_split and segment_length > split_chars_per_episode * 1.25:
+            # Lower threshold: if episode is >5 minutes (SPLIT_EPISODE_DURATION * 1.25) and no pattern found
+            if not best_split and segment_duration > SPLIT_EPISODE_DURATION * 1.25:
                 # Episode is extremely long (>5 minutes), force split at midpoint
                 # Look for any intro or closing pattern in the middle 40% (wider search)
-                mid_point = prev_start + segment_length // 2
-                search_start = max(prev_start + min_chars_per_episode, mid_point - int(segment_length * 0.2))
-                search_end = min(current_end - min_chars_per_episode, mid_point + int(segment_length * 0.2))
+                mid_time = prev_time + segment_duration / 2
+                search_start = max(earliest_split, timeline.position_at(mid_time - segment_duration * 0.2))
+                search_end = max(search_start, min(latest_split, timeline.position_at(mid_time + segment_duration * 0.2)))
                 
                 # Try to find ANY intro pattern in this wider search area
-                for pattern in intro_patterns:
-                    for match in re.finditer(pattern, text[search_start:search_end], re.IGNORECASE):
-                        candidate = search_start + match.start()
-                        before_len = candidate - prev_start
-                        after_len = current_end - candidate
-                        
-                        # Accept split if both parts are at least minimum length
-                        # For very long episodes, be more lenient - allow splits even if one part is slightly shorter
-                        min_required = int(min_chars_per_episode * 0.8)  # Allow 80% of minimum
-                        if before_len >= min_required and after_len >= min_required:
-                            best_split = candidate
-                            best_score = 3  # Moderate score for forced split
-                            break
-                    if best_split:
+                for candidate, _ in boundaries.between(EVENT_INTRO, search_start, search_end):
+                    before_duration = duration(prev_start, candidate)
+                    after_duration = duration(candidate, current_end)
+                    
+                    # Accept split if both parts are at least minimum length
+                    # For very long episodes, be more lenient - allow splits even if one part is slightly shorter
+                    min_required = MIN_EPISODE_DURATION * 0.8  # Allow 80% of minimum
+                    if before_duration >= min_required and after_duration >= min_required:
+                        best_split = candidate
+                        best_score = 3  # Moderate score for forced split
                         break
                 
                 # If still no pattern, split at exact midpoint as last resort
                 if not best_split:
-                    mid_point = prev_start + segment_length // 2
-                    before_len = mid_point - prev_start
-                    after_len = current_end - mid_point
-                    # Only force split if both parts are reasonable
-                    # For very long episodes, be more lenient
-                    min_required = int(min_chars_per_episode * 0.75)  # Allow 75% of minimum for forced splits
-                    if before_len >= min_required and after_len >= min_required:
-                                    # Find sentence boundary near midpoint
-                                    # Look for period, exclamation, or question mark near midpoint
-                                    for offset in range(-300, 301, 50):  # Check in 50-char increments, wider range
-                                        check_pos = mid_point + offset
-                                        if prev_start + min_required <= check_pos <= current_end - min_required:
-                                            # Find next sentence boundary after this position
-                                            text_around = text[max(check_pos - 150, prev_start):min(check_pos + 400, current_end)]
-                                            boundary_match = re.search(r'[.!?]+\s+', text_around)
-                                            if boundary_match:
-                                                candidate = max(check_pos - 150, prev_start) + boundary_match.end()
-                                                if prev_start + min_required <= candidate <= current_end - min_required:
-                                                    best_split = candidate
-                                                    best_score = 2  # Low score, but acceptable for forced split
-                                                    break
-                                            else:
-                                                # Find any punctuation or whitespace boundary
-                                                whitespace_match = re.search(r'\s{2,}|\n', text_around)
-                                                if whitespace_match:
-                                                    candidate = max(check_pos - 150, prev_start) + whitespace_match.end()
-                                                    if prev_start + min_required <= candidate <= current_end - min_required:
-                                                        best_split = candidate
-                                                        best_score = 1
-                                                        break
-                                                else:
-                                                    # Use the position itself if no boundary found (last resort)
-                                                    candidate = check_pos
-                                                    if prev_start + min_required <= candidate <= current_end - min_required:
-                                                        best_split = candidate
-                                                        best_score = 1
-                                                        break
-                                        if best_split:
-                                            break
+                    best_split = find_forced_split(text, prev_start, current_end, MIN_EPISODE_DURATION * 0.75, timeline)
             
             if best_split:
-                # Insert new split in refined_splits and restart processing from there
+                # Insert new split in refined_splits and reprocess from the previous
+                # step: it is the only earlier decision that looked at refined_splits[i],
+                # so everything before it stays as already decided
                 refined_splits.insert(i, best_split)
-                # Recalculate speaker sets (will be recalculated in next iteration)
-                # Continue from beginning of this loop to reprocess
-                i = 1
-                final_splits = [refined_splits[0]]
+                if i > 1:
+                    final_splits.pop()
+                    i -= 1
                 continue
         
         # Segment length is reasonable, keep the split
@@ -742,8 +2059,8 @@ def split_by_episode_patterns(text, audio_path=None, speaker_segments=None, audi
     # Final pass: filter out splits that are too close
     filtered_splits = [final_splits[0]]
     for split in final_splits[1:]:
-        min_gap = min_chars_per_episode * 0.4  # At least 40% of min episode length
-        if split - filtered_splits[-1] >= min_gap:
+        min_gap = MIN_EPISODE_DURATION * 0.4  # At least 40% of min episode length
+        if duration(filtered_splits[-1], split) >= min_gap:
             filtered_splits.append(split)
         elif split == len(text):
             # Always include final split
@@ -772,6 +2089,215 @@ def split_by_episode_patterns(text, audio_path=None, speaker_segments=None, audi
     
     return episodes
 
+def segment_episodes_dp(text, audio_path=None, speaker_segments=None, audio_duration=None, timeline=None):
+    """
+    Split transcript into episodes by dynamic programming over candidate boundaries.
+
+    Candidates are sentence ends and narrator/intro/closing matches. A boundary
+    scores for its pattern evidence and for a change of speakers across it; an
+    episode is penalised by how far its duration is from the 165 s target. The
+    best-scoring segmentation is found in one pass, looking back at most one
+    maximum episode length, so the cost is O(n·k) for n candidates and k
+    candidates per episode window. Same arguments as split_by_episode_patterns.
+
+    Returns:
+        List of episode texts
+    """
+    if timeline is None:
+        timeline = default_timeline(text, audio_path, audio_duration)
+
+    text_end = len(text)
+    if timeline.duration(0, text_end) <= DP_MIN_EPISODE_SECONDS:
+        return [text]
+
+    # Candidate boundaries and their pattern scores
+    candidates = {0: 0.0, text_end: 0.0}
+    for match in SENTENCE_SPLIT_RE.finditer(text):
+        candidates.setdefault(match.end(), 0.0)
+    # A closing, the next narrator line and its intro sit a few sentences apart:
+    # cluster nearby events so their evidence adds up on a single boundary
+    clusters = []
+    for start, end, kind in BoundaryIndex(text).events:
+        if clusters and start - clusters[-1]['end'] <= DP_EVENT_CLUSTER_CHARS:
+            clusters[-1]['end'] = max(clusters[-1]['end'], end)
+        else:
+            clusters.append({'end': end, 'kinds': {}})
+        # First match of each kind in the cluster places the boundary
+        clusters[-1]['kinds'].setdefault(kind, (start, end))
+    for cluster in clusters:
+        kinds = cluster['kinds']
+        if EVENT_NARRATOR in kinds:
+            pos = find_sentence_start(text, kinds[EVENT_NARRATOR][0], nearest=True)
+        elif EVENT_INTRO in kinds:
+            pos = find_sentence_start(text, kinds[EVENT_INTRO][0], nearest=True)
+        else:
+            pos = kinds[EVENT_CLOSING][1]
+        score = sum(DP_BOUNDARY_SCORES[kind] for kind in kinds)
+        candidates[pos] = max(candidates.get(pos, 0.0), score)
+    # Whitespace fallbacks every half minimum episode, so long unpunctuated
+    # stretches can still be cut
+    grid_time = DP_MIN_EPISODE_SECONDS / 2
+    end_time = timeline.time_at(text_end)
+    while grid_time < end_time:
+        space = SPACE_RE.search(text, timeline.position_at(grid_time))
+        if space and space.end() < text_end:
+            candidates.setdefault(space.end(), DP_FALLBACK_SCORE)
+        grid_time += DP_MIN_EPISODE_SECONDS / 2
+    positions = sorted(candidates)
+    times = [timeline.time_at(pos) for pos in positions]
+
+    # Speaker-change evidence: names mentioned in the text (one scan) and, if
+    # available, diarization speakers, compared across a target-length window
+    mentions = sorted(
+        (match.start(), match.group(1).strip())
+        for pattern in SPEAKER_NAME_RES
+        for match in pattern.finditer(text)
+        if match.group(1).strip() not in SPEAKER_NAME_STOPWORDS and len(match.group(1).strip()) > 2
+    )
+    mention_positions = [pos for pos, _ in mentions]
+    speaker_index = SpeakerIndex(speaker_segments) if speaker_segments else None
+
+    def names_between(start, end):
+        lo = bisect.bisect_left(mention_positions, start)
+        hi = bisect.bisect_left(mention_positions, end)
+        return {name for _, name in mentions[lo:hi]}
+
+    def speaker_change_score(pos, time):
+        score = 0.0
+        window = DP_TARGET_EPISODE_SECONDS
+        before = names_between(timeline.position_at(time - window), pos)
+        after = names_between(pos, timeline.position_at(time + window))
+        if before and after and not before & after:
+            score += DP_SPEAKER_CHANGE_SCORE
+        if speaker_index:
+            before = speaker_index.speakers_between(time - window, time)
+            after = speaker_index.speakers_between(time, time + window)
+            if before and after and not before & after:
+                score += DP_SPEAKER_CHANGE_SCORE
+        return score
+
+    # best[j]: score of the best segmentation of text[:positions[j]] ending in a boundary at j
+    count = len(positions)
+    best = [float('-inf')] * count
+    previous = [-1] * count
+    best[0] = 0.0
+    window_start = 0
+    for j in range(1, count):
+        while times[j] - times[window_start] > DP_MAX_EPISODE_SECONDS:
+            window_start += 1
+        best_score = float('-inf')
+        best_previous = -1
+        for i in range(j - 1, window_start - 1, -1):
+            length = times[j] - times[i]
+            if length < DP_MIN_EPISODE_SECONDS:
+                continue
+            if best[i] == float('-inf'):
+                continue
+            deviation = (length - DP_TARGET_EPISODE_SECONDS) / DP_DURATION_TOLERANCE
+            score = best[i] - deviation * deviation
+            if score > best_score:
+                best_score = score
+                best_previous = i
+        if best_previous < 0:
+            continue
+        if j < count - 1:
+            best_score += candidates[positions[j]] + speaker_change_score(positions[j], times[j])
+        best[j] = best_score
+        previous[j] = best_previous
+
+    if best[-1] == float('-inf'):
+        return [text]
+
+    # Walk the back-pointers from the end of the text
+    splits = []
+    j = count - 1
+    while j > 0:
+        splits.append(positions[j])
+        j = previous[j]
+    splits.append(0)
+    splits.reverse()
+
+    episodes = []
+    for start, end in zip(splits, splits[1:]):
+        episode = text[start:end].strip()
+        if episode:
+            episodes.append(episode)
+    return episodes or [text]
+
+def locate_episodes(text, episodes):
+    """
+    Find where each episode starts in the full transcript, searching forward
+    from the previous episode so repeated openings map to the right place.
+    Returns list of character positions (-1 for an episode that was not found).
+    """
+    starts = []
+    search_from = 0
+    for episode in episodes:
+        start = text.find(episode[:100], search_from)
+        if start < 0:
+            start = text.find(episode[:100])
+        else:
+            search_from = start + 1
+        starts.append(start)
+    return starts
+
+# Episode segmentation engines selectable with --segmenter
+SEGMENTERS = {
+    "heuristic": split_by_episode_patterns,
+    "dp": segment_episodes_dp,
+}
+
+def segmentation_fingerprint(segmenter):
+    """
+    Hash what a segmentation engine depends on besides its input: the source of
+    the engine and the helpers it calls, the pattern registry and the DP settings.
+    Returns hex digest string.
+    """
+    helpers = [SEGMENTERS[segmenter], scan_episode_events, BoundaryIndex, SpeakerIndex, TextTimeline,
+               default_timeline, find_sentence_start, find_forced_split, extract_speaker_names]
+    settings = {
+        'patterns': [EPISODE_NARRATOR_PATTERNS, EPISODE_CLOSING_PATTERNS, EPISODE_INTRO_PATTERNS,
+                     SPEAKER_NAME_PATTERNS, sorted(SPEAKER_NAME_STOPWORDS)],
+        'regexes': [regex.pattern for regex in (NEXT_EPISODE_GREETING_RE, CAPITALIZED_WORD_RE, SENTENCE_SPLIT_RE,
+                                                BREAK_RE, NONSPACE_RE, SPACE_RE)],
+        'dp': [DP_TARGET_EPISODE_SECONDS, DP_MIN_EPISODE_SECONDS, DP_MAX_EPISODE_SECONDS, DP_DURATION_TOLERANCE,
+               DP_BOUNDARY_SCORES, DP_SPEAKER_CHANGE_SCORE, DP_EVENT_CLUSTER_CHARS, DP_FALLBACK_SCORE],
+        'fallback_chars_per_second': FALLBACK_CHARS_PER_SECOND,
+    }
+    return text_hash(''.join(inspect.getsource(helper) for helper in helpers) +
+                     json.dumps(settings, sort_keys=True))
+
+def split_episodes_with_cache(text, audio_path=None, speaker_segments=None, audio_duration=None, segmenter="heuristic", timeline=None):
+    """
+    Run the selected segmentation engine (see SEGMENTERS), reusing cached
+    episodes for the same input.
+    The cache key includes segmentation_fingerprint, so editing the splitting
+    heuristics, patterns or DP settings invalidates only this stage.
+    """
+    params = {
+        'text': text_hash(text),
+        'speaker_segments': text_hash(json.dumps(speaker_segments, default=str)),
+        'audio_duration': audio_duration,
+        'segmenter': segmenter,
+        'timeline': text_hash(json.dumps([timeline.positions, timeline.times])) if timeline else None,
+        'heuristics': segmentation_fingerprint(segmenter),
+    }
+    audio_hash = compute_audio_hash(audio_path) if audio_path else None
+    cached = load_stage_cache(audio_hash, "episodes", params)
+    if cached is not None:
+        print("   ♻️  Using cached episode splits")
+        return cached
+    
+    episodes = SEGMENTERS[segmenter](
+        text,
+        audio_path=audio_path,
+        speaker_segments=speaker_segments,
+        audio_duration=audio_duration,
+        timeline=timeline
+    )
+    save_stage_cache(audio_hash, "episodes", params, episodes)
+    return episodes
+
 def split_by_content(text):
     """
     Split transcript into multiple stories based on content markers.
@@ -779,26 +2305,13 @@ def split_by_content(text):
     """
     stories = []
     
-    # Common Spanish radio program introduction patterns
-    intro_patterns = [
-        r'Hola, te doy la bienvenida a',
-        r'¡Pu-pu-pu! Hola, te doy la bienvenida a',
-        r'Te doy la bienvenida a',
-        r'¿Te doy la bienvenida a',
-        r'Hola, les doy la bienvenida a',
-        r'Hola, esto es',
-        r'¡Hola! Esto es',
-        r'Soy \w+ y (hoy|si)',
-    ]
-    
-    # Find all introduction points
+    # Find all introduction points (common Spanish radio program introductions)
     split_points = [0]
     
-    for pattern in intro_patterns:
-        for match in re.finditer(pattern, text, re.IGNORECASE):
-            # Only add if it's not at the very beginning
-            if match.start() > 50:  # At least 50 chars from start
-                split_points.append(match.start())
+    for match in CONTENT_INTRO_RE.finditer(text):
+        # Only add if it's not at the very beginning
+        if match.start() > 50:  # At least 50 chars from start
+            split_points.append(match.start())
     
     # Remove duplicates and sort
     split_points = sorted(set(split_points))
@@ -827,26 +2340,11 @@ def extract_speaker_names(text):
     names = set()
     
     # Common words that might be mistaken for names
-    common_words = {'Hola', 'Gracias', 'Bienvenida', 'Bienvenido', 'Soy', 'Llamo', 'Nombre', 
-                    'Pero', 'Por', 'Los', 'Las', 'Nos', 'Todo', 'Tal', 'Eso', 'Eso', 'Cada',
-                    'Muy', 'Ahora', 'Antes', 'Hasta', 'Voy', 'Hace', 'Siempre', 'Entonces',
-                    'Algunos', 'Bueno', 'Ideas', 'Recuerda', 'Pintar', 'Visite', 'Alegre',
-                    'Carros', 'Colombia'}
-    
-    # Common patterns for name introduction in Spanish
-    patterns = [
-        r'(?:Soy|soy)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',  # "Soy María" or "Soy María José"
-        r'(?:Me llamo|me llamo)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',  # "Me llamo Carlos"
-        r'(?:Mi nombre es|mi nombre es)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',  # "Mi nombre es Ana"
-        r'(?:Hola|hola),?\s+([A-Z][a-z]+)',  # "Hola, Juan" (when addressing someone)
-        r'(?:Hola|hola)\s+([A-Z][a-z]+)',  # "Hola Juan"
-        r'([A-Z][a-z]+),?\s+(?:gracias|Gracias)',  # "María, gracias"
-        r'([A-Z][a-z]+),?\s+(?:cuéntanos|cuéntame)',  # "María, cuéntanos"
-    ]
-    
-    for pattern in patterns:
-        matches = re.finditer(pattern, text)
-        for match in matches:
+    common_words = SPEAKER_NAME_STOPWORDS
+    
+    # Common patterns for name introduction in Spanish (compiled in the pattern registry)
+    for pattern in SPEAKER_NAME_RES:
+        for match in pattern.finditer(text):
             name = match.group(1).strip()
             # Filter out common words that might be mistaken for names
             if name and name not in common_words and len(name) > 2:
@@ -854,7 +2352,7 @@ def extract_speaker_names(text):
     
     # Also look for capitalized words that appear multiple times (likely names)
     # But be more selective - only consider words that appear in name introduction patterns
-    words = re.findall(r'\b([A-Z][a-z]{2,})\b', text)
+    words = CAPITALIZED_WORD_RE.findall(text)
     word_counts = {}
     for word in words:
         if word not in common_words:
@@ -866,153 +2364,896 @@ def extract_speaker_names(text):
         if count >= 3:
             names.add(word)
     
-    return sorted(list(names))
+    return sorted(list(names))
+
+def parse_openai_transcription(transcript):
+    """
+    Extract text and speaker-labelled segments from an OpenAI transcription
+    response (verbose_json objects, plain text objects or JSON dicts).
+    Returns tuple: (transcript_text, labeled_segments)
+    where labeled_segments is list of (start_time, end_time, speaker_id, text)
+    """
+    full_text = ""
+    labeled_segments = []
+    
+    # Handle different response formats
+    if hasattr(transcript, 'segments') and transcript.segments:
+        # verbose_json format (whisper-1)
+        for segment in transcript.segments:
+            # Handle both dict-like and object-like segments
+            if isinstance(segment, dict):
+                start = segment.get('start', 0)
+                end = segment.get('end', 0)
+                text = segment.get('text', '').strip()
+                speaker = segment.get('speaker', None)
+            else:
+                # Object with attributes
+                start = getattr(segment, 'start', 0)
+                end = getattr(segment, 'end', 0)
+                text = getattr(segment, 'text', '').strip()
+                speaker = getattr(segment, 'speaker', None)
+            
+            if text:
+                full_text += text + " "
+                labeled_segments.append((start, end, speaker, text))
+    elif hasattr(transcript, 'text'):
+        # Simple text format
+        full_text = transcript.text if isinstance(transcript.text, str) else getattr(transcript, 'text', '')
+    elif isinstance(transcript, dict):
+        # Dictionary response (json format)
+        full_text = transcript.get('text', '')
+        if transcript.get('segments'):
+            # Rebuilt from the segments below, so the text is not duplicated
+            full_text = ""
+            for segment in transcript['segments']:
+                start = segment.get('start', 0)
+                end = segment.get('end', 0)
+                text = segment.get('text', '').strip()
+                speaker = segment.get('speaker', None)
+                if text:
+                    full_text += text + " "
+                    labeled_segments.append((start, end, speaker, text))
+    
+    return full_text.strip(), labeled_segments
+
+def save_openai_result(audio_hash, model_used, transcript):
+    """
+    Parse an OpenAI transcription response and store it in the disk cache.
+    Returns tuple: (transcript_text, labeled_segments or None)
+    """
+    full_text, labeled_segments = parse_openai_transcription(transcript)
+    return cache_openai_result(audio_hash, model_used, full_text, labeled_segments)
+
+def cache_openai_result(audio_hash, model_used, full_text, labeled_segments):
+    """
+    Store a parsed OpenAI transcription in the disk cache.
+    Returns tuple: (transcript_text, labeled_segments or None)
+    """
+    save_cached_json("openai", audio_hash, {
+        'model': model_used,
+        'text': full_text,
+        'segments': labeled_segments,
+    })
+    return full_text, labeled_segments if labeled_segments else None
+
+def load_openai_model_status(audio_hash):
+    """
+    Load which OpenAI transcription models failed (and which succeeded) for an audio file.
+    Returns dict: {'failed': [model names], 'succeeded': model name or None}
+    """
+    status = load_cached_json("openai_models", audio_hash) or {}
+    return {'failed': status.get('failed', []), 'succeeded': status.get('succeeded')}
+
+def record_openai_model(audio_hash, status, model_name, succeeded):
+    """
+    Record that a model succeeded or is unavailable for an audio file (see
+    classify_openai_error), so an unavailable model is not tried again.
+    """
+    if succeeded:
+        status['succeeded'] = model_name
+    elif model_name not in status['failed']:
+        status['failed'].append(model_name)
+    save_cached_json("openai_models", audio_hash, status)
+
+def openai_models_to_try(status):
+    """
+    Order OPENAI_TRANSCRIPTION_MODELS for one file: the model that succeeded
+    before comes first, models that failed for it are skipped.
+    Returns list of (model_name, request_options)
+    """
+    models = [(name, options) for name, options in OPENAI_TRANSCRIPTION_MODELS
+              if name not in status['failed']]
+    models.sort(key=lambda model: model[0] != status['succeeded'])
+    return models
+
+# (API key, base URL) pairs the OpenAI API rejected as unauthorized in this
+# run, so the rest of the batch does not keep uploading with a bad key
+_OPENAI_REJECTED_KEYS = set()
+
+OPENAI_MODEL_ERROR_RE = re.compile(r'model.*(does not exist|not found|not supported|unsupported|not available)'
+                                   r'|(unsupported|unknown|invalid) model', re.IGNORECASE)
+
+def classify_openai_error(error):
+    """
+    Classify an OpenAI API error by what should happen next:
+    'retry' - rate limit (429), server error (5xx), timeout or connection error;
+    'auth'  - invalid API key (401): no file or model can succeed with it;
+    'model' - the model does not exist or does not support the request (404,
+              model_not_found, unsupported-model 400s): fall back to the next model;
+    'file'  - anything else (403, 413 file too large, a rejected upload): give
+              up on this file for now without blaming the model.
+    Returns one of the strings above.
+    """
+    status_code = getattr(error, 'status_code', None)
+    if status_code is None:
+        return 'retry' if type(error).__name__ in ('APIConnectionError', 'APITimeoutError') else 'file'
+    if status_code == 429 or status_code >= 500:
+        return 'retry'
+    if status_code == 401:
+        return 'auth'
+    if (status_code == 404 or getattr(error, 'code', None) in ('model_not_found', 'unsupported_model') or
+            (status_code == 400 and OPENAI_MODEL_ERROR_RE.search(str(error)))):
+        return 'model'
+    return 'file'
+
+def openai_retry_delay(error, attempt):
+    """
+    Exponential backoff with jitter, honouring a Retry-After header if the server sent one.
+    Returns delay in seconds.
+    """
+    delay = OPENAI_BACKOFF_SECONDS * (2 ** attempt) * (0.5 + random.random())
+    response = getattr(error, 'response', None)
+    retry_after = response.headers.get('retry-after') if response is not None else None
+    try:
+        return max(delay, float(retry_after)) if retry_after is not None else delay
+    except ValueError:
+        return delay
+
+def find_silence_cuts(audio, chunk_seconds, search_seconds=OPENAI_CHUNK_SEARCH_SECONDS):
+    """
+    Choose chunk boundaries for a decoded buffer: one about every chunk_seconds,
+    each moved to the quietest 100 ms frame within search_seconds of the
+    nominal cut, so chunks start and end in pauses rather than mid-word.
+    Returns list of cut times in seconds (not including 0 and the end).
+    """
+    frame = SAMPLE_RATE // 10
+    duration = audio_duration_from_buffer(audio)
+    cuts = []
+    nominal = chunk_seconds
+    # Stop early enough that the last chunk is not a tiny remainder
+    while nominal < duration - chunk_seconds / 4:
+        lowest = int(cuts[-1] * SAMPLE_RATE) + frame if cuts else frame
+        window_start = max(int((nominal - search_seconds) * SAMPLE_RATE), lowest)
+        window_end = min(int((nominal + search_seconds) * SAMPLE_RATE), len(audio))
+        frames = (window_end - window_start) // frame
+        if frames <= 0:
+            cut = nominal
+        else:
+            window = np.asarray(audio[window_start:window_start + frames * frame], dtype=np.float32)
+            energy = np.square(window.reshape(frames, frame)).mean(axis=1)
+            cut = (window_start + int(np.argmin(energy)) * frame + frame // 2) / SAMPLE_RATE
+        cuts.append(cut)
+        nominal = cut + chunk_seconds
+    return cuts
+
+def max_openai_chunk_seconds():
+    """
+    Longest chunk length whose uploads stay under OPENAI_UPLOAD_LIMIT_BYTES as
+    16-bit WAV (see encode_wav): find_silence_cuts makes a chunk at most
+    chunk + OPENAI_CHUNK_SEARCH_SECONDS long (1.25 chunks for the last one),
+    and the overlap is added on both sides.
+    Returns seconds.
+    """
+    upload_seconds = (OPENAI_UPLOAD_LIMIT_BYTES - 44) / (2 * SAMPLE_RATE) - 2 * OPENAI_CHUNK_OVERLAP_SECONDS
+    return min(upload_seconds - OPENAI_CHUNK_SEARCH_SECONDS, upload_seconds / 1.25)
+
+def encode_wav(samples):
+    """
+    Encode float32 16 kHz mono samples as an in-memory 16-bit WAV file.
+    Returns bytes.
+    """
+    pcm = (np.clip(np.asarray(samples, dtype=np.float32), -1.0, 1.0) * 32767).astype('<i2')
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+def request_openai_transcription(client, file, models, failed_models=None):
+    """
+    Send one transcription request, retrying transient errors with exponential
+    backoff and falling back through models (list of (model_name, options)) only
+    when a model is unavailable, so a rate limit never downgrades the result to a
+    model without speaker labels.
+    Returns tuple: (model_name, transcript, failed_models), where failed_models
+    lists the models that are unavailable (appended to the given list, so the
+    caller sees them even when an error is raised); raises the last error if all
+    fail, or at once on any other error, including retries running out (see
+    classify_openai_error).
+    """
+    failed_models = [] if failed_models is None else failed_models
+    last_error = None
+    for model_name, options in models:
+        for attempt in range(OPENAI_MAX_RETRIES + 1):
+            try:
+                transcript = client.audio.transcriptions.create(
+                    model=model_name,
+                    file=file,
+                    language="es",
+                    **options
+                )
+                return model_name, transcript, failed_models
+            except Exception as e:
+                last_error = e
+                kind = classify_openai_error(e)
+                if kind == 'retry' and attempt < OPENAI_MAX_RETRIES:
+                    time.sleep(openai_retry_delay(e, attempt))
+                    continue
+                if kind != 'model':
+                    raise
+                failed_models.append(model_name)
+                break
+    raise last_error
+
+def reconcile_chunk_speakers(previous_segments, segments, used_labels):
+    """
+    Map a chunk's local speaker labels to the labels already used for the file.
+    Labels are matched one-to-one by how long their segments overlap the previous
+    chunk's segments (the chunks share OPENAI_CHUNK_OVERLAP_SECONDS of audio on
+    each side of a cut); unmatched labels keep their name if it is unused,
+    otherwise they get a new one.
+    Returns dict: local label -> file label
+    """
+    overlap = {}
+    for start, end, label, _ in segments:
+        if not label:
+            continue
+        for prev_start, prev_end, prev_label, _ in previous_segments:
+            if not prev_label:
+                continue
+            shared = min(end, prev_end) - max(start, prev_start)
+            if shared > 0:
+                overlap[(label, prev_label)] = overlap.get((label, prev_label), 0.0) + shared
+    
+    mapping = {}
+    taken = set()
+    for (label, prev_label), _ in sorted(overlap.items(), key=lambda item: -item[1]):
+        if label not in mapping and prev_label not in taken:
+            mapping[label] = prev_label
+            taken.add(prev_label)
+    for _, _, label, _ in segments:
+        if label and label not in mapping:
+            new_label = label
+            suffix = 1
+            while new_label in used_labels:
+                suffix += 1
+                new_label = f"{label}{suffix}"
+            mapping[label] = new_label
+            used_labels.add(new_label)
+    return mapping
+
+def transcribe_openai_chunked(client, audio, audio_path, audio_hash, status, chunk_seconds):
+    """
+    Transcribe a long file through the OpenAI API in overlapping chunks cut at
+    silences, uploaded in parallel (so the wall time is bounded by the slowest
+    chunk), then stitch the segments back onto the file's timeline: each chunk
+    keeps the segments centred in its own span, and speaker labels are
+    reconciled across chunks through the overlapping audio.
+    chunk_seconds is capped at max_openai_chunk_seconds, so no chunk exceeds the upload limit.
+    Returns tuple: (transcript_text, labeled_segments or None)
+    """
+    chunk_seconds = min(chunk_seconds, max_openai_chunk_seconds())
+    duration = audio_duration_from_buffer(audio)
+    bounds = [0.0] + find_silence_cuts(audio, chunk_seconds) + [duration]
+    spans = [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)]
+    models = openai_models_to_try(status)
+    if not models:
+        print("   ⚠️  No OpenAI transcription model left to try for this file")
+        return None, None
+    print(f"   ✂️  Uploading {len(spans)} chunk(s) of ~{chunk_seconds / 60:.0f} min in parallel...")
+    
+    def transcribe_chunk(index):
+        keep_start, keep_end = spans[index]
+        offset = max(0.0, keep_start - OPENAI_CHUNK_OVERLAP_SECONDS)
+        chunk_end = min(duration, keep_end + OPENAI_CHUNK_OVERLAP_SECONDS)
+        data = encode_wav(audio[int(offset * SAMPLE_RATE):int(chunk_end * SAMPLE_RATE)])
+        name = f"{Path(audio_path).stem}_chunk{index:03d}.wav"
+        return offset, request_openai_transcription(client, (name, data), models)
+    
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(len(spans), OPENAI_CHUNK_CONCURRENCY)) as executor:
+        chunk_results = list(executor.map(transcribe_chunk, range(len(spans))))
+    
+    texts = []
+    labeled_segments = []
+    previous_segments = []
+    used_labels = set()
+    models_used = []
+    for (keep_start, keep_end), (offset, (model_name, transcript, failed_models)) in zip(spans, chunk_results):
+        for failed_model in failed_models:
+            record_openai_model(audio_hash, status, failed_model, succeeded=False)
+        models_used.append(model_name)
+        chunk_text, chunk_segments = parse_openai_transcription(transcript)
+        if not chunk_segments:
+            # No timestamps to trim the overlap with: keep the chunk text as is
+            texts.append(chunk_text)
+            previous_segments = []
+            continue
+        # Chunk-relative times back onto the file's timeline
+        segments = [(start + offset, end + offset, speaker, text) for start, end, speaker, text in chunk_segments]
+        mapping = reconcile_chunk_speakers(previous_segments, segments, used_labels)
+        segments = [(start, end, mapping.get(speaker, speaker), text) for start, end, speaker, text in segments]
+        for segment in segments:
+            if keep_start <= (segment[0] + segment[1]) / 2 < keep_end:
+                labeled_segments.append(segment)
+                texts.append(segment[3])
+        previous_segments = segments
+    
+    model_used = max(set(models_used), key=models_used.count)
+    record_openai_model(audio_hash, status, model_used, succeeded=True)
+    print(f"   ✅ {len(spans)} chunk(s) transcribed in {time.perf_counter() - start_time:.1f}s ({model_used})")
+    return cache_openai_result(audio_hash, model_used, ' '.join(texts).strip(), labeled_segments)
+
+def perform_speaker_diarization_openai(audio_path, openai_api_key=None, openai_base_url=None, audio=None, chunk_seconds=0):
+    """
+    Perform transcription and speaker diarization using OpenAI API.
+    Uses gpt-4o-transcribe-diarize-api-ev3 model which provides both transcription and speaker labels.
+    
+    Responses are cached on disk keyed by the audio content hash, so re-runs
+    (and runs resumed after a crash) never upload the same audio twice; batch
+    runs fill this cache ahead of time with prefetch_openai_diarization.
+    Models that failed for a file are remembered and not tried for it again.
+    openai_base_url (or the OPENAI_BASE_URL environment variable) points the
+    client at another endpoint, e.g. a local stub server for testing.
+    
+    With chunk_seconds and the decoded audio buffer, files longer than one chunk
+    are uploaded in overlapping chunks in parallel (see transcribe_openai_chunked).
+    
+    Returns tuple: (transcript_text, labeled_segments)
+    where labeled_segments is list of (start_time, end_time, speaker_id, text)
+    """
+    if not OPENAI_API_AVAILABLE:
+        return None, None
+    
+    audio_hash = compute_audio_hash(audio_path)
+    cached = load_cached_json("openai", audio_hash)
+    if cached is not None:
+        print(f"   ♻️  Using cached OpenAI API response ({cached['model']})")
+        cached_segments = [tuple(segment) for segment in cached['segments']]
+        return cached['text'], cached_segments if cached_segments else None
+    if (openai_api_key, openai_base_url) in _OPENAI_REJECTED_KEYS:
+        print("   ⚠️  OpenAI API key was rejected earlier in this run, skipping OpenAI")
+        return None, None
+    
+    try:
+        from openai import OpenAI
+        # Retries are handled by request_openai_transcription (with backoff), not by the client
+        client = OpenAI(api_key=openai_api_key, base_url=openai_base_url, max_retries=0)
+        status = load_openai_model_status(audio_hash)
+        if (audio is not None and chunk_seconds and
+                audio_duration_from_buffer(audio) > chunk_seconds + OPENAI_CHUNK_SEARCH_SECONDS):
+            return transcribe_openai_chunked(client, audio, audio_path, audio_hash, status, chunk_seconds)
+        models = openai_models_to_try(status)
+        if not models:
+            print("   ⚠️  No OpenAI transcription model left to try for this file")
+            return None, None
+        
+        audio_file = (Path(audio_path).name, Path(audio_path).read_bytes())
+        failed_models = []
+        try:
+            model_name, transcript, _ = request_openai_transcription(client, audio_file, models, failed_models)
+        finally:
+            # Unavailable models are remembered even if no model succeeded
+            for failed_model in failed_models:
+                record_openai_model(audio_hash, status, failed_model, succeeded=False)
+        if failed_models:
+            # Fell back to the next model (e.g. whisper-1 if gpt-4o-transcribe-diarize is not available)
+            print(f"   ⚠️  {', '.join(failed_models)} not available, used {model_name}")
+        record_openai_model(audio_hash, status, model_name, succeeded=True)
+        return save_openai_result(audio_hash, model_name, transcript)
+    except Exception as e:
+        if classify_openai_error(e) == 'auth':
+            _OPENAI_REJECTED_KEYS.add((openai_api_key, openai_base_url))
+        print(f"   ⚠️  OpenAI API transcription failed: {str(e)}")
+        return None, None
+
+async def _transcribe_openai_async(client, semaphore, audio_path, rejected_key):
+    """
+    Upload one file with the async client (at most as many in flight as the
+    semaphore allows), retrying transient errors with exponential backoff and
+    falling back through OPENAI_TRANSCRIPTION_MODELS only when a model is
+    unavailable (see classify_openai_error). An unauthorized error adds
+    rejected_key to _OPENAI_REJECTED_KEYS, which stops the remaining uploads.
+    Returns the model that succeeded, or None.
+    """
+    audio_hash = await asyncio.to_thread(compute_audio_hash, audio_path)
+    cached = load_cached_json("openai", audio_hash)
+    if cached is not None:
+        return cached['model']
+    status = load_openai_model_status(audio_hash)
+    
+    async with semaphore:
+        if rejected_key in _OPENAI_REJECTED_KEYS:
+            return None
+        audio_bytes = await asyncio.to_thread(Path(audio_path).read_bytes)
+        for model_name, options in openai_models_to_try(status):
+            for attempt in range(OPENAI_MAX_RETRIES + 1):
+                try:
+                    transcript = await client.audio.transcriptions.create(
+                        model=model_name,
+                        file=(Path(audio_path).name, audio_bytes),
+                        language="es",
+                        **options
+                    )
+                except Exception as e:
+                    kind = classify_openai_error(e)
+                    if kind == 'retry' and attempt < OPENAI_MAX_RETRIES:
+                        await asyncio.sleep(openai_retry_delay(e, attempt))
+                        continue
+                    if kind == 'auth':
+                        _OPENAI_REJECTED_KEYS.add(rejected_key)
+                        return None
+                    print(f"   ⚠️  {Path(audio_path).name}: {model_name} failed: {str(e)}")
+                    if kind != 'model':
+                        # Only an unavailable model falls back: after a transient error the
+                        # next model (without speaker labels) would be cached for good
+                        return None
+                    record_openai_model(audio_hash, status, model_name, succeeded=False)
+                    break
+                record_openai_model(audio_hash, status, model_name, succeeded=True)
+                save_openai_result(audio_hash, model_name, transcript)
+                return model_name
+    return None
 
-def perform_speaker_diarization_openai(audio_path, openai_api_key=None):
+def prefetch_openai_diarization(audio_files, openai_api_key=None, openai_base_url=None, concurrency=OPENAI_CONCURRENCY):
     """
-    Perform transcription and speaker diarization using OpenAI API.
-    Uses gpt-4o-transcribe-diarize-api-ev3 model which provides both transcription and speaker labels.
+    Upload several audio files to the OpenAI API concurrently (asyncio, at most
+    `concurrency` uploads in flight) and store the responses in the disk cache
+    that perform_speaker_diarization_openai reads, so batch runs no longer wait
+    for one upload at a time.
+    Returns dict: audio_path -> model that succeeded (None if all failed)
+    """
+    if not OPENAI_API_AVAILABLE or not audio_files:
+        return {}
     
-    Returns tuple: (transcript_text, labeled_segments)
-    where labeled_segments is list of (start_time, end_time, speaker_id, text)
+    from openai import AsyncOpenAI
+    
+    async def prefetch_all():
+        # Retries are handled here (with backoff), not by the client
+        client = AsyncOpenAI(api_key=openai_api_key, base_url=openai_base_url, max_retries=0)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        try:
+            return await asyncio.gather(
+                *(_transcribe_openai_async(client, semaphore, audio_path, (openai_api_key, openai_base_url))
+                  for audio_path in audio_files),
+                return_exceptions=True
+            )
+        finally:
+            await client.close()
+    
+    print(f"\n☁️  Uploading {len(audio_files)} file(s) to OpenAI ({max(1, concurrency)} at a time)...")
+    start = time.perf_counter()
+    results = asyncio.run(prefetch_all())
+    if (openai_api_key, openai_base_url) in _OPENAI_REJECTED_KEYS:
+        print("   ❌ OpenAI API key rejected (401), skipping OpenAI for the rest of the run")
+    models = {}
+    for audio_path, result in zip(audio_files, results):
+        if isinstance(result, Exception):
+            print(f"   ⚠️  {Path(audio_path).name}: OpenAI upload failed: {str(result)}")
+            result = None
+        models[audio_path] = result
+    succeeded = sum(1 for model in models.values() if model)
+    print(f"   ✅ OpenAI responses ready for {succeeded}/{len(audio_files)} file(s) in {time.perf_counter() - start:.1f}s")
+    return models
+
+# Loaded pyannote pipelines, keyed by (model_name, hf_token)
+_DIARIZATION_PIPELINES = {}
+
+def get_diarization_pipeline(hf_token=None, model_name=DIARIZATION_MODEL_NAME):
     """
-    if not OPENAI_API_AVAILABLE:
-        return None, None
+    Get a pyannote diarization pipeline, loading it on first use.
+    The pipeline is cached per (model_name, hf_token) for the lifetime of the
+    process, so it is shared by every file and episode in a run.
+    Returns the pipeline, or None if it could not be loaded.
+    """
+    key = (model_name, hf_token)
+    if key in _DIARIZATION_PIPELINES:
+        return _DIARIZATION_PIPELINES[key]
     
+    print("   📥 Loading speaker diarization pipeline...")
+    load_start = time.perf_counter()
     try:
-        client = OpenAI(api_key=openai_api_key)
-        
-        # Open audio file
-        with open(audio_path, 'rb') as audio_file:
-            # Try to use gpt-4o-transcribe-diarize model (if available)
-            # This model provides both transcription and speaker diarization
-            try:
-                transcript = client.audio.transcriptions.create(
-                    model="gpt-4o-transcribe-diarize",
-                    file=audio_file,
-                    language="es",
-                    response_format="json",  # Use 'json' for gpt-4o-transcribe-diarize
-                    chunking_strategy="auto"  # Required for diarization models
-                )
-            except Exception as e:
-                # Fallback to whisper-1 if gpt-4o-transcribe-diarize not available
-                print(f"   ⚠️  gpt-4o-transcribe-diarize not available, using whisper-1: {str(e)}")
-                # Reset file pointer to beginning before second attempt
-                audio_file.seek(0)
-                transcript = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language="es",
-                    response_format="verbose_json",
-                    timestamp_granularities=["segment", "word"]
-                )
-        
-        # Extract transcript text and segments with speaker labels
-        full_text = ""
-        labeled_segments = []
-        
-        # Handle different response formats
-        if hasattr(transcript, 'segments') and transcript.segments:
-            # verbose_json format (whisper-1)
-            for segment in transcript.segments:
-                # Handle both dict-like and object-like segments
-                if isinstance(segment, dict):
-                    start = segment.get('start', 0)
-                    end = segment.get('end', 0)
-                    text = segment.get('text', '').strip()
-                    speaker = segment.get('speaker', None)
-                else:
-                    # Object with attributes
-                    start = getattr(segment, 'start', 0)
-                    end = getattr(segment, 'end', 0)
-                    text = getattr(segment, 'text', '').strip()
-                    speaker = getattr(segment, 'speaker', None)
-                
-                if text:
-                    full_text += text + " "
-                    labeled_segments.append((start, end, speaker, text))
-        elif hasattr(transcript, 'text'):
-            # Simple text format
-            full_text = transcript.text if isinstance(transcript.text, str) else getattr(transcript, 'text', '')
-        elif isinstance(transcript, dict):
-            # Dictionary response (json format)
-            full_text = transcript.get('text', '')
-            if 'segments' in transcript:
-                for segment in transcript['segments']:
-                    start = segment.get('start', 0)
-                    end = segment.get('end', 0)
-                    text = segment.get('text', '').strip()
-                    speaker = segment.get('speaker', None)
-                    if text:
-                        full_text += text + " "
-                        labeled_segments.append((start, end, speaker, text))
-        
-        return full_text.strip(), labeled_segments if labeled_segments else None
+        force_cpu_mode()
+        from pyannote.audio import Pipeline
+        if hf_token:
+            # Use 'token' parameter (current API)
+            pipeline = Pipeline.from_pretrained(model_name, token=hf_token)
+        else:
+            pipeline = Pipeline.from_pretrained(model_name)
     except Exception as e:
-        print(f"   ⚠️  OpenAI API transcription failed: {str(e)}")
-        return None, None
+        print(f"   ⚠️  Could not load diarization pipeline: {str(e)}")
+        pipeline = None
+    if pipeline is not None:
+        print(f"   ✅ Diarization pipeline loaded in {time.perf_counter() - load_start:.1f}s")
+    
+    # Failed loads are cached too, so they are not retried for every file
+    _DIARIZATION_PIPELINES[key] = pipeline
+    return pipeline
 
-def perform_speaker_diarization(audio_path, hf_token=None):
+def perform_speaker_diarization(audio_path, hf_token=None, audio=None, speech=None):
     """
     Perform speaker diarization on audio file using pyannote.audio.
+    If the decoded audio buffer is provided, it is passed to the pipeline
+    as an in-memory waveform instead of decoding the file again; with speech
+    (a SpeechTimeline) only its speech regions are, and the segment times are
+    mapped back to the original timeline.
     Returns list of tuples: (start_time, end_time, speaker_id)
     """
     if not DIARIZATION_AVAILABLE:
         return None
     
+    audio_hash = compute_audio_hash(audio_path)
+    params = {'model': DIARIZATION_MODEL_NAME}
+    if speech is not None and audio is not None:
+        params['vad'] = speech.params
+    else:
+        speech = None
+    cached = load_stage_cache(audio_hash, "diarization", params)
+    if cached is not None:
+        print("   ♻️  Using cached diarization segments")
+        return [tuple(segment) for segment in cached]
+    
     try:
-        # Load the pre-trained speaker diarization pipeline
-        # Using pyannote/speaker-diarization-3.1 model
-        if hf_token:
-            # Use 'token' parameter (current API)
-            pipeline = Pipeline.from_pretrained(
-                "pyannote/speaker-diarization-3.1",
-                token=hf_token
-            )
-        else:
-            pipeline = Pipeline.from_pretrained(
-                "pyannote/speaker-diarization-3.1"
-            )
+        # Reuse the process-wide pre-trained speaker diarization pipeline
+        pipeline = get_diarization_pipeline(hf_token)
+        if pipeline is None:
+            return None
         
         # Run diarization
-        diarization = pipeline(str(audio_path))
+        if audio is not None:
+            torch = import_torch()
+            speech_audio = speech.compact(audio) if speech is not None else audio
+            try:
+                waveform = torch.from_numpy(np.ascontiguousarray(speech_audio, dtype=np.float32)).unsqueeze(0)
+                diarization = pipeline({"waveform": waveform, "sample_rate": SAMPLE_RATE})
+            finally:
+                if speech is not None:
+                    release_audio(speech_audio)
+        else:
+            diarization = pipeline(str(audio_path))
         
         # Extract segments with speaker labels
         segments = []
         for turn, _, speaker in diarization.itertracks(yield_label=True):
-            segments.append((turn.start, turn.end, speaker))
+            if speech is not None:
+                segments.append((speech.to_original(turn.start), speech.to_original(turn.end, is_end=True), speaker))
+            else:
+                segments.append((turn.start, turn.end, speaker))
         
+        save_stage_cache(audio_hash, "diarization", params, segments)
         return segments
     except Exception as e:
         print(f"   ⚠️  Speaker diarization failed: {str(e)}")
         return None
 
-def get_word_timestamps(audio_path, model):
+def extract_word_timestamps(whisper_result):
+    """
+    Extract word-level timestamps from an existing Whisper result
+    (transcribed with word_timestamps=True).
+    Returns list of tuples: (word, start_time, end_time)
+    """
+    words_with_timestamps = []
+    for segment in whisper_result.get("segments", []):
+        for word_info in segment.get("words", []):
+            word = word_info.get("word", "").strip()
+            start = word_info.get("start", 0)
+            end = word_info.get("end", 0)
+            if word:
+                words_with_timestamps.append((word, start, end))
+    
+    return words_with_timestamps
+
+def get_word_timestamps(audio_path, model, whisper_result=None):
     """
     Get word-level timestamps from Whisper transcription.
+    Reuses whisper_result (the per-file inference result) when provided,
+    so the model is only run once per audio file.
     Returns list of tuples: (word, start_time, end_time)
     """
     try:
-        result = model.transcribe(
-            str(audio_path), 
-            language="es",
-            word_timestamps=True
-        )
+        if whisper_result is None:
+            whisper_result = model.transcribe(
+                str(audio_path), 
+                language="es",
+                word_timestamps=True
+            )
         
-        words_with_timestamps = []
-        for segment in result.get("segments", []):
-            for word_info in segment.get("words", []):
-                word = word_info.get("word", "").strip()
-                start = word_info.get("start", 0)
-                end = word_info.get("end", 0)
-                if word:
-                    words_with_timestamps.append((word, start, end))
-        
-        return words_with_timestamps
+        return extract_word_timestamps(whisper_result)
     except Exception as e:
         print(f"   ⚠️  Word timestamp extraction failed: {str(e)}")
         return None
 
+def normalize_for_alignment(text):
+    """
+    Reduce text to lowercase alphanumeric characters with accents removed,
+    so proofreading changes to punctuation, spacing and accents do not break alignment.
+    """
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(ch for ch in decomposed if ch.isalnum())
+
+def align_sentences_to_words(sentences, words_with_timestamps):
+    """
+    Map each sentence to a word-timestamp range in a single pass over the characters.
+    
+    The Whisper words are concatenated into one normalized character stream,
+    remembering which word each character came from; the sentences are walked
+    against that stream with one shared pointer. On a mismatch (e.g. a word
+    changed by proofreading) matching resumes in place if the next few
+    characters match there; otherwise the next ALIGNMENT_ANCHOR_LENGTH sentence
+    characters (the rest of the sentence if shorter) are searched for in a
+    bounded window ahead, and, if they are not there (e.g. a hallucinated line
+    the text lacks), anywhere ahead in an index of the stream built on the first
+    such miss. Once a character is left unmatched, matching only resumes through
+    an anchor, so text the words lack does not move the pointer by chance, and
+    the total work stays O(n).
+    
+    Returns tuple: (spans, mismatches)
+    where spans has one (start_time, end_time) or None per sentence,
+    and mismatches is a list of (sentence_index, unmatched_character_count).
+    """
+    word_chars = []
+    char_word = []
+    for word_idx, (word, _, _) in enumerate(words_with_timestamps):
+        normalized = normalize_for_alignment(word)
+        word_chars.append(normalized)
+        char_word.extend([word_idx] * len(normalized))
+    word_chars = ''.join(word_chars)
+    
+    # Anchor -> sorted positions in word_chars, for resyncs beyond the window
+    anchor_positions = None
+    spans = []
+    mismatches = []
+    pos = 0
+    synced = True
+    for sentence_idx, sentence in enumerate(sentences):
+        chars = normalize_for_alignment(sentence)
+        first_word = None
+        last_word = None
+        unmatched = 0
+        i = 0
+        while i < len(chars):
+            if synced and pos < len(word_chars) and word_chars[pos] == chars[i]:
+                if first_word is None:
+                    first_word = char_word[pos]
+                last_word = char_word[pos]
+                pos += 1
+                i += 1
+                continue
+            
+            # Mismatch: resume in place if the next few characters match there
+            # (e.g. after a word changed by proofreading); otherwise moving the
+            # pointer takes a full anchor (the rest of a shorter sentence), searched
+            # for a bounded distance ahead, then anywhere ahead
+            found = -1
+            anchor = chars[i:i + ALIGNMENT_ANCHOR_LENGTH]
+            if len(anchor) >= ALIGNMENT_MIN_ANCHOR_LENGTH:
+                if word_chars.startswith(anchor[:ALIGNMENT_MIN_ANCHOR_LENGTH], pos):
+                    found = pos
+                else:
+                    found = word_chars.find(anchor, pos, pos + ALIGNMENT_RESYNC_WINDOW + len(anchor))
+            if found < 0 and len(anchor) == ALIGNMENT_ANCHOR_LENGTH:
+                if anchor_positions is None:
+                    anchor_positions = {}
+                    for start in range(len(word_chars) - ALIGNMENT_ANCHOR_LENGTH + 1):
+                        anchor_positions.setdefault(word_chars[start:start + ALIGNMENT_ANCHOR_LENGTH], []).append(start)
+                positions = anchor_positions.get(anchor, [])
+                index = bisect.bisect_left(positions, pos)
+                if index < len(positions):
+                    found = positions[index]
+            if found >= 0:
+                pos = found
+                synced = True
+                continue
+            # No resync point: this sentence character has no timestamp
+            synced = False
+            unmatched += 1
+            i += 1
+        
+        if first_word is None:
+            spans.append(None)
+        else:
+            spans.append((words_with_timestamps[first_word][1], words_with_timestamps[last_word][2]))
+        if unmatched:
+            mismatches.append((sentence_idx, unmatched))
+    
+    return spans, mismatches
+
+class TextTimeline:
+    """
+    Piecewise-linear map between character positions in a transcript and audio time.
+    Anchors are (position, time) pairs with both coordinates non-decreasing;
+    positions and times between anchors are interpolated.
+    """
+    
+    def __init__(self, anchors):
+        self.positions = []
+        self.times = []
+        for position, seconds in sorted(anchors):
+            # Drop anchors that would make time run backwards (alignment noise)
+            if self.positions and (position <= self.positions[-1] or seconds < self.times[-1]):
+                continue
+            self.positions.append(position)
+            self.times.append(seconds)
+    
+    @classmethod
+    def uniform(cls, text_length, duration):
+        """
+        Timeline that spreads duration evenly over the text (constant speaking rate).
+        """
+        return cls([(0, 0.0), (max(1, text_length), float(duration))])
+    
+    @classmethod
+    def from_words(cls, text, words_with_timestamps, audio_duration=None):
+        """
+        Build a timeline for text (e.g. the proofread transcript) from Whisper word
+        timestamps: every sentence aligned by align_sentences_to_words anchors its
+        first and last character to its first and last word.
+        Returns TextTimeline, or None if no sentence could be aligned.
+        """
+        sentences = []
+        sentence_start = 0
+        for match in SENTENCE_SPLIT_RE.finditer(text):
+            sentences.append((sentence_start, match.start() + 1))
+            sentence_start = match.end()
+        if sentence_start < len(text):
+            sentences.append((sentence_start, len(text)))
+        
+        spans, _ = align_sentences_to_words([text[start:end] for start, end in sentences], words_with_timestamps)
+        anchors = [(0, 0.0)]
+        for (start, end), span in zip(sentences, spans):
+            if span:
+                anchors.append((start, span[0]))
+                anchors.append((end, span[1]))
+        if len(anchors) == 1:
+            return None
+        if audio_duration:
+            anchors.append((len(text), float(audio_duration)))
+        return cls(anchors)
+    
+    def time_at(self, position):
+        """
+        Get the audio time (seconds) of a character position.
+        """
+        i = bisect.bisect_right(self.positions, position) - 1
+        i = min(max(i, 0), len(self.positions) - 2)
+        if i < 0:
+            return self.times[0]
+        start, end = self.positions[i], self.positions[i + 1]
+        fraction = (position - start) / (end - start)
+        return self.times[i] + fraction * (self.times[i + 1] - self.times[i])
+    
+    def position_at(self, time):
+        """
+        Get the character position spoken at an audio time (seconds).
+        """
+        i = bisect.bisect_right(self.times, time) - 1
+        i = min(max(i, 0), len(self.times) - 2)
+        if i < 0:
+            return self.positions[0]
+        start, end = self.times[i], self.times[i + 1]
+        if end == start:
+            return self.positions[i + 1]
+        fraction = (time - start) / (end - start)
+        return int(round(self.positions[i] + fraction * (self.positions[i + 1] - self.positions[i])))
+    
+    def duration(self, start, end):
+        """
+        Get the audio duration (seconds) of text[start:end].
+        """
+        return self.time_at(end) - self.time_at(start)
+
+def default_timeline(text, audio_path=None, audio_duration=None):
+    """
+    Timeline for a transcript without word timestamps: the audio duration (looked
+    up from audio_path if not given) spread evenly over the text, or an assumed
+    speaking rate if the duration is unknown.
+    """
+    if audio_duration is None and audio_path and audio_path.exists():
+        audio_duration = get_audio_duration(audio_path)
+    if not audio_duration:
+        audio_duration = len(text) / FALLBACK_CHARS_PER_SECOND
+    return TextTimeline.uniform(len(text), audio_duration)
+
+class SpeakerIndex:
+    """
+    Sorted index over diarization segments for fast speaker lookups.
+    Built once from (start_time, end_time, speaker_id, ...) tuples; answers point
+    and range-overlap queries with bisect and a max-end tree instead of scanning
+    every segment. Segments without a speaker label are ignored.
+    """
+    
+    def __init__(self, segments):
+        entries = sorted(
+            (segment[0], segment[1], segment[2]) for segment in segments if segment[2]
+        )
+        self.starts = [start for start, _, _ in entries]
+        self.ends = [end for _, end, _ in entries]
+        self.speakers = [speaker for _, _, speaker in entries]
+        # Segment tree over the start-sorted segments holding the latest end time
+        # under each node, so overlap queries skip every subtree that ends before
+        # the query range, however long some segments are
+        self.tree_size = 1
+        while self.tree_size < len(self.ends):
+            self.tree_size *= 2
+        self.max_ends = [float('-inf')] * (2 * self.tree_size)
+        self.max_ends[self.tree_size:self.tree_size + len(self.ends)] = self.ends
+        for node in range(self.tree_size - 1, 0, -1):
+            self.max_ends[node] = max(self.max_ends[2 * node], self.max_ends[2 * node + 1])
+        # Segment midpoints, sorted, for "segment centred in range" queries
+        midpoints = sorted(((start + end) / 2, speaker) for start, end, speaker in entries)
+        self.midpoints = [midpoint for midpoint, _ in midpoints]
+        self.midpoint_speakers = [speaker for _, speaker in midpoints]
+    
+    def __len__(self):
+        return len(self.starts)
+    
+    def _overlapping(self, start, end):
+        """Yield indices of segments overlapping [start, end] (inclusive), in start order."""
+        # Only segments starting by the end of the range can overlap it
+        count = bisect.bisect_right(self.starts, end)
+        stack = [(1, 0, self.tree_size)]
+        while stack:
+            node, first, last = stack.pop()
+            if first >= count or self.max_ends[node] < start:
+                continue
+            if node >= self.tree_size:
+                yield first
+                continue
+            middle = (first + last) // 2
+            stack.append((2 * node + 1, middle, last))
+            stack.append((2 * node, first, middle))
+    
+    def speaker_at(self, time):
+        """
+        Get speaker at a given time (the earliest-starting segment covering it).
+        Returns speaker_id, or None if no segment covers the time.
+        """
+        for i in self._overlapping(time, time):
+            return self.speakers[i]
+        return None
+    
+    def overlapping_speakers(self, start, end):
+        """
+        Get overlap duration per speaker within [start, end].
+        Returns dict: speaker_id -> seconds of overlap.
+        """
+        durations = {}
+        for i in self._overlapping(start, end):
+            overlap = min(self.ends[i], end) - max(self.starts[i], start)
+            durations[self.speakers[i]] = durations.get(self.speakers[i], 0) + max(0, overlap)
+        return durations
+    
+    def majority_speaker(self, start, end):
+        """
+        Get the speaker with the most overlap in [start, end].
+        Falls back to a point query at the midpoint for zero-length ranges.
+        Returns speaker_id, or None if no segment overlaps.
+        """
+        durations = self.overlapping_speakers(start, end)
+        if durations and max(durations.values()) > 0:
+            return max(durations.items(), key=lambda item: item[1])[0]
+        return self.speaker_at((start + end) / 2)
+    
+    def speakers_between(self, start, end):
+        """
+        Get the set of speakers whose segments are centred within [start, end].
+        """
+        lo = bisect.bisect_left(self.midpoints, start)
+        hi = bisect.bisect_right(self.midpoints, end)
+        return set(self.midpoint_speakers[lo:hi])
+
 def align_speakers_with_text(sentences, words_with_timestamps, diarization_segments):
     """
     Align speaker diarization segments with transcript sentences.
@@ -1021,89 +3262,54 @@ def align_speakers_with_text(sentences, words_with_timestamps, diarization_segme
     if not words_with_timestamps or not diarization_segments:
         return None
     
-    # Create a mapping: time -> speaker (more efficient lookup)
-    speaker_segments = []  # List of (start, end, speaker)
-    for start, end, speaker in diarization_segments:
-        speaker_segments.append((start, end, speaker))
-    speaker_segments.sort(key=lambda x: x[0])  # Sort by start time
-    
-    def get_speaker_at_time(time):
-        """Get speaker at a given time."""
-        for start, end, speaker in speaker_segments:
-            if start <= time <= end:
-                return speaker
-        return None
+    # Build the time -> speaker index once for all sentences
+    speaker_index = SpeakerIndex(diarization_segments)
     
-    # Align sentences with speakers by finding word timestamps
-    sentence_speakers = []
-    word_idx = 0
+    # Map every sentence to its word-timestamp range in one pass
+    spans, mismatches = align_sentences_to_words(sentences, words_with_timestamps)
+    if mismatches:
+        print(f"   ⚠️  Alignment: {len(mismatches)} sentence(s) only partially matched word timestamps")
     
-    for sentence in sentences:
-        if not sentence.strip():
-            sentence_speakers.append((sentence, None))
-            continue
-        
-        # Find words in this sentence (normalized)
-        sentence_words = [w.lower().strip('.,!?;:') for w in re.findall(r'\b\w+\b', sentence)]
-        if not sentence_words:
-            sentence_speakers.append((sentence, None))
-            continue
-        
-        # Find matching words in timestamp list
-        sentence_start = None
-        sentence_end = None
-        matched_words = 0
-        
-        # Look for sentence words in the word timestamp list
-        for i in range(word_idx, len(words_with_timestamps)):
-            word, start, end = words_with_timestamps[i]
-            word_clean = word.strip().lower().rstrip('.,!?;:')
-            
-            # Check if this word matches any word in the sentence
-            if word_clean in sentence_words:
-                if sentence_start is None:
-                    sentence_start = start
-                sentence_end = end
-                matched_words += 1
-                
-                # If we've matched enough words, we found the sentence
-                if matched_words >= min(3, len(sentence_words)):  # Match at least 3 words or all if less
-                    word_idx = i + 1
-                    break
-        
+    sentence_speakers = []
+    for sentence, span in zip(sentences, spans):
         # Determine speaker for this sentence
         speaker_id = None
-        if sentence_start is not None and sentence_end is not None:
-            # Use the middle point of the sentence
-            mid_time = (sentence_start + sentence_end) / 2
-            speaker_id = get_speaker_at_time(mid_time)
-            
-            # If no speaker at mid point, try start and end
-            if not speaker_id:
-                speaker_id = get_speaker_at_time(sentence_start) or get_speaker_at_time(sentence_end)
+        if span is not None:
+            # Use the speaker who talks longest during the sentence
+            speaker_id = speaker_index.majority_speaker(span[0], span[1])
         
         sentence_speakers.append((sentence, speaker_id))
     
     return sentence_speakers
 
-def identify_speakers_with_audio(text, speaker_names, audio_path=None, whisper_model=None, hf_token=None, openai_api_key=None):
+def identify_speakers_with_audio(text, speaker_names, audio_path=None, whisper_model=None, hf_token=None, openai_api_key=None, whisper_result=None, audio=None, openai_result=None, speech=None):
     """
     Identify speakers using both audio diarization and text-based methods.
     Supports both OpenAI API and HuggingFace (pyannote) approaches.
     Combines both approaches for better accuracy.
+    
+    whisper_result: Optional Whisper result for this file (with word timestamps),
+    reused for alignment instead of transcribing the audio again.
+    audio: Optional decoded audio buffer, reused for diarization.
+    openai_result: Optional (transcript_text, labeled_segments) already returned by
+    perform_speaker_diarization_openai for this file; used instead of calling the API again.
+    speech: Optional SpeechTimeline; diarization then only runs on the speech regions.
     """
     # First, try OpenAI API (if available and preferred)
     audio_speakers = None
     openai_transcript = None
     
-    if audio_path and openai_api_key and OPENAI_API_AVAILABLE:
-        print("   🎤 Using OpenAI API for transcription with speaker diarization...")
-        openai_transcript, openai_segments = perform_speaker_diarization_openai(audio_path, openai_api_key)
+    if openai_result is not None or (audio_path and openai_api_key and OPENAI_API_AVAILABLE):
+        if openai_result is not None:
+            openai_transcript, openai_segments = openai_result
+        else:
+            print("   🎤 Using OpenAI API for transcription with speaker diarization...")
+            openai_transcript, openai_segments = perform_speaker_diarization_openai(audio_path, openai_api_key)
         if openai_transcript and openai_segments:
             print("   ✅ OpenAI API transcription with speaker diarization successful")
             # OpenAI gpt-4o-transcribe-diarize provides speaker labels directly
             # Map segments to sentences
-            sentences = re.split(r'[.!?]+\s+', openai_transcript)
+            sentences = SENTENCE_SPLIT_RE.split(openai_transcript)
             audio_speakers = []
             
             # Create mapping from time to speaker
@@ -1139,11 +3345,11 @@ def identify_speakers_with_audio(text, speaker_names, audio_path=None, whisper_m
     # Fallback to HuggingFace/pyannote if OpenAI not available or failed
     if not audio_speakers and audio_path and whisper_model and DIARIZATION_AVAILABLE:
         print("   🎤 Performing audio-based speaker diarization (HuggingFace)...")
-        diarization_segments = perform_speaker_diarization(audio_path, hf_token)
+        diarization_segments = perform_speaker_diarization(audio_path, hf_token, audio=audio, speech=speech)
         if diarization_segments:
-            words_with_timestamps = get_word_timestamps(audio_path, whisper_model)
+            words_with_timestamps = get_word_timestamps(audio_path, whisper_model, whisper_result)
             if words_with_timestamps:
-                sentences = re.split(r'[.!?]+\s+', text)
+                sentences = SENTENCE_SPLIT_RE.split(text)
                 audio_speakers = align_speakers_with_text(sentences, words_with_timestamps, diarization_segments)
                 if audio_speakers:
                     print(f"   ✅ Audio diarization successful: {len(set(s for _, s in audio_speakers if s))} speaker(s) detected")
@@ -1263,18 +3469,21 @@ def identify_speakers(text, speaker_names, is_episode_start=False):
     """
     if not speaker_names:
         # If no names detected, use generic labels
-        sentences = re.split(r'[.!?]+\s+', text)
+        sentences = SENTENCE_SPLIT_RE.split(text)
         return [(s.strip(), "Speaker 1" if i % 2 == 0 else "Speaker 2") 
                 for i, s in enumerate(sentences) if s.strip()]
     
     # Split into sentences
-    sentences = re.split(r'[.!?]+\s+', text)
+    sentences = SENTENCE_SPLIT_RE.split(text)
     labeled_sentences = []
     
+    # Compile the per-name patterns once for all sentences
+    name_patterns = compile_speaker_patterns(speaker_names)
+    
     # Find the word review marker ("Pero primero, estas son algunas palabras...")
     word_review_marker = None
     for i, sentence in enumerate(sentences):
-        if re.search(r'Pero primero.*palabras|estas son algunas palabras', sentence, re.IGNORECASE):
+        if WORD_REVIEW_RE.search(sentence):
             word_review_marker = i
             break
     
@@ -1285,15 +3494,13 @@ def identify_speakers(text, speaker_names, is_episode_start=False):
     # Look for self-introduction patterns in the introduction section
     intro_section = sentences[:word_review_marker] if word_review_marker else sentences[:5]
     for sentence in intro_section:
-        for name in speaker_names:
-            if re.search(rf'(?:Soy|soy|Me llamo|me llamo|Mi nombre es|mi nombre es)\s+{name}\b', sentence, re.IGNORECASE):
-                main_speaker = name
-                # Guest is the other speaker
-                guest_speaker = [n for n in speaker_names if n != name]
-                if guest_speaker:
-                    guest_speaker = guest_speaker[0]
-                break
-        if main_speaker:
+        name = first_matching_name(name_patterns['self_intro'], sentence, speaker_names)
+        if name:
+            main_speaker = name
+            # Guest is the other speaker
+            guest_speaker = [n for n in speaker_names if n != name]
+            if guest_speaker:
+                guest_speaker = guest_speaker[0]
             break
     
     # If no clear main speaker found, use first detected name as main
@@ -1323,7 +3530,7 @@ def identify_speakers(text, speaker_names, is_episode_start=False):
         
         # Check if first four words are spoken by narrator (third person)
         if is_episode_start and not narrator_words_complete:
-            words_in_sentence = len(re.findall(r'\b\w+\b', sentence))
+            words_in_sentence = len(WORD_RE.findall(sentence))
             if word_count + words_in_sentence <= 4:
                 # First four words are narrator
                 speaker_found = "Narrator"
@@ -1359,11 +3566,11 @@ def identify_speakers(text, speaker_names, is_episode_start=False):
             # Phase 3: Dialog section (after word review, before closing)
             elif word_review_marker and i > word_review_marker:
                 # Check if this is closing
-                if re.search(r'Gracias por escuchar|Gracias por acompañarme|Y así termina|Hasta pronto|Hasta la próxima', sentence, re.IGNORECASE):
+                if CLOSING_PHRASE_RE.search(sentence):
                     speaker_found = main_speaker
                 # Check for self-introduction
-                elif re.search(rf'(?:Soy|soy|Me llamo|me llamo|Mi nombre es|mi nombre es)\s+(\w+)\b', sentence, re.IGNORECASE):
-                    match = re.search(rf'(?:Soy|soy|Me llamo|me llamo|Mi nombre es|mi nombre es)\s+(\w+)\b', sentence, re.IGNORECASE)
+                elif SELF_INTRO_NAME_RE.search(sentence):
+                    match = SELF_INTRO_NAME_RE.search(sentence)
                     intro_name = match.group(1) if match else None
                     if intro_name in speaker_names:
                         speaker_found = intro_name
@@ -1373,29 +3580,18 @@ def identify_speakers(text, speaker_names, is_episode_start=False):
                 # IMPORTANT: Check if sentence contains a question directed at someone by name
                 # Pattern: "Name, ¿question" or "Name, question word" - the person being asked is NOT the speaker
                 # Look for: Name followed by comma and question mark/question word (at start or early in sentence)
-                elif any(re.search(rf'(?:^|\s){name},?\s*¿(?:por qué|qué|cómo|cuándo|dónde|cuál|quién)', sentence, re.IGNORECASE) or
-                         re.search(rf'(?:^|\s){name},?\s*¿', sentence, re.IGNORECASE) or
-                         re.search(rf'(?:^|\s){name},?\s*\?', sentence, re.IGNORECASE) or
-                         re.search(rf'(?:^|\s){name},?\s+por qué', sentence, re.IGNORECASE)
-                         for name in speaker_names):
+                elif name_patterns['questioned'].search(sentence):
                     # Find which name is being questioned
-                    questioned_name = None
-                    for name in speaker_names:
-                        if (re.search(rf'(?:^|\s){name},?\s*¿(?:por qué|qué|cómo|cuándo|dónde|cuál|quién)', sentence, re.IGNORECASE) or
-                            re.search(rf'(?:^|\s){name},?\s*¿', sentence, re.IGNORECASE) or
-                            re.search(rf'(?:^|\s){name},?\s*\?', sentence, re.IGNORECASE) or
-                            re.search(rf'(?:^|\s){name},?\s+por qué', sentence, re.IGNORECASE)):
-                            questioned_name = name
-                            break
+                    questioned_name = first_matching_name(name_patterns['questioned'], sentence, speaker_names)
                     # The person being questioned is NOT the speaker - the other person is speaking
                     if questioned_name:
                         speaker_found = guest_speaker if questioned_name == main_speaker else main_speaker
                     else:
                         speaker_found = guest_speaker if last_speaker == main_speaker else main_speaker
                 # Check if addressing someone by name (without question mark)
-                elif re.search(rf'(\w+),?\s+(?:cuéntanos|cuéntame|gracias|por qué|porque)', sentence, re.IGNORECASE):
+                elif ADDRESSED_NAME_RE.search(sentence):
                     # The person being addressed is NOT the speaker
-                    match = re.search(rf'(\w+),?\s+(?:cuéntanos|cuéntame|gracias|por qué|porque)', sentence, re.IGNORECASE)
+                    match = ADDRESSED_NAME_RE.search(sentence)
                     addressed_name = match.group(1) if match else None
                     if addressed_name in speaker_names:
                         # Other person is speaking
@@ -1424,10 +3620,7 @@ def identify_speakers(text, speaker_names, is_episode_start=False):
         # Fallback: If no word review marker, use alternation
         else:
             # Check for self-introduction
-            for name in speaker_names:
-                if re.search(rf'(?:Soy|soy|Me llamo|me llamo|Mi nombre es|mi nombre es)\s+{name}\b', sentence, re.IGNORECASE):
-                    speaker_found = name
-                    break
+            speaker_found = first_matching_name(name_patterns['self_intro'], sentence, speaker_names)
             
             if not speaker_found:
                 # Alternate
@@ -1443,7 +3636,7 @@ def identify_speakers(text, speaker_names, is_episode_start=False):
     
     return labeled_sentences
 
-def format_transcript_with_speakers(text, speaker_names=None, pre_labeled_sentences=None, audio_path=None, whisper_model=None, hf_token=None, is_episode_start=False):
+def format_transcript_with_speakers(text, speaker_names=None, pre_labeled_sentences=None, audio_path=None, whisper_model=None, hf_token=None, is_episode_start=False, whisper_result=None):
     """
     Format transcript text with speaker identification.
     - Add proper spacing
@@ -1459,6 +3652,7 @@ def format_transcript_with_speakers(text, speaker_names=None, pre_labeled_senten
         whisper_model: Optional Whisper model for word timestamps
         hf_token: Optional HuggingFace token for pyannote models
         is_episode_start: Whether this is the start of a new episode (for narrator detection)
+        whisper_result: Optional Whisper result for the file (reused for word timestamps)
     """
     # Use pre-labeled sentences if provided, otherwise identify speakers
     if pre_labeled_sentences:
@@ -1466,7 +3660,7 @@ def format_transcript_with_speakers(text, speaker_names=None, pre_labeled_senten
     elif speaker_names:
         # Use combined audio + text identification if audio is available
         if audio_path and whisper_model:
-            labeled_sentences = identify_speakers_with_audio(text, speaker_names, audio_path, whisper_model, hf_token)
+            labeled_sentences = identify_speakers_with_audio(text, speaker_names, audio_path, whisper_model, hf_token, whisper_result=whisper_result)
             # Apply narrator detection to pre-labeled sentences if this is episode start
             if is_episode_start and labeled_sentences:
                 word_count = 0
@@ -1474,7 +3668,7 @@ def format_transcript_with_speakers(text, speaker_names=None, pre_labeled_senten
                 updated_labeled_sentences = []
                 for sentence, speaker in labeled_sentences:
                     if not narrator_words_complete:
-                        words_in_sentence = len(re.findall(r'\b\w+\b', sentence))
+                        words_in_sentence = len(WORD_RE.findall(sentence))
                         if word_count + words_in_sentence <= 4:
                             updated_labeled_sentences.append((sentence, "Narrator"))
                             word_count += words_in_sentence
@@ -1576,7 +3770,47 @@ def read_existing_transcript(transcript_path):
         content = f.read().strip()
     return content
 
-def transcribe_audio_file(audio_path, model, transcript_dir, grammar_tool, hf_token=None, openai_api_key=None):
+def prepare_audio_file(audio_path, model, narrator_mode="transcribe", model_name=WHISPER_MODEL_NAME, vad=False):
+    """
+    Model-bound first stage of transcribe_audio_file: decode the audio once,
+    transcribe the English narrator at the start (unless narrator_mode is
+    "langid") and run the main Spanish Whisper pass (on the speech regions
+    only with vad, timestamps kept on the original timeline).
+    Returns dict with 'audio', 'english_narrator', 'whisper_result' and 'speech'
+    (the SpeechTimeline, or None), or None if the audio could not be decoded.
+    """
+    # Decode the audio once; all stages share this buffer
+    print("   Decoding audio...")
+    audio = decode_audio(audio_path)
+    if audio is None:
+        print("   ❌ Error: Could not decode audio")
+        return None
+    
+    try:
+        # First, transcribe the beginning in English to capture narrator
+        # (language-ID mode finds narrators from the main pass instead)
+        english_narrator = None
+        if narrator_mode != "langid":
+            print("   Transcribing English narrator (beginning)...")
+            english_narrator = transcribe_english_narrator(audio_path, model, start_time=0, duration=10, audio=audio, model_name=model_name)
+            if english_narrator:
+                print(f"   ✅ English narrator: {english_narrator[:100]}...")
+        
+        # Then transcribe the full audio in Spanish (single pass with word timestamps).
+        # The result holds text, segments and words, and is reused by every
+        # downstream stage instead of running the model again.
+        speech = detect_speech(audio) if vad else None
+        print("   Transcribing Spanish content...")
+        audio_hash = compute_audio_hash(audio_path)
+        whisper_result = transcribe_with_cache(model, audio, audio_hash, model_name, speech=speech,
+                                               language="es", word_timestamps=True)
+    except BaseException:
+        release_audio(audio)
+        raise
+    
+    return {'audio': audio, 'english_narrator': english_narrator, 'whisper_result': whisper_result, 'speech': speech}
+
+def transcribe_audio_file(audio_path, model, transcript_dir, grammar_tool, hf_token=None, openai_api_key=None, model_name=WHISPER_MODEL_NAME, narrator_mode="transcribe", segmenter="heuristic", prepared=None, openai_chunk_seconds=0, vad=False):
     """
     Transcribe a single audio file, proofread, split into stories, and save.
     Checks for existing transcripts first.
@@ -1586,12 +3820,34 @@ def transcribe_audio_file(audio_path, model, transcript_dir, grammar_tool, hf_to
     - OpenAI API (if openai_api_key provided) - preferred method
     - HuggingFace/pyannote (if hf_token provided) - fallback
     - Text-based only (if neither provided)
+    
+    Intermediate results (Whisper output, proofread text, diarization segments,
+    episode splits) are kept in a content-addressed stage cache, so re-running
+    after tweaking splitting or formatting only recomputes the later stages.
+    
+    narrator_mode selects how the English narrator of each episode is found:
+    - "transcribe": transcribe the start of every episode in English (default)
+    - "langid": run Whisper language ID on the main-pass segments and re-decode
+      only the English ones (replaces the regex narrator detection)
+    
+    segmenter selects the episode segmentation engine (see SEGMENTERS):
+    "heuristic" (default) or "dp" for the dynamic-programming segmenter.
+    
+    prepared is the output of prepare_audio_file when the Whisper stage already
+    ran elsewhere (see transcribe_files_pipelined); its audio buffer is released here.
+    
+    vad runs voice activity detection first, so only speech regions reach Whisper
+    and pyannote diarization (see SpeechTimeline).
     """
     print(f"\n📻 Processing: {audio_path.name}")
     
     # Initialize variables
     english_narrator = None
     has_audio_for_diarization = False
+    whisper_result = None
+    speech = None
+    # A prepared buffer is released by the finally clause below, whatever happens
+    audio = prepared['audio'] if prepared else None
     
     try:
         # Check if transcript already exists
@@ -1602,29 +3858,29 @@ def transcribe_audio_file(audio_path, model, transcript_dir, grammar_tool, hf_to
             print("   ✅ Skipping - transcript already exists")
             return True
         else:
-            # Transcribe the audio
-            if model is None:
-                print("   ❌ Error: No model provided and no existing transcripts found")
-                return False
-            
-            # First, transcribe the beginning in English to capture narrator
-            print("   Transcribing English narrator (beginning)...")
-            english_narrator = transcribe_english_narrator(audio_path, model, start_time=0, duration=10)
-            if english_narrator:
-                print(f"   ✅ English narrator: {english_narrator[:100]}...")
+            # Transcribe the audio (unless a pipeline stage already did)
+            if prepared is None:
+                if model is None:
+                    print("   ❌ Error: No model provided and no existing transcripts found")
+                    return False
+                prepared = prepare_audio_file(audio_path, model, narrator_mode, model_name, vad)
+                if prepared is None:
+                    return False
             
-            # Then transcribe the full audio in Spanish
-            print("   Transcribing Spanish content...")
-            result = model.transcribe(str(audio_path), language="es")
-            transcript = result["text"]
+            # All stages below share the decoded buffer and the main Whisper result
+            audio = prepared['audio']
+            english_narrator = prepared['english_narrator']
+            whisper_result = prepared['whisper_result']
+            speech = prepared.get('speech')
+            transcript = whisper_result["text"]
             has_audio_for_diarization = True
         
         # Proofread the transcript (only Spanish parts)
         print("   Proofreading...")
         # Split transcript to proofread only Spanish parts
-        if english_narrator or (transcript and re.search(r'(?:Section|Unit|Radio)\s+\d+', transcript, re.IGNORECASE)):
+        if english_narrator or (transcript and SECTION_MARKER_RE.search(transcript)):
             # Extract English narrator and Spanish parts
-            parts = re.split(r'((?:Section|Unit|Radio)\s+\d+[^.]*\.)', transcript, maxsplit=1, flags=re.IGNORECASE)
+            parts = SECTION_SENTENCE_RE.split(transcript, maxsplit=1)
             if len(parts) >= 3:
                 english_part = parts[0] + parts[1] if parts[0] or parts[1] else ""
                 spanish_part = ''.join(parts[2:]) if len(parts) > 2 else transcript
@@ -1649,16 +3905,21 @@ def transcribe_audio_file(audio_path, model, transcript_dir, grammar_tool, hf_to
         full_transcript_labeled = None
         
         if has_audio_for_diarization:
-            # Get audio duration
-            audio_duration = get_audio_duration(audio_path)
+            # Get audio duration from the decoded buffer
+            audio_duration = audio_duration_from_buffer(audio)
             if audio_duration:
                 print(f"   🎵 Audio duration: {audio_duration:.1f} seconds ({audio_duration/60:.1f} minutes)")
             
             # Try OpenAI API first (if available), then HuggingFace, then text-only
             openai_transcript, openai_segments = None, None
+            openai_result = None
             if openai_api_key and OPENAI_API_AVAILABLE:
                 print("   🎤 Using OpenAI API for transcription with speaker diarization...")
-                openai_transcript, openai_segments = perform_speaker_diarization_openai(audio_path, openai_api_key)
+                openai_transcript, openai_segments = perform_speaker_diarization_openai(
+                    audio_path, openai_api_key, audio=audio, chunk_seconds=openai_chunk_seconds
+                )
+                # Reused by the speaker-identification stage below (no second upload)
+                openai_result = (openai_transcript, openai_segments)
                 if openai_transcript and openai_segments:
                     print("   ✅ OpenAI API transcription with speaker diarization successful")
                     print(f"   ✅ OpenAI API diarization: {len(set(s[2] for s in openai_segments if s[2]))} speaker(s) detected")
@@ -1679,7 +3940,7 @@ def transcribe_audio_file(audio_path, model, transcript_dir, grammar_tool, hf_to
             # Fallback to HuggingFace/pyannote if OpenAI didn't provide segments
             if not speaker_segments and hf_token and DIARIZATION_AVAILABLE and model:
                 print("   🎤 Performing audio-based speaker diarization (HuggingFace)...")
-                diarization_segments = perform_speaker_diarization(audio_path, hf_token)
+                diarization_segments = perform_speaker_diarization(audio_path, hf_token, audio=audio, speech=speech)
                 if diarization_segments:
                     # Convert to (start, end, speaker_id, text) format
                     speaker_segments = [(start, end, speaker, None) for start, end, speaker in diarization_segments]
@@ -1693,7 +3954,11 @@ def transcribe_audio_file(audio_path, model, transcript_dir, grammar_tool, hf_to
                     audio_path, 
                     model, 
                     hf_token,
-                    openai_api_key
+                    openai_api_key,
+                    whisper_result=whisper_result,
+                    audio=audio,
+                    openai_result=openai_result,
+                    speech=speech
                 )
                 if full_transcript_labeled:
                     print("   ✅ Full transcript labeled with speakers")
@@ -1701,53 +3966,95 @@ def transcribe_audio_file(audio_path, model, transcript_dir, grammar_tool, hf_to
         # Split into episodes using improved heuristic-based approach
         # Uses pattern-based, duration-based, and speaker-based heuristics
         print("   Detecting episode boundaries using patterns, duration, and speaker changes...")
-        episodes = split_by_episode_patterns(
+        # Map transcript positions to real times through the Whisper word timestamps,
+        # falling back to an even spread over the audio duration
+        timeline = None
+        if whisper_result is not None:
+            timeline = TextTimeline.from_words(
+                corrected_transcript, extract_word_timestamps(whisper_result), audio_duration
+            )
+        if timeline is None and audio_duration:
+            timeline = TextTimeline.uniform(len(corrected_transcript), audio_duration)
+        episodes = split_episodes_with_cache(
             corrected_transcript,
             audio_path=audio_path if has_audio_for_diarization else None,
             speaker_segments=speaker_segments,
-            audio_duration=audio_duration
+            audio_duration=audio_duration,
+            segmenter=segmenter,
+            timeline=timeline
         )
         if episodes:
             print(f"   ✅ Split into {len(episodes)} episode(s) using improved heuristics")
             
-            # Report estimated durations if available
-            if audio_duration:
-                chars_per_second_calc = len(corrected_transcript) / audio_duration
-                for i, episode in enumerate(episodes, 1):
-                    ep_duration = len(episode) / chars_per_second_calc
+            # Report durations if available
+            if timeline:
+                episode_starts = locate_episodes(corrected_transcript, episodes)
+                for i, (episode, episode_start_char) in enumerate(zip(episodes, episode_starts), 1):
+                    if episode_start_char < 0:
+                        continue
+                    ep_duration = timeline.duration(episode_start_char, episode_start_char + len(episode))
                     print(f"      Episode {i}: ~{ep_duration:.1f} seconds ({ep_duration/60:.1f} minutes)")
         else:
             # Fallback to content-based splitting
             print("   Pattern-based splitting not applicable, using content-based splitting...")
             episodes = split_by_content(corrected_transcript)
         
+        # For each episode, transcribe the English narrator at its start.
+        # All episode clips are cut from the decoded buffer and transcribed in one batch.
+        # In language-ID mode, only main-pass segments detected as English are re-decoded.
+        episode_english_narrators = [None] * len(episodes)
+        episode_narrator_segments = [[] for _ in episodes]
+        use_langid = narrator_mode == "langid" and whisper_result is not None
+        episode_starts = locate_episodes(corrected_transcript, episodes)
+        if has_audio_for_diarization and model and timeline:
+            narrator_episode_indices = []
+            narrator_start_times = []
+            for episode_idx, episode_start_char in enumerate(episode_starts):
+                # Start time of this episode, from where it starts in the full transcript
+                if episode_start_char >= 0:
+                    narrator_episode_indices.append(episode_idx)
+                    narrator_start_times.append(timeline.time_at(episode_start_char))
+            if narrator_start_times and use_langid:
+                print(f"   Detecting English narrator for {len(narrator_start_times)} episode(s) with language ID...")
+                narrators = detect_episode_narrators_langid(
+                    audio_path, model, audio, whisper_result, narrator_start_times, model_name=model_name,
+                    speech=speech
+                )
+                for episode_idx, (narrator_text, narrator_segments) in zip(narrator_episode_indices, narrators):
+                    episode_english_narrators[episode_idx] = narrator_text
+                    episode_narrator_segments[episode_idx] = narrator_segments
+            elif narrator_start_times:
+                print(f"   Transcribing English narrator for {len(narrator_start_times)} episode(s) in one batch...")
+                narrator_texts = transcribe_english_narrators(
+                    audio_path, model, narrator_start_times, duration=8, audio=audio, model_name=model_name
+                )
+                for episode_idx, narrator_text in zip(narrator_episode_indices, narrator_texts):
+                    episode_english_narrators[episode_idx] = narrator_text
+        
         # Process each episode: identify speakers and format
         stories = []
+        story_narrators = []  # English narrator per story (language-ID mode)
         for episode_idx, episode in enumerate(episodes):
-            # For each episode, transcribe English narrator at the beginning
-            episode_english_narrator = None
-            if has_audio_for_diarization and model:
-                # Transcribe first few seconds in English for narrator
-                try:
-                    # Get episode start time (approximate)
-                    if audio_duration:
-                        chars_per_second = len(corrected_transcript) / audio_duration
-                        # Find where this episode starts in the full transcript
-                        episode_start_char = corrected_transcript.find(episode[:100])
-                        if episode_start_char >= 0:
-                            episode_start_time = episode_start_char / chars_per_second
-                            # Transcribe 5-10 seconds in English
-                            episode_english_narrator = transcribe_english_narrator(
-                                audio_path, model, start_time=episode_start_time, duration=8
-                            )
-                except Exception as e:
-                    pass  # If English transcription fails, continue without it
+            episode_english_narrator = episode_english_narrators[episode_idx]
             
-            # Also try to detect English narrator in the episode text
-            detected_english, spanish_episode = detect_english_narrator_in_text(episode)
+            if use_langid:
+                # Language ID already told us which segments were English:
+                # cut them by time instead of matching narrator regexes
+                episode = remove_narrator_segments(
+                    episode, episode_narrator_segments[episode_idx], timeline, episode_starts[episode_idx]
+                )
+                detected_english, spanish_episode = None, episode
+            else:
+                # Also try to detect English narrator in the episode text
+                detected_english, spanish_episode = detect_english_narrator_in_text(episode)
             
             # Use separately transcribed English if available, otherwise use detected
-            if episode_english_narrator:
+            if use_langid:
+                if episode_english_narrator:
+                    episode_english_narrator = episode_english_narrator.strip()
+                    if not episode_english_narrator.endswith('.'):
+                        episode_english_narrator += '.'
+            elif episode_english_narrator:
                 # Clean up the English narrator text
                 episode_english_narrator = episode_english_narrator.strip()
                 if episode_english_narrator and not episode_english_narrator.endswith('.'):
@@ -1767,12 +4074,16 @@ def transcribe_audio_file(audio_path, model, transcript_dir, grammar_tool, hf_to
                 # Split episode by hints
                 episode_stories = split_by_english_hints(episode, hints)
                 # Add English narrator to first story only
-                if episode_english_narrator and episode_stories:
+                if use_langid:
+                    story_narrators.extend([episode_english_narrator] + [None] * (len(episode_stories) - 1))
+                elif episode_english_narrator and episode_stories:
                     episode_stories[0] = episode_english_narrator + " " + episode_stories[0]
                 stories.extend(episode_stories)
             else:
                 # Keep episode as single story, prepend English narrator if available
-                if episode_english_narrator:
+                if use_langid:
+                    story_narrators.append(episode_english_narrator)
+                elif episode_english_narrator:
                     episode = episode_english_narrator + " " + episode
                 stories.append(episode)
         
@@ -1783,7 +4094,7 @@ def transcribe_audio_file(audio_path, model, transcript_dir, grammar_tool, hf_to
         
         # If we have full transcript labels from audio, extract relevant sentences for each story
         # Create a mapping from full transcript to story segments
-        full_sentences = re.split(r'[.!?]+\s+', corrected_transcript)
+        full_sentences = SENTENCE_SPLIT_RE.split(corrected_transcript)
         
         # Prepare content for single transcript file
         transcript_content_parts = []
@@ -1800,7 +4111,7 @@ def transcribe_audio_file(audio_path, model, transcript_dir, grammar_tool, hf_to
             story_labeled_sentences = None
             if full_transcript_labeled:
                 # Find which sentences from full transcript belong to this story
-                story_sentences = re.split(r'[.!?]+\s+', story)
+                story_sentences = SENTENCE_SPLIT_RE.split(story)
                 story_labeled_sentences = []
                 story_sentence_idx = 0
                 
@@ -1824,10 +4135,13 @@ def transcribe_audio_file(audio_path, model, transcript_dir, grammar_tool, hf_to
             spanish_story = story
             
             # Detect English narrator at the beginning
-            detected_english, spanish_part = detect_english_narrator_in_text(story)
-            if detected_english:
-                english_narrator_text = detected_english
-                spanish_story = spanish_part
+            if use_langid:
+                english_narrator_text = story_narrators[i - 1]
+            else:
+                detected_english, spanish_part = detect_english_narrator_in_text(story)
+                if detected_english:
+                    english_narrator_text = detected_english
+                    spanish_story = spanish_part
             
             # Format the Spanish story with speaker labels
             # Pass is_episode_start=True for each episode to detect narrator (first four words)
@@ -1877,8 +4191,488 @@ def transcribe_audio_file(audio_path, model, transcript_dir, grammar_tool, hf_to
         import traceback
         traceback.print_exc()
         return False
+    finally:
+        release_audio(audio)
+
+class EpisodeStream:
+    """
+    Incremental episode splitting for streaming mode. Finalized words are
+    appended to the pending text (the unfinished tail of the transcript), which
+    is re-segmented after every window: every episode but the last, which may
+    still continue, is final and is removed from the pending text.
+    """
+    
+    def __init__(self, segmenter="heuristic", max_pending_seconds=STREAM_MAX_PENDING_SECONDS):
+        self.segment = SEGMENTERS[segmenter]
+        self.max_pending_seconds = max_pending_seconds
+        self.parts = []
+        self.length = 0
+        # (position, time) of every word start and end, times relative to start_time
+        self.anchors = []
+        self.start_time = None
+    
+    def add_words(self, words):
+        """
+        Append finalized words: (word, start_time, end_time) tuples with the
+        word text as Whisper produced it (including its leading space).
+        """
+        for word, start, end in words:
+            if self.start_time is None:
+                self.start_time = start
+                word = word.lstrip()
+            self.anchors.append((self.length, start - self.start_time))
+            self.parts.append(word)
+            self.length += len(word)
+            self.anchors.append((self.length, end - self.start_time))
+    
+    def pop_finished(self, final=False):
+        """
+        Segment the pending text and remove the episodes that are complete
+        (all of them when final, e.g. at the end of the audio).
+        Returns list of episode texts.
+        """
+        text = ''.join(self.parts)
+        if not text.strip():
+            return []
+        timeline = TextTimeline([(0, 0.0)] + self.anchors)
+        duration = timeline.times[-1]
+        episodes = [episode for episode in self.segment(text, audio_duration=duration, timeline=timeline)
+                    if episode.strip()] or [text.strip()]
+        if final:
+            self.parts, self.length, self.anchors, self.start_time = [], 0, [], None
+            return episodes
+        
+        # The unfinished episode is the tail of the pending text; look it up from the
+        # end, since an opening search can match a repeated phrase too early
+        cut = text.rfind(episodes[-1].strip()) if len(episodes) > 1 else -1
+        if len(episodes) > 1 and cut <= 0:
+            cut = locate_episodes(text, episodes)[-1]
+        if cut > 0:
+            finished = episodes[:-1]
+        elif duration > self.max_pending_seconds:
+            # No boundary found in a long stretch: keep memory bounded by
+            # cutting at a sentence end about one episode before the end
+            cut = find_sentence_start(text, timeline.position_at(duration - DP_TARGET_EPISODE_SECONDS), nearest=True)
+            if cut <= 0:
+                return []
+            finished = [text[:cut].strip()]
+        else:
+            return []
+        
+        cut_time = timeline.time_at(cut)
+        self.parts = [text[cut:]]
+        self.length = len(text) - cut
+        self.anchors = [(position - cut, time - cut_time) for position, time in self.anchors if position >= cut]
+        self.start_time += cut_time
+        return finished
+
+def format_stream_episode(episode, grammar_tool, speaker_names=None):
+    """
+    Proofread and format one finalized episode in streaming mode: the English
+    narrator found in the text is kept apart (as [Narrator]) and the Spanish part
+    is proofread and labeled with text-based speaker identification.
+    Returns tuple: (formatted_episode, speaker_names)
+    """
+    detected_english, spanish_episode = detect_english_narrator_in_text(episode)
+    spanish_episode = proofread_spanish(spanish_episode, grammar_tool)
+    speaker_names = extract_speaker_names(spanish_episode) or speaker_names
+    formatted = format_transcript_with_speakers(spanish_episode, speaker_names, is_episode_start=True)
+    if detected_english:
+        formatted = f"[Narrator]: {detected_english.strip()}\n\n" + formatted
+    return formatted, speaker_names
+
+def transcribe_audio_stream(audio_path, model, transcript_dir, grammar_tool, segmenter="heuristic",
+                            window_seconds=STREAM_WINDOW_SECONDS, overlap_seconds=STREAM_OVERLAP_SECONDS, vad=False):
+    """
+    Transcribe a long recording incrementally with constant memory.
+    The audio is decoded and transcribed in overlapping windows (see
+    stream_audio_windows); the words of consecutive windows are stitched at the
+    middle of their overlap, and the previous window's text is passed to Whisper
+    as the prompt. Episodes are emitted as soon as the segmenter finalizes them
+    (see EpisodeStream), proofread, formatted and appended to
+    {audio_filename}_transcript.txt.partial, which is renamed to the final
+    transcript when the whole file is done (and removed if streaming fails
+    or is interrupted). With vad, only the speech regions
+    of each window are transcribed (windows without speech are skipped, and
+    windows with implausibly little are transcribed whole).
+    
+    Audio diarization (OpenAI/pyannote) and per-episode English narrator
+    transcription need the whole file and are not used: speakers are identified
+    from the text and narrators detected in the Spanish transcript.
+    
+    Returns True on success, False otherwise.
+    """
+    print(f"\n📻 Streaming: {audio_path.name}")
+    existing_transcript_path = check_existing_transcripts(audio_path, transcript_dir)
+    if existing_transcript_path:
+        print(f"   📄 Found existing transcript: {existing_transcript_path.name}")
+        print("   ✅ Skipping - transcript already exists")
+        return True
+    if model is None:
+        print("   ❌ Error: No model provided and no existing transcripts found")
+        return False
+    
+    transcript_path = transcript_dir / f"{audio_path.stem}_transcript.txt"
+    partial_path = transcript_path.with_name(transcript_path.name + ".partial")
+    separator = "=" * 80
+    stream = EpisodeStream(segmenter)
+    speaker_names = []
+    episode_count = 0
+    boundary = 0.0
+    prompt = None
+    
+    def write_episodes(episodes, output):
+        nonlocal episode_count, speaker_names
+        for episode in episodes:
+            formatted, names = format_stream_episode(episode, grammar_tool, speaker_names)
+            speaker_names = names or speaker_names
+            if episode_count:
+                output.write(separator + "\n\n")
+            output.write(formatted + "\n\n")
+            episode_count += 1
+            print(f"   ✅ Episode {episode_count} finalized ({len(episode)} chars)")
+        output.flush()
+    
+    try:
+        with open(partial_path, 'w', encoding='utf-8') as output:
+            for window_start, samples, is_last in stream_audio_windows(audio_path, window_seconds, overlap_seconds):
+                window_end = window_start + len(samples) / SAMPLE_RATE
+                speech = SpeechTimeline.detect(samples) if vad else None
+                if speech is not None and speech.speech_samples and not speech.plausible:
+                    speech = None
+                if speech is None:
+                    result = model.transcribe(samples, language="es", word_timestamps=True, initial_prompt=prompt)
+                elif speech.speech_samples:
+                    result = speech.remap_result(model.transcribe(
+                        speech.compact(samples), language="es", word_timestamps=True, initial_prompt=prompt
+                    ))
+                else:
+                    result = {"segments": []}
+                # Words centred before the middle of the next overlap belong to
+                # this window; the rest are taken from the next one
+                next_boundary = float('inf') if is_last else window_end - overlap_seconds / 2
+                words = []
+                for segment in result.get("segments", []):
+                    for word_info in segment.get("words", []):
+                        start = window_start + word_info.get("start", 0)
+                        end = window_start + word_info.get("end", 0)
+                        if word_info.get("word", "").strip() and boundary <= (start + end) / 2 < next_boundary:
+                            words.append((word_info["word"], start, end))
+                boundary = next_boundary
+                prompt = ''.join(word for word, _, _ in words)[-200:] or prompt
+                stream.add_words(words)
+                print(f"   🪟 {window_start / 60:.1f}-{window_end / 60:.1f} min: {len(words)} word(s) finalized")
+                write_episodes(stream.pop_finished(final=is_last), output)
+            write_episodes(stream.pop_finished(final=True), output)
+        
+        if not episode_count:
+            print("   ❌ Error: No speech transcribed")
+            return False
+        os.replace(partial_path, transcript_path)
+        print(f"   ✅ Saved transcript: {transcript_path.name}")
+        print(f"      Total episodes: {episode_count}")
+        return True
+    except Exception as e:
+        print(f"   ❌ Error streaming {audio_path.name}: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        # Never leave a half-written transcript behind (also on Ctrl+C)
+        partial_path.unlink(missing_ok=True)
+
+def load_grammar_tool(servers=1, remote_url=None):
+    """
+    Load the Spanish grammar checker (LanguageTool).
+    With servers > 1, start that many local LanguageTool servers (in parallel)
+    and return them as a GrammarToolPool for concurrent checking.
+    With remote_url, attach to an already running LanguageTool server (e.g. one
+    shared by several runs) instead of starting one; servers > 1 then opens that
+    many connections to it.
+    Returns the tool, or None if it could not be loaded.
+    """
+    if remote_url:
+        print(f"\n📥 Connecting to LanguageTool server at {remote_url}...")
+    else:
+        print("\n📥 Loading Spanish grammar checker...")
+    try:
+        import language_tool_python
+        
+        def create_tool(_=None):
+            if remote_url:
+                return language_tool_python.LanguageTool(GRAMMAR_LANGUAGE, remote_server=remote_url)
+            return language_tool_python.LanguageTool(GRAMMAR_LANGUAGE)
+        
+        if servers > 1:
+            with ThreadPoolExecutor(max_workers=servers) as executor:
+                tools = list(executor.map(create_tool, range(servers)))
+            grammar_tool = GrammarToolPool(tools)
+            print(f"✅ Grammar checker loaded ({servers} {'connections' if remote_url else 'servers'})\n")
+            return grammar_tool
+        grammar_tool = create_tool()
+        print("✅ Grammar checker loaded\n")
+        return grammar_tool
+    except Exception as e:
+        print(f"⚠️  Warning: Could not load grammar checker: {str(e)}")
+        print("   Continuing without grammar correction...\n")
+        return None
+
+# Per-process state for --workers batch mode (filled in by _init_batch_worker)
+_WORKER_STATE = {}
+
+def _init_batch_worker(model_name, torch_threads, grammar_servers=1, languagetool_url=None,
+                       backend="whisper", compute_type=None):
+    """
+    Process-pool initializer: load the transcription backend once per worker,
+    with its intra-op threads capped (the grammar checker loads on first use).
+    """
+    _WORKER_STATE['model'] = load_transcription_backend(backend, model_name, compute_type, cpu_threads=torch_threads)
+    _WORKER_STATE['grammar_tool'] = LazyGrammarTool(grammar_servers, languagetool_url)
+
+def _transcribe_in_worker(audio_path, transcript_dir, hf_token, openai_api_key, model_name, narrator_mode, segmenter,
+                          openai_chunk_seconds=0, vad=False):
+    """
+    Process-pool task: transcribe one file with this worker's model and grammar checker.
+    """
+    return transcribe_audio_file(
+        audio_path,
+        _WORKER_STATE['model'],
+        transcript_dir,
+        _WORKER_STATE['grammar_tool'],
+        hf_token,
+        openai_api_key,
+        _WORKER_STATE['model'].cache_name,
+        narrator_mode,
+        segmenter,
+        openai_chunk_seconds=openai_chunk_seconds,
+        vad=vad
+    )
+
+def transcribe_files_in_pool(audio_files, transcript_dir, workers, hf_token=None, openai_api_key=None, model_name=WHISPER_MODEL_NAME, narrator_mode="transcribe", segmenter="heuristic", grammar_servers=1,
+                             openai_chunk_seconds=0, languagetool_url=None, backend="whisper", compute_type=None,
+                             vad=False):
+    """
+    Transcribe audio files across a pool of worker processes.
+    Each worker loads its own model (model_name is the model size for the given
+    backend) and grammar checker, with intra-op threads capped so the workers
+    together use the available cores.
+    Returns the number of files processed successfully.
+    """
+    workers = max(1, min(workers, len(audio_files)))
+    torch_threads = max(1, (os.cpu_count() or 1) // workers)
+    print(f"\n🚀 Batch mode: {workers} worker(s), {torch_threads} torch thread(s) each")
+    
+    success_count = 0
+    # Spawn (not fork) so workers never inherit torch thread pools from the parent
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_batch_worker,
+                             initargs=(model_name, torch_threads, grammar_servers, languagetool_url,
+                                       backend, compute_type)) as executor:
+        futures = {
+            executor.submit(_transcribe_in_worker, audio_file, transcript_dir, hf_token, openai_api_key,
+                            model_name, narrator_mode, segmenter, openai_chunk_seconds, vad): audio_file
+            for audio_file in audio_files
+        }
+        for future in as_completed(futures):
+            try:
+                if future.result():
+                    success_count += 1
+            except Exception as e:
+                print(f"   ❌ Error processing {futures[future].name}: {str(e)}")
+    
+    return success_count
+
+class SerializedModel:
+    """
+    Wrapper that lets pipeline stages share one transcription backend. Inference
+    calls (transcribe, detect_languages) take a lock, since Whisper installs
+    per-call hooks on the model; every other attribute is passed through.
+    """
+    
+    INFERENCE_METHODS = ('transcribe', 'detect_languages')
+    
+    def __init__(self, model):
+        self._model = model
+        self._lock = threading.Lock()
+    
+    def __getattr__(self, name):
+        attr = getattr(self._model, name)
+        if name not in self.INFERENCE_METHODS:
+            return attr
+        
+        def locked(*args, **kwargs):
+            with self._lock:
+                return attr(*args, **kwargs)
+        return locked
+
+class StageCounter:
+    """
+    Throughput counter for one pipeline stage: items handled, time spent
+    working and time spent waiting for input or for room downstream.
+    """
+    
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+        self.waiting = 0.0
+    
+    def report(self, wall_seconds):
+        rate = self.items / wall_seconds * 60 if wall_seconds > 0 else 0.0
+        utilization = self.busy / wall_seconds if wall_seconds > 0 else 0.0
+        print(f"   {self.name}: {self.items} file(s), {self.busy:.1f}s busy, {self.waiting:.1f}s waiting, "
+              f"{rate:.2f} file(s)/min, {utilization:.0%} utilization")
+
+def transcribe_files_pipelined(audio_files, model, transcript_dir, grammar_tool, hf_token=None, openai_api_key=None,
+                               model_name=WHISPER_MODEL_NAME, narrator_mode="transcribe", segmenter="heuristic",
+                               queue_size=PIPELINE_QUEUE_SIZE, openai_chunk_seconds=0, vad=False):
+    """
+    Transcribe audio files in a two-stage producer/consumer pipeline.
+    The Whisper stage (decode, narrator, main pass) runs on this thread while a
+    post-processing thread proofreads, diarizes, splits and writes the previous
+    file, so the CPU-bound model work overlaps LanguageTool, OpenAI and file I/O.
+    The stages are connected by a bounded queue (queue_size files), and the
+    model is shared through SerializedModel.
+    Returns the number of files processed successfully.
+    """
+    model = SerializedModel(model)
+    transcribed = queue.Queue(maxsize=max(1, queue_size))
+    transcribe_counter = StageCounter("Transcribe")
+    postprocess_counter = StageCounter("Post-process")
+    results = []
+    
+    def postprocess_worker():
+        while True:
+            wait_start = time.perf_counter()
+            item = transcribed.get()
+            postprocess_counter.waiting += time.perf_counter() - wait_start
+            if item is None:
+                return
+            audio_file, prepared = item
+            start = time.perf_counter()
+            try:
+                results.append(transcribe_audio_file(
+                    audio_file, model, transcript_dir, grammar_tool, hf_token, openai_api_key,
+                    model_name, narrator_mode, segmenter, prepared=prepared,
+                    openai_chunk_seconds=openai_chunk_seconds, vad=vad
+                ))
+            except Exception as e:
+                print(f"   ❌ Error processing {audio_file.name}: {str(e)}")
+                results.append(False)
+            postprocess_counter.busy += time.perf_counter() - start
+            postprocess_counter.items += 1
+    
+    print(f"\n🚀 Pipeline mode: transcription overlaps post-processing (queue size {max(1, queue_size)})")
+    pipeline_start = time.perf_counter()
+    consumer = threading.Thread(target=postprocess_worker, name="postprocess", daemon=True)
+    consumer.start()
+    try:
+        for audio_file in audio_files:
+            print(f"\n🎙️  Transcribing: {audio_file.name}")
+            start = time.perf_counter()
+            try:
+                prepared = prepare_audio_file(audio_file, model, narrator_mode, model_name, vad)
+            except Exception as e:
+                print(f"   ❌ Error transcribing {audio_file.name}: {str(e)}")
+                prepared = None
+            transcribe_counter.busy += time.perf_counter() - start
+            transcribe_counter.items += 1
+            if prepared is None:
+                results.append(False)
+                continue
+            wait_start = time.perf_counter()
+            transcribed.put((audio_file, prepared))
+            transcribe_counter.waiting += time.perf_counter() - wait_start
+    finally:
+        transcribed.put(None)
+        consumer.join()
+    
+    wall_seconds = time.perf_counter() - pipeline_start
+    print(f"\n📊 Pipeline throughput ({wall_seconds:.1f}s total):")
+    transcribe_counter.report(wall_seconds)
+    postprocess_counter.report(wall_seconds)
+    return sum(1 for result in results if result)
+
+def parse_args(argv=None):
+    """
+    Parse command-line options.
+    """
+    parser = argparse.ArgumentParser(description="Transcribe Spanish Duolingo radio audio files.")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Number of worker processes for batch transcription (default: 1, serial)"
+    )
+    parser.add_argument(
+        "--narrator-mode", choices=["transcribe", "langid"], default="transcribe",
+        help="How to find each episode's English narrator: transcribe the start of every "
+             "episode in English, or use Whisper language ID on the main pass (default: transcribe)"
+    )
+    parser.add_argument(
+        "--backend", choices=sorted(TRANSCRIPTION_BACKENDS), default="whisper",
+        help="Transcription engine: openai-whisper (PyTorch) or faster-whisper (CTranslate2) "
+             "(default: whisper)"
+    )
+    parser.add_argument(
+        "--model-size", default=WHISPER_MODEL_NAME,
+        help=f"Whisper model size, e.g. tiny, base, small, medium (default: {WHISPER_MODEL_NAME})"
+    )
+    parser.add_argument(
+        "--compute-type", default=None,
+        help="Weight/compute precision: float32 (default) or int8 (dynamic quantization, cached "
+             "on disk) for whisper; int8 (default), int8_float32, int16 or float32 for faster-whisper"
+    )
+    parser.add_argument(
+        "--segmenter", choices=sorted(SEGMENTERS), default="heuristic",
+        help="Episode segmentation engine: the greedy pattern/duration heuristics, or a "
+             "dynamic-programming search for the best-scoring segmentation (default: heuristic)"
+    )
+    parser.add_argument(
+        "--grammar-servers", type=int, default=1,
+        help="Number of local LanguageTool servers to proofread with concurrently, or connections "
+             "with --languagetool-url (per worker process in batch mode; default: 1)"
+    )
+    parser.add_argument(
+        "--languagetool-url", default=os.environ.get("LANGUAGETOOL_URL"),
+        help="Use an already running LanguageTool server (e.g. http://localhost:8081) instead "
+             "of starting one (default: $LANGUAGETOOL_URL)"
+    )
+    parser.add_argument(
+        "--openai-concurrency", type=int, default=OPENAI_CONCURRENCY,
+        help="Files uploaded to the OpenAI API at once when several need transcription "
+             f"(1 disables the concurrent upload; default: {OPENAI_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--openai-chunk-seconds", type=float, default=0,
+        help="Upload files longer than this many seconds to the OpenAI API as overlapping "
+             "chunks cut at silences, in parallel (default: 0, upload whole files; at most "
+             f"{max_openai_chunk_seconds():.0f}, so each WAV chunk stays under the upload limit)"
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="Transcribe each file in overlapping windows with constant memory, appending "
+             "episodes to the transcript as they are finalized (text-based speakers only)"
+    )
+    parser.add_argument(
+        "--vad", action="store_true",
+        help="Detect speech by energy first and pass only speech regions (not silence or quiet "
+             "music beds) to Whisper and pyannote diarization; timestamps stay on the original timeline"
+    )
+    parser.add_argument(
+        "--pipeline", action="store_true",
+        help="Overlap Whisper transcription of the next file with proofreading, diarization "
+             "and writing of the current one (single process; ignored with --workers > 1)"
+    )
+    args = parser.parse_args(argv)
+    max_chunk_seconds = max_openai_chunk_seconds()
+    if args.openai_chunk_seconds > max_chunk_seconds:
+        parser.error(f"--openai-chunk-seconds must be at most {max_chunk_seconds:.0f}: chunks are uploaded "
+                     f"as 16 kHz WAV and must stay under {OPENAI_UPLOAD_LIMIT_BYTES / 1e6:.0f} MB")
+    return args
 
-def main():
+def main(argv=None):
+    args = parse_args(argv)
+    
     # Set up paths
     script_dir = Path(__file__).parent
     radios_dir = script_dir / "Duolinguo" / "radios"
@@ -1907,25 +4701,28 @@ def main():
         if not existing:
             files_needing_transcription.append(audio_file)
     
+    use_pool = args.workers > 1 and len(files_needing_transcription) > 1 and not args.stream
+    
     # Load Whisper model only if transcription is needed
+    # (in batch mode each worker process loads its own model)
     model = None
+    grammar_tool = None
     if files_needing_transcription:
         print(f"   {len(files_needing_transcription)} file(s) need transcription")
-        print("\n📥 Loading Whisper model (this may take a moment on first run)...")
-        model = whisper.load_model("base")
-        print("✅ Model loaded")
+        if not use_pool:
+            print(f"\n📥 Loading {args.backend} model '{args.model_size}' (this may take a moment on first run)...")
+            try:
+                model = load_transcription_backend(args.backend, args.model_size, args.compute_type)
+            except Exception as e:
+                print(f"❌ Could not load the {args.backend} backend: {str(e)}")
+                sys.exit(1)
+            print(f"✅ Model loaded ({model.compute_type})")
     else:
         print("   ✅ All files already have transcripts (skipping transcription)")
     
-    # Initialize grammar checker for Spanish
-    print("\n📥 Loading Spanish grammar checker...")
-    try:
-        grammar_tool = language_tool_python.LanguageTool('es-ES')
-        print("✅ Grammar checker loaded\n")
-    except Exception as e:
-        print(f"⚠️  Warning: Could not load grammar checker: {str(e)}")
-        print("   Continuing without grammar correction...\n")
-        grammar_tool = None
+    # Grammar checker for Spanish, started only once a sentence needs checking
+    if not use_pool:
+        grammar_tool = LazyGrammarTool(args.grammar_servers, args.languagetool_url)
     
     # Get API keys for speaker diarization (optional)
     # Priority: OpenAI API > HuggingFace > Text-only
@@ -1945,11 +4742,45 @@ def main():
         print("      Get token from: https://huggingface.co/settings/tokens")
         print("   Audio diarization will be disabled without API key\n")
     
+    # Batch runs: upload to OpenAI concurrently up front, so each file's
+    # diarization step reads its response from the cache (chunked uploads
+    # are already parallel within each file)
+    if (openai_api_key and OPENAI_API_AVAILABLE and args.openai_concurrency > 1 and not args.stream
+            and not args.openai_chunk_seconds and len(files_needing_transcription) > 1):
+        prefetch_openai_diarization(files_needing_transcription, openai_api_key,
+                                    concurrency=args.openai_concurrency)
+    
     # Process each audio file (save transcripts in transcript subfolder)
     success_count = 0
-    for audio_file in audio_files:
-        if transcribe_audio_file(audio_file, model, transcript_dir, grammar_tool, hf_token, openai_api_key):
-            success_count += 1
+    if args.stream:
+        for audio_file in audio_files:
+            if transcribe_audio_stream(audio_file, model, transcript_dir, grammar_tool, segmenter=args.segmenter,
+                                       vad=args.vad):
+                success_count += 1
+    elif use_pool:
+        # Files that already have transcripts count as processed
+        success_count = len(audio_files) - len(files_needing_transcription)
+        success_count += transcribe_files_in_pool(
+            files_needing_transcription, transcript_dir, args.workers, hf_token, openai_api_key,
+            model_name=args.model_size, narrator_mode=args.narrator_mode, segmenter=args.segmenter,
+            grammar_servers=args.grammar_servers, openai_chunk_seconds=args.openai_chunk_seconds,
+            languagetool_url=args.languagetool_url, backend=args.backend, compute_type=args.compute_type,
+            vad=args.vad
+        )
+    elif args.pipeline and len(files_needing_transcription) > 1:
+        success_count = len(audio_files) - len(files_needing_transcription)
+        success_count += transcribe_files_pipelined(
+            files_needing_transcription, model, transcript_dir, grammar_tool, hf_token, openai_api_key,
+            model_name=model.cache_name, narrator_mode=args.narrator_mode, segmenter=args.segmenter,
+            openai_chunk_seconds=args.openai_chunk_seconds, vad=args.vad
+        )
+    else:
+        for audio_file in audio_files:
+            if transcribe_audio_file(audio_file, model, transcript_dir, grammar_tool, hf_token, openai_api_key,
+                                     model_name=model.cache_name if model else WHISPER_MODEL_NAME,
+                                     narrator_mode=args.narrator_mode, segmenter=args.segmenter,
+                                     openai_chunk_seconds=args.openai_chunk_seconds, vad=args.vad):
+                success_count += 1
     
     print(f"\n{'='*60}")
     print(f"✨ Transcription complete!")